@@ -1,35 +1,49 @@
 import asyncio
 from datetime import datetime
 import logging
+from typing import Optional, Union
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.redis import RedisStorage
+from app.keyboards.cache import format_keyboard_cache_stats
 from app.middlewares.menu_middleware import MenuMiddleware
+from app.middlewares.menu_storage import MenuStoreFactory, RedisHashMenuStore
+from app.middlewares.storage_buffer import StorageBufferMiddleware
+from app.service.cached_rent_object_service import CachedRentObjectService
+from app.service.metrics import start_metrics_server
 from app.service.rent_object_service import RentObjectService
-from app.settings.config import load_config
+from app.settings.config import Config, load_config
+from app.storage.buffered import BufferedStorage
+from app.storage.cached import CachedStorage
+from app.storage.redis import CompactRedisStorage
+from app.storage.serializer import StateSerializer
 from app.middlewares.rent_object_service import RentObjectServiceMiddleware
 from app.handlers import main_router
 
-logging.basicConfig(
-    format=(
-        "%(asctime)s - [%(levelname)s] - %(name)s"
-        "- (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
-    ),
-    level=logging.INFO,
-    handlers=[
-        logging.FileHandler(
-            f"logs/logs_{datetime.now().strftime('%Y-%m-%d_%H:%M:%S')}.log"
+
+def setup_logging():
+    logging.basicConfig(
+        format=(
+            "%(asctime)s - [%(levelname)s] - %(name)s"
+            "- (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
         ),
-        logging.StreamHandler(),
-    ],
-)
+        level=logging.INFO,
+        handlers=[
+            logging.FileHandler(
+                f"logs/logs_{datetime.now().strftime('%Y-%m-%d_%H:%M:%S')}.log"
+            ),
+            logging.StreamHandler(),
+        ],
+    )
 
 
-def setup_middlewares(dp: Dispatcher):
-    service_middleware = RentObjectServiceMiddleware(
-        RentObjectService("http://localhost:8080")
-    )
-    menu_middleware = MenuMiddleware()
+def setup_middlewares(
+    dp: Dispatcher,
+    rent_object_service: RentObjectService,
+    menu_store_factory: Optional[MenuStoreFactory] = None,
+):
+    service_middleware = RentObjectServiceMiddleware(rent_object_service)
+    menu_middleware = MenuMiddleware(menu_store_factory)
 
     dp.message.middleware(service_middleware)
     dp.callback_query.middleware(service_middleware)
@@ -37,6 +51,65 @@ def setup_middlewares(dp: Dispatcher):
     dp.message.middleware(menu_middleware)
     dp.callback_query.middleware(menu_middleware)
 
+    if isinstance(dp.storage, BufferedStorage):
+        dp.update.outer_middleware(StorageBufferMiddleware(dp.storage))
+
+
+def create_rent_object_service(config: Config) -> RentObjectService:
+    backend = config.backend
+    if backend.cache.enabled:
+        return CachedRentObjectService(
+            backend.uri,
+            backend.connector,
+            max_size=backend.cache.max_size,
+            ttl=backend.cache.ttl,
+        )
+    return RentObjectService(backend.uri, backend.connector)
+
+
+def create_storage(
+    config: Config,
+) -> Union[RedisStorage, CachedStorage, BufferedStorage]:
+    state_storage = config.state_storage
+    ttls = {
+        "state_ttl": state_storage.state_ttl or None,
+        "data_ttl": state_storage.data_ttl or None,
+    }
+    if state_storage.serializer == "json":
+        storage = RedisStorage.from_url(config.redis.url, **ttls)
+    elif state_storage.serializer == "compact":
+        serializer = StateSerializer(
+            state_storage.encoding,
+            state_storage.compression,
+            state_storage.compress_threshold,
+        )
+        storage = CompactRedisStorage.from_url(
+            config.redis.url, serializer=serializer, **ttls
+        )
+    else:
+        raise ValueError(f"Unknown state serializer {state_storage.serializer!r}")
+
+    if state_storage.cache:
+        storage = CachedStorage(
+            storage,
+            max_size=state_storage.cache_size,
+            lease=state_storage.cache_lease,
+            write_behind=state_storage.write_behind,
+        )
+    if state_storage.pipeline:
+        return BufferedStorage(storage)
+    return storage
+
+
+def create_menu_store_factory(
+    config: Config, storage: Union[RedisStorage, CachedStorage, BufferedStorage]
+) -> Optional[MenuStoreFactory]:
+    if config.menu.storage == "redis":
+        return RedisHashMenuStore.factory(storage)
+    if config.menu.storage != "fsm":
+        raise ValueError(f"Unknown menu storage {config.menu.storage!r}")
+    return None
+
 
 def setup_routers(dp: Dispatcher):
     dp.include_routers(main_router)
@@ -45,16 +118,34 @@ def setup_routers(dp: Dispatcher):
 async def main():
     config = load_config()
     bot = Bot(config.bot.token, parse_mode=ParseMode.HTML)
-    dp = Dispatcher(storage=RedisStorage.from_url(config.redis.url))
+    storage = create_storage(config)
+    dp = Dispatcher(storage=storage)
+    rent_object_service = create_rent_object_service(config)
 
-    setup_middlewares(dp)
+    setup_middlewares(
+        dp, rent_object_service, create_menu_store_factory(config, storage)
+    )
     setup_routers(dp)
 
+    metrics_runner = None
+    if config.metrics.port:
+        metrics_runner = await start_metrics_server(
+            rent_object_service.metrics, config.metrics.host, config.metrics.port
+        )
+
+    await rent_object_service.start()
     try:
         await dp.start_polling(bot)
     finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        if isinstance(rent_object_service, CachedRentObjectService):
+            logging.info("Backend cache stats: %s", rent_object_service.cache_stats)
+        logging.info("Keyboard cache stats: %s", format_keyboard_cache_stats())
+        await rent_object_service.close()
         await dp.storage.close()
 
 
 if __name__ == "__main__":
+    setup_logging()
     asyncio.run(main())
@@ -21,9 +21,6 @@ from app.keyboards.object_menu import (
 from app.keyboards.record_list import edit_text_record_list
 from app.keyboards.record_menu import edit_text_record_menu
 from app.middlewares.menu_middleware import MenuStateData
-from app.service.create_xlsx_document import (
-    RentObjectXLSXWriter,
-)
 from app.service.models.rent_object import UpdateRentObjectInput
 from app.service.rent_object_service import RentObjectService
 from app.states.object_menu import ObjectMenuState
@@ -80,7 +77,7 @@ async def set_name(
         return
 
     is_new = await menu.is_new_object()
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
 
     await menu.set_object_name(name)
 
@@ -104,7 +101,7 @@ async def set_description(
     await menu.set_object_description(description)
 
     is_new = await menu.is_new_object()
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     if not is_new:
         await rent_object_service.update_object(
             message.chat.id, obj.name, UpdateRentObjectInput(description=description)
@@ -130,7 +127,7 @@ async def set_area(
     await menu.set_object_area(area)
 
     is_new = await menu.is_new_object()
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     if not is_new:
         await rent_object_service.update_object(
             message.chat.id, obj.name, UpdateRentObjectInput(area=area)
@@ -194,7 +191,7 @@ async def delete_yes(
     rent_object_service: RentObjectService,
 ):
     await cb.answer()
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     await rent_object_service.delete_object(cb.from_user.id, obj.name)
     await edit_text_object_list(cb.message, state, rent_object_service)
 
@@ -218,10 +215,14 @@ async def get_document(
     menu: MenuStateData,
     rent_object_service: RentObjectService,
 ):
+    # xlsxwriter and numpy are only imported once a report is requested
+    from app.service.create_xlsx_document import RentObjectXLSXWriter
+    from app.service.object_info import compute_object_info
+
     await cb.answer()
+    # The menu holds the object with all its records, no /getObjectInfo needed
     obj = await menu.get_object()
-    object_info = await rent_object_service.get_object_info(cb.from_user.id, obj.name)
-    object_path = RentObjectXLSXWriter().create(object_info)
+    object_path = RentObjectXLSXWriter().create(compute_object_info(obj))
 
     await cb.message.answer_document(FSInputFile(object_path))
     await send_object_list(cb.message, state, rent_object_service)
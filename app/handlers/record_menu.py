@@ -1,6 +1,4 @@
-from datetime import timezone
-import dateparser
-import pytz
+from typing import Optional
 from aiogram import Router, F
 from aiogram.filters import or_f
 from aiogram.types import CallbackQuery, Message
@@ -19,7 +17,13 @@ from app.keyboards.record_menu import (
     send_record_menu,
 )
 from app.middlewares.menu_middleware import MenuStateData
-from app.service.models.record import Record, UpdateRecordInput
+from app.service.date_parser import parse_month_year
+from app.service.models.record import (
+    RECORD_FIELDS,
+    Record,
+    UpdateRecordInput,
+    format_datetime,
+)
 from app.service.rent_object_service import RentObjectService
 from app.states.object_menu import ObjectMenuState
 from app.states.record_menu import RecordMenuState
@@ -115,20 +119,12 @@ async def change_param(
 
 @record_menu_router.message(RecordMenuState.change_date, F.text)
 async def set_date(message: Message, state: FSMContext, menu: MenuStateData):
-    date = message.text or ""
-    try:
-        date = dateparser.parse(date, date_formats=["%m.%y", "%m.%Y"])
-
-        if date is None:
-            raise Exception()
-
-        date = pytz.utc.localize(date)
-    except Exception:
+    date = parse_month_year(message.text or "")
+    if date is None:
         await message.answer("Неверный формат!")
         return
-    date = date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    await menu.set_selected_record_field("date", date)
+    await menu.set_selected_record_field("date", format_datetime(date))
     await send_record_menu(message, state, menu)
 
 
@@ -203,13 +199,12 @@ async def delete_yes(
     rent_object_service: RentObjectService,
 ):
     await cb.answer()
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     record_index = await menu.get_selected_record_index()
 
-    if await menu.is_new_object():
-        await menu.delete_selected_record()
-    else:
+    if not await menu.is_new_object():
         await rent_object_service.delete_record(cb.from_user.id, obj.name, record_index)
+    await menu.delete_selected_record()
 
     await state.set_state(ObjectMenuState.menu)
     await edit_text_object_menu(cb.message, state, menu)
@@ -223,6 +218,8 @@ async def cancel(cb: CallbackQuery, state: FSMContext, menu: MenuStateData):
     record_index = await menu.get_selected_record_index()
     if await menu.is_new_record(record_index):
         await menu.delete_selected_record()
+    else:
+        await menu.revert_selected_record()
 
     await state.set_state(ObjectMenuState.menu)
     await edit_text_object_menu(cb.message, state, menu)
@@ -241,17 +238,19 @@ async def enter(
 
     record = await menu.get_selected_record()
 
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     record_index = await menu.get_selected_record_index()
     if not await menu.is_new_object():
         if await menu.is_new_record(record_index):
             await rent_object_service.add_record(cb.from_user.id, obj.name, record)
 
         else:
-            update_input = get_update_record_input(record)
-            await rent_object_service.update_record(
-                cb.from_user.id, obj.name, record_index, update_input
-            )
+            original = await menu.get_selected_record_original()
+            update_input = get_update_record_input(original, record)
+            if update_input is not None:
+                await rent_object_service.update_record(
+                    cb.from_user.id, obj.name, record_index, update_input
+                )
 
     await menu.update_selected_record(record)
 
@@ -259,17 +258,15 @@ async def enter(
     await edit_text_object_menu(cb.message, state, menu)
 
 
-def get_update_record_input(record: Record) -> UpdateRecordInput:
-    return UpdateRecordInput(
-        date=record.date,
-        rent=record.rent,
-        heat=record.heat,
-        exploitation=record.exploitation,
-        mop=record.mop,
-        renovation=record.renovation,
-        tbo=record.tbo,
-        electricity=record.electricity,
-        earth_rent=record.earth_rent,
-        other=record.other,
-        security=record.security,
-    )
+def get_update_record_input(
+    original: Optional[Record], record: Record
+) -> Optional[UpdateRecordInput]:
+    """Fields of record that differ from original, None if nothing changed"""
+    changes = {}
+    for key in ("date", *RECORD_FIELDS):
+        value = getattr(record, key)
+        if original is None or getattr(original, key) != value:
+            changes[key] = value
+    if not changes:
+        return None
+    return UpdateRecordInput(**changes)
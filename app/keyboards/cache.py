@@ -0,0 +1,86 @@
+import functools
+import math
+import time
+from typing import Callable, Hashable, Optional
+from aiogram.types import InlineKeyboardMarkup
+from app.service.cache import CacheStats, TTLCache
+
+KEYBOARD_CACHE_SIZE = 512
+
+
+class KeyboardCache:
+    """LRU of built keyboards, with the time their builds took.
+
+    Markups are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_size: int = KEYBOARD_CACHE_SIZE):
+        self._cache = TTLCache(max_size, ttl=math.inf)
+        self.build_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    @property
+    def saved_seconds(self) -> float:
+        """Build time the hits would have taken, at the mean build time"""
+        if not self.stats.misses:
+            return 0.0
+        return self.stats.hits * self.build_seconds / self.stats.misses
+
+    def get(
+        self, key: Hashable, build: Callable[[], InlineKeyboardMarkup]
+    ) -> InlineKeyboardMarkup:
+        found, markup = self._cache.get(key)
+        if found:
+            return markup
+
+        start = time.perf_counter()
+        markup = build()
+        self.build_seconds += time.perf_counter() - start
+        self._cache.set(key, markup)
+        return markup
+
+    def clear(self):
+        self._cache.clear()
+
+
+# Keyboard function name: its cache
+KEYBOARD_CACHES: dict[str, KeyboardCache] = {}
+
+
+def memoized_keyboard(key: Optional[Callable[..., Hashable]] = None):
+    """Caches the keyboard a function builds by key(*args, **kwargs).
+
+    The key must cover everything the keyboard shows, by default it is the
+    arguments themselves. The uncached function is kept in __wrapped__.
+    """
+
+    def decorator(build: Callable[..., InlineKeyboardMarkup]):
+        cache = KeyboardCache()
+        KEYBOARD_CACHES[build.__name__] = cache
+
+        @functools.wraps(build)
+        def wrapper(*args, **kwargs) -> InlineKeyboardMarkup:
+            cache_key = (
+                key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            )
+            return cache.get(cache_key, lambda: build(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def format_keyboard_cache_stats() -> str:
+    return ", ".join(
+        f"{name}: {cache.stats.hit_rate:.0%} hits of "
+        f"{cache.stats.hits + cache.stats.misses}, "
+        f"{cache.saved_seconds * 1000:.1f} ms saved"
+        for name, cache in KEYBOARD_CACHES.items()
+    )
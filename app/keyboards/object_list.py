@@ -4,6 +4,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.cache import memoized_keyboard
 from app.service.models.rent_object import RentObject
 from app.service.rent_object_service import RentObjectService
 
@@ -18,6 +19,7 @@ class ObjectListCallbackData(CallbackData, prefix="object_menu"):
     action: ObjectListAction
 
 
+@memoized_keyboard(lambda objects: tuple(obj.name for obj in objects))
 def get_objects_menu_keyboard(objects: list[RentObject]) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     for obj in objects:
@@ -117,7 +117,7 @@ async def send_object_menu(message: Message, state: FSMContext, menu: MenuStateD
 async def _send_object_menu(
     method, message: Message, state: FSMContext, menu: MenuStateData
 ):
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     is_new = await menu.is_new_object()
     name = await menu.get_object_field("new_name") or obj.name
     content = Text(
@@ -1,14 +1,19 @@
+from datetime import datetime
 from enum import IntEnum, auto
 import math
+from typing import Union
 from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 from aiogram.utils.formatting import Bold, Text
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from app.keyboards.cache import memoized_keyboard
 from app.middlewares.menu_middleware import MenuStateData
 from app.service.create_xlsx_document import format_date
 
 from app.service.models.record import Record
+from app.service.models.record_index import RecordIndex, page_bounds
+from app.service.models.record_page import RecordPage
 from app.service.rent_object_service import RentObjectService
 from app.states.object_menu import ObjectMenuState
 
@@ -30,18 +35,27 @@ class RecordListCallbackData(CallbackData, prefix="record_list"):
     action: RecordListAction
 
 
-def get_record_list_keyboard(records: list[Record], page: int) -> InlineKeyboardMarkup:
+def get_record_list_keyboard(
+    records: Union[list[Record], RecordIndex, RecordPage], page: int
+) -> InlineKeyboardMarkup:
+    # Newest records first: page 0 is the tail of the date-ordered list
+    start, end = page_bounds(len(records), page, RECORDS_ON_PAGE)
+    dates = get_record_dates(records, start, end)
+    return _build_record_list_keyboard(len(records), page, end, tuple(dates))
+
+
+@memoized_keyboard()
+def _build_record_list_keyboard(
+    records_count: int, page: int, end: int, dates: tuple[datetime, ...]
+) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    RECORDS_COUNT = len(records)
-    PAGES_COUNT = math.ceil(RECORDS_COUNT / RECORDS_ON_PAGE)
-    reversed = records[::-1]
-    records_on_page = reversed[page * RECORDS_ON_PAGE : (page + 1) * RECORDS_ON_PAGE]
+    PAGES_COUNT = math.ceil(records_count / RECORDS_ON_PAGE)
 
-    for index, record in enumerate(records_on_page):
+    for index, date in enumerate(reversed(dates)):
         builder.button(
-            text=f"Дата: {format_date(record.date)}",
+            text=f"Дата: {format_date(date)}",
             callback_data=RecordListCallbackData(
-                record_index=RECORDS_COUNT - 1 - page * RECORDS_ON_PAGE - index,
+                record_index=end - 1 - index,
                 action=RecordListAction.OPEN_RECORD,
             ).pack(),
         )
@@ -87,6 +101,16 @@ def get_record_list_keyboard(records: list[Record], page: int) -> InlineKeyboard
     return builder.as_markup()
 
 
+def get_record_dates(
+    records: Union[list[Record], RecordIndex, RecordPage],
+    start: int,
+    end: int,
+) -> list[datetime]:
+    if isinstance(records, list):
+        return [record.date for record in records[start:end]]
+    return records.datetimes(start, end)
+
+
 async def edit_text_record_list(
     message: Message,
     state: FSMContext,
@@ -114,12 +138,15 @@ async def _send_record_list(
     menu: MenuStateData,
     rent_object_service: RentObjectService,
 ):
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     is_new = await menu.is_new_object()
+    current_page = await menu.get_current_page()
     if is_new:
-        records = obj.records
+        records = await menu.get_record_index()
     else:
-        records = await rent_object_service.get_all_records(message.chat.id, obj.name)
+        records = await rent_object_service.get_records_page(
+            message.chat.id, obj.name, current_page, RECORDS_ON_PAGE
+        )
 
     content = Text(
         Bold("Список записей"),
@@ -133,7 +160,6 @@ async def _send_record_list(
         Bold("Площадь: "),
         obj.area,
     )
-    current_page = await menu.get_current_page()
     await state.set_state(ObjectMenuState.record_list)
     await method(
         **content.as_kwargs(),
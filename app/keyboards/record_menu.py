@@ -4,10 +4,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardMarkup, Message
 from aiogram.utils.formatting import Bold, Text
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from app.keyboards.cache import memoized_keyboard
 from app.middlewares.menu_middleware import MenuStateData
 from app.service.create_xlsx_document import format_date
 
-from app.service.models.record import Record
+from app.service.models.record import RECORD_FIELDS, Record
 from app.states.record_menu import RecordMenuState
 
 
@@ -34,6 +35,17 @@ class RecordMenuCallbackData(CallbackData, prefix="record_data"):
     action: RecordMenuAction
 
 
+def _record_keyboard_key(record: Record, is_new: bool = False) -> tuple:
+    # The button texts themselves: equal values can render differently,
+    # 1 == 1.0 but the labels read "1" and "1.0"
+    return (
+        format_date(record.date),
+        *(str(getattr(record, key)) for key in RECORD_FIELDS),
+        is_new,
+    )
+
+
+@memoized_keyboard(_record_keyboard_key)
 def get_create_record_keyboard(
     record: Record, is_new: bool = False
 ) -> InlineKeyboardMarkup:
@@ -136,7 +148,7 @@ async def _send_record_menu(
     method, message: Message, state: FSMContext, menu: MenuStateData
 ):
     record = await menu.get_selected_record()
-    obj = await menu.get_object()
+    obj = await menu.get_object_header()
     is_new_object = await menu.is_new_object()
     record_index = await menu.get_selected_record_index()
     is_new_record = await menu.is_new_record(record_index)
@@ -1,49 +1,69 @@
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 from aiogram import BaseMiddleware
 from aiogram.fsm.context import FSMContext
 from aiogram.types import TelegramObject
+from app.middlewares.menu_storage import FSMDataMenuStore, MenuStore, MenuStoreFactory
 from app.service.models.record import Record
+from app.service.models.record_index import RecordIndex
 
 from app.service.models.rent_object import RentObject
 
 
 class MenuStateData:
-    def __init__(self, state: FSMContext):
+    """Menu view of the draft object of one update.
+
+    The data lives in a MenuStore, by default the FSM data. Changes stay in
+    memory and MenuMiddleware writes them back with flush() after the
+    handler.
+    """
+
+    def __init__(self, state: FSMContext, store: Optional[MenuStore] = None):
         self.state = state
+        self.store = store or FSMDataMenuStore(state)
+
+    @property
+    def dirty(self) -> bool:
+        return self.store.dirty
 
     async def get_data(self) -> dict:
-        return await self.state.get_data()
+        return await self.store.get_data()
 
     async def set_data(self, data: dict):
-        await self.state.set_data(data)
+        await self.store.set_data(data)
+
+    async def flush(self):
+        await self.store.flush()
 
     async def set_object(self, obj: RentObject, is_new: bool):
-        data = await self.get_data()
-        data["object"] = obj.to_dict()
-        data["object"]["new"] = is_new
+        fields = obj.to_dict()
+        records = fields.pop("records")
+        fields["new"] = is_new
 
-        await self.set_data(data)
+        await self.store.set_object(fields, records)
 
     async def is_new_object(self):
-        data = await self.get_data()
-        return data["object"]["new"] is True
+        fields = await self.store.get_object_fields()
+        return fields["new"] is True
 
     async def create_new_object(self):
         await self.set_object(RentObject(), True)
 
     async def get_object(self) -> RentObject:
-        data = await self.get_data()
-        object_data = data["object"]
-        return RentObject.from_dict(object_data)
+        fields = await self.store.get_object_fields()
+        records = await self.store.get_records()
+        return RentObject.from_dict({**fields, "records": records})
+
+    async def get_object_header(self) -> RentObject:
+        """The object without its records, for screens that only show fields"""
+        fields = await self.store.get_object_fields()
+        return RentObject.from_dict({**fields, "records": []})
 
     async def set_object_field(self, key: str, value):
-        data = await self.get_data()
-        data["object"][key] = value
-        await self.set_data(data)
+        await self.store.set_object_field(key, value)
 
     async def get_object_field(self, key: str):
-        data = await self.get_data()
-        return data["object"].get(key)
+        fields = await self.store.get_object_fields()
+        return fields.get(key)
 
     async def set_object_name(self, name: str):
         await self.set_object_field("name", name)
@@ -58,71 +78,80 @@ class MenuStateData:
         return await self.add_record_to_object(Record(), True)
 
     async def get_selected_record(self) -> Record:
-        data = await self.get_data()
         record_index = await self.get_selected_record_index()
-        record_data = data["object"]["records"][record_index]
+        record_data = await self.store.get_record(record_index)
         return Record.from_dict(record_data)
 
     async def set_selected_record_field(self, key: str, value: Any):
-        data = await self.get_data()
         record_index = await self.get_selected_record_index()
-        data["object"]["records"][record_index][key] = value
-        await self.set_data(data)
+        await self.store.set_record_field(record_index, key, value)
 
     async def add_record_to_object(self, record: Record, is_new: bool) -> int:
-        data = await self.get_data()
-        data["object"]["records"].append(record.to_dict())
-        data["object"]["records"][-1]["is_new"] = is_new
-        await self.set_data(data)
-        return len(data["object"]["records"]) - 1
+        record_data = record.to_dict()
+        record_data["is_new"] = is_new
+        return await self.store.insert_record(record_data)
+
+    async def get_record_index(self) -> RecordIndex:
+        return await self.store.get_record_index()
 
     async def is_new_record(self, record_index: int) -> bool:
-        data = await self.get_data()
-        return data["object"]["records"][record_index].get("is_new") is True
+        record_data = await self.store.get_record(record_index)
+        return record_data.get("is_new") is True
 
     async def is_updated_record(self, record_index: int) -> int:
-        data = await self.get_data()
-        return data["object"]["records"][record_index].get("is_updated") is True
+        record_data = await self.store.get_record(record_index)
+        return record_data.get("is_updated") is True
 
     async def select_record(self, record_index: int):
-        await self.set_selected_record_index(record_index)
+        await self.store.set_value("selected_record_index", record_index)
+        # Snapshot so that only the fields the user changes are sent on save
+        record_data = await self.store.get_record(record_index)
+        await self.store.set_value("selected_record_original", dict(record_data))
 
     async def set_selected_record_index(self, record_index: int):
-        data = await self.get_data()
-        data["selected_record_index"] = record_index
-        await self.set_data(data)
+        await self.store.set_value("selected_record_index", record_index)
+        await self.store.delete_value("selected_record_original")
+
+    async def get_selected_record_original(self) -> Optional[Record]:
+        original = await self.store.get_value("selected_record_original")
+        if original is None:
+            return None
+        return Record.from_dict(original)
 
     async def get_selected_record_index(self):
-        data = await self.get_data()
-        return data["selected_record_index"]
+        return await self.store.get_value("selected_record_index")
 
     async def delete_selected_record(self):
-        data = await self.get_data()
         record_index = await self.get_selected_record_index()
-        data["object"]["records"].pop(record_index)
-        await self.set_data(data)
+        await self.store.delete_record(record_index)
 
     async def update_selected_record(self, record: Record):
-        data = await self.get_data()
         record_index = await self.get_selected_record_index()
-        data["object"]["records"][record_index] = record.to_dict()
-        data["object"]["records"][record_index]["is_updated"] = True
-        data["object"]["records"].sort(key=lambda x: x["date"])
-        await self.set_data(data)
+        record_data = record.to_dict()
+        record_data["is_updated"] = True
+        record_index = await self.store.replace_record(record_index, record_data)
+        # The record may have moved to its new date
+        await self.store.set_value("selected_record_index", record_index)
+
+    async def revert_selected_record(self):
+        """Drops the unsaved changes of the selected record"""
+        original = await self.store.get_value("selected_record_original")
+        if original is None:
+            return
+        record_index = await self.get_selected_record_index()
+        await self.store.replace_record(record_index, original)
 
     async def get_current_page(self) -> int:
-        data = await self.get_data()
-        return data["current_page"]
+        return await self.store.get_value("current_page")
 
     async def set_current_page(self, page: int) -> None:
-        data = await self.get_data()
-        data["current_page"] = page
-        await self.set_data(data)
+        await self.store.set_value("current_page", page)
 
 
 class MenuMiddleware(BaseMiddleware):
-    def __init__(self) -> None:
+    def __init__(self, store_factory: Optional[MenuStoreFactory] = None) -> None:
         super().__init__()
+        self.store_factory = store_factory or FSMDataMenuStore
 
     async def __call__(
         self,
@@ -130,5 +159,10 @@ class MenuMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        data["menu"] = MenuStateData(data["state"])
-        return await handler(event, data)
+        state = data["state"]
+        menu = MenuStateData(state, self.store_factory(state))
+        data["menu"] = menu
+        try:
+            return await handler(event, data)
+        finally:
+            await menu.flush()
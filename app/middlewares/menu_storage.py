@@ -0,0 +1,479 @@
+import json
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import Any, Callable, Optional, Union
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio.client import Pipeline, Redis
+from app.service.models.record_index import RecordIndex
+from app.storage.buffered import BufferedStorage
+
+
+class MenuStore(ABC):
+    """Where MenuStateData keeps a user's draft object and menu values.
+
+    A store lives for one update. Reads are cached and writes may be
+    buffered until flush(), which MenuMiddleware calls after the handler.
+    Records are plain dicts in the Record.to_dict() format plus the
+    is_new/is_updated flags, addressed by their index in date order. The
+    order follows the RecordIndex: a record moves only when it is inserted
+    or replaced, editing its date field leaves it in place.
+    """
+
+    @property
+    @abstractmethod
+    def dirty(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_data(self) -> dict:
+        """The whole draft in the FSM data layout: the menu values and
+        "object" with the object fields and its records"""
+        pass
+
+    @abstractmethod
+    async def set_data(self, data: dict):
+        pass
+
+    @abstractmethod
+    async def get_value(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    async def set_value(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    async def delete_value(self, key: str):
+        pass
+
+    @abstractmethod
+    async def set_object(self, fields: dict, records: list[dict]):
+        pass
+
+    @abstractmethod
+    async def get_object_fields(self) -> dict:
+        pass
+
+    @abstractmethod
+    async def set_object_field(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    async def get_records(self) -> list[dict]:
+        pass
+
+    @abstractmethod
+    async def get_record(self, index: int) -> dict:
+        pass
+
+    @abstractmethod
+    async def get_record_index(self) -> RecordIndex:
+        pass
+
+    @abstractmethod
+    async def set_record_field(self, index: int, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    async def replace_record(self, index: int, record: dict) -> int:
+        """Replaces the record and moves it to its date, returns its index"""
+        pass
+
+    @abstractmethod
+    async def insert_record(self, record: dict) -> int:
+        pass
+
+    @abstractmethod
+    async def delete_record(self, index: int):
+        pass
+
+    @abstractmethod
+    async def flush(self):
+        pass
+
+
+MenuStoreFactory = Callable[[FSMContext], MenuStore]
+
+
+class FSMDataMenuStore(MenuStore):
+    """The draft as a single dict in the FSM data.
+
+    Loaded on first access and written back whole by flush() if changed.
+    """
+
+    def __init__(self, state: FSMContext):
+        self.state = state
+        self._data: Optional[dict] = None
+        self._index: Optional[RecordIndex] = None
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    async def get_data(self) -> dict:
+        if self._data is None:
+            self._data = await self.state.get_data()
+        return self._data
+
+    async def set_data(self, data: dict):
+        self._data = data
+        self._dirty = True
+
+    async def get_value(self, key: str) -> Any:
+        data = await self.get_data()
+        return data.get(key)
+
+    async def set_value(self, key: str, value: Any):
+        data = await self.get_data()
+        data[key] = value
+        await self.set_data(data)
+
+    async def delete_value(self, key: str):
+        data = await self.get_data()
+        if key in data:
+            del data[key]
+            await self.set_data(data)
+
+    async def set_object(self, fields: dict, records: list[dict]):
+        data = await self.get_data()
+        data["object"] = {**fields, "records": records}
+        self._index = None
+        await self.set_data(data)
+
+    async def get_object_fields(self) -> dict:
+        data = await self.get_data()
+        return {k: v for k, v in data["object"].items() if k != "records"}
+
+    async def set_object_field(self, key: str, value: Any):
+        data = await self.get_data()
+        data["object"][key] = value
+        await self.set_data(data)
+
+    async def get_records(self) -> list[dict]:
+        data = await self.get_data()
+        return data["object"]["records"]
+
+    async def get_record(self, index: int) -> dict:
+        data = await self.get_data()
+        records = data["object"]["records"]
+        return records[index]
+
+    async def get_record_index(self) -> RecordIndex:
+        if self._index is None:
+            records = await self.get_records()
+            self._index = RecordIndex(record["date"] for record in records)
+        return self._index
+
+    async def set_record_field(self, index: int, key: str, value: Any):
+        data = await self.get_data()
+        records = data["object"]["records"]
+        records[index][key] = value
+        await self.set_data(data)
+
+    async def replace_record(self, index: int, record: dict) -> int:
+        record_index = await self.get_record_index()
+        data = await self.get_data()
+        records = data["object"]["records"]
+        records.pop(index)
+        position = record_index.move(index, record["date"])
+        records.insert(position, record)
+        await self.set_data(data)
+        return position
+
+    async def insert_record(self, record: dict) -> int:
+        record_index = await self.get_record_index()
+        data = await self.get_data()
+        records = data["object"]["records"]
+        position = record_index.insert(record["date"])
+        records.insert(position, record)
+        await self.set_data(data)
+        return position
+
+    async def delete_record(self, index: int):
+        record_index = await self.get_record_index()
+        data = await self.get_data()
+        records = data["object"]["records"]
+        records.pop(index)
+        record_index.remove(index)
+        await self.set_data(data)
+
+    async def flush(self):
+        if self._dirty:
+            await self.state.set_data(self._data)
+            self._dirty = False
+
+
+class RedisHashMenuStore(MenuStore):
+    """The draft spread over Redis hashes, so edits are partial writes.
+
+    <prefix>:menu          menu values (selected record, current page, ...)
+    <prefix>:object        object fields, the record order and next record id
+    <prefix>:record:<id>   one hash per record
+
+    Field values are JSON. The record order is a list of [id, date] pairs,
+    which keeps date lookups off the record hashes. Reads fetch only the
+    hashes a screen needs; writes are queued and sent in one MULTI/EXEC
+    by flush(). With a ttl, every flush after a read restarts the TTL of
+    all the draft's keys.
+    """
+
+    ORDER_FIELD = "_records"
+    NEXT_ID_FIELD = "_next_record_id"
+
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str,
+        storage: Optional[BufferedStorage] = None,
+        ttl: Optional[int] = None,
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+        # Writes join the update's pipeline when the FSM storage buffers
+        self.storage = storage
+        self.menu_key = f"{prefix}:menu"
+        self.object_key = f"{prefix}:object"
+        self._menu: Optional[dict] = None
+        self._object: Optional[dict] = None
+        self._records: dict[int, dict] = {}
+        self._index: Optional[RecordIndex] = None
+        self._commands: list[tuple[str, tuple]] = []
+
+    @classmethod
+    def factory(cls, storage: Union[RedisStorage, BufferedStorage]) -> MenuStoreFactory:
+        def create(state: FSMContext) -> "RedisHashMenuStore":
+            # "menu" takes the place of "data"/"state" in the FSM key layout
+            prefix = storage.key_builder.build(state.key, "menu")
+            buffered = storage if isinstance(storage, BufferedStorage) else None
+            return cls(storage.redis, prefix, buffered, storage.data_ttl)
+
+        return create
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._commands)
+
+    def record_key(self, record_id: int) -> str:
+        return f"{self.prefix}:record:{record_id}"
+
+    @staticmethod
+    def _encode(mapping: dict) -> dict:
+        return {key: json.dumps(value) for key, value in mapping.items()}
+
+    @staticmethod
+    def _decode(mapping: dict) -> dict:
+        return {
+            key.decode() if isinstance(key, bytes) else key: json.loads(value)
+            for key, value in mapping.items()
+        }
+
+    def _queue(self, command: str, *args):
+        self._commands.append((command, args))
+
+    async def _load(self):
+        if self._menu is not None and self._object is not None:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self.menu_key)
+            pipe.hgetall(self.object_key)
+            menu, obj = await pipe.execute()
+        if self._menu is None:
+            self._menu = self._decode(menu)
+        if self._object is None:
+            self._object = self._decode(obj)
+
+    async def _order(self) -> list[list]:
+        await self._load()
+        return self._object.setdefault(self.ORDER_FIELD, [])
+
+    async def get_record_index(self) -> RecordIndex:
+        if self._index is None:
+            self._index = RecordIndex(date for _, date in await self._order())
+        return self._index
+
+    def _save_order(self):
+        self._queue(
+            "hset",
+            self.object_key,
+            self.ORDER_FIELD,
+            json.dumps(self._object[self.ORDER_FIELD]),
+        )
+
+    async def _record_id(self, index: int) -> int:
+        order = await self._order()
+        return order[index][0]
+
+    async def _fetch_records(self, record_ids: list[int]):
+        missing = [
+            record_id for record_id in record_ids if record_id not in self._records
+        ]
+        if not missing:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for record_id in missing:
+                pipe.hgetall(self.record_key(record_id))
+            results = await pipe.execute()
+        for record_id, record in zip(missing, results):
+            self._records[record_id] = self._decode(record)
+
+    async def get_data(self) -> dict:
+        await self._load()
+        data = dict(self._menu)
+        if self._object:
+            data["object"] = {
+                **await self.get_object_fields(),
+                "records": await self.get_records(),
+            }
+        return data
+
+    async def set_data(self, data: dict):
+        data = dict(data)
+        obj = data.pop("object", None)
+        await self._load()
+        for key in self._menu.keys() - data.keys():
+            await self.delete_value(key)
+        for key, value in data.items():
+            await self.set_value(key, value)
+
+        if obj is not None:
+            fields = {key: value for key, value in obj.items() if key != "records"}
+            await self.set_object(fields, obj.get("records", []))
+        elif self._object:
+            order = await self._order()
+            self._queue(
+                "delete", self.object_key, *(self.record_key(i) for i, _ in order)
+            )
+            self._object = {}
+            self._records = {}
+            self._index = None
+
+    async def get_value(self, key: str) -> Any:
+        await self._load()
+        return self._menu.get(key)
+
+    async def set_value(self, key: str, value: Any):
+        await self._load()
+        self._menu[key] = value
+        self._queue("hset", self.menu_key, key, json.dumps(value))
+
+    async def delete_value(self, key: str):
+        await self._load()
+        self._menu.pop(key, None)
+        self._queue("hdel", self.menu_key, key)
+
+    async def set_object(self, fields: dict, records: list[dict]):
+        order = await self._order()
+        self._queue("delete", self.object_key, *(self.record_key(i) for i, _ in order))
+
+        self._records = dict(enumerate(records))
+        self._index = None
+        self._object = {
+            **fields,
+            self.ORDER_FIELD: [[i, record["date"]] for i, record in enumerate(records)],
+            self.NEXT_ID_FIELD: len(records),
+        }
+        self._queue("hset", self.object_key, None, None, self._encode(self._object))
+        for record_id, record in self._records.items():
+            self._queue(
+                "hset", self.record_key(record_id), None, None, self._encode(record)
+            )
+
+    async def get_object_fields(self) -> dict:
+        await self._load()
+        return {
+            key: value
+            for key, value in self._object.items()
+            if key not in (self.ORDER_FIELD, self.NEXT_ID_FIELD)
+        }
+
+    async def set_object_field(self, key: str, value: Any):
+        await self._load()
+        self._object[key] = value
+        self._queue("hset", self.object_key, key, json.dumps(value))
+
+    async def get_records(self) -> list[dict]:
+        record_ids = [record_id for record_id, _ in await self._order()]
+        await self._fetch_records(record_ids)
+        return [self._records[record_id] for record_id in record_ids]
+
+    async def get_record(self, index: int) -> dict:
+        record_id = await self._record_id(index)
+        await self._fetch_records([record_id])
+        return self._records[record_id]
+
+    async def set_record_field(self, index: int, key: str, value: Any):
+        record_id = await self._record_id(index)
+        if record_id in self._records:
+            self._records[record_id][key] = value
+        self._queue("hset", self.record_key(record_id), key, json.dumps(value))
+
+    async def replace_record(self, index: int, record: dict) -> int:
+        record_index = await self.get_record_index()
+        order = await self._order()
+        record_id, _ = order.pop(index)
+        position = record_index.move(index, record["date"])
+        order.insert(position, [record_id, record["date"]])
+
+        self._records[record_id] = record
+        self._queue("delete", self.record_key(record_id))
+        self._queue(
+            "hset", self.record_key(record_id), None, None, self._encode(record)
+        )
+        self._save_order()
+        return position
+
+    async def insert_record(self, record: dict) -> int:
+        record_index = await self.get_record_index()
+        order = await self._order()
+        record_id = self._object.get(self.NEXT_ID_FIELD, len(order))
+        self._object[self.NEXT_ID_FIELD] = record_id + 1
+        self._records[record_id] = record
+        position = record_index.insert(record["date"])
+        order.insert(position, [record_id, record["date"]])
+
+        self._queue(
+            "hset", self.record_key(record_id), None, None, self._encode(record)
+        )
+        self._queue(
+            "hset", self.object_key, self.NEXT_ID_FIELD, json.dumps(record_id + 1)
+        )
+        self._save_order()
+        return position
+
+    async def delete_record(self, index: int):
+        record_index = await self.get_record_index()
+        order = await self._order()
+        record_id, _ = order.pop(index)
+        record_index.remove(index)
+        self._records.pop(record_id, None)
+        self._queue("delete", self.record_key(record_id))
+        self._save_order()
+
+    async def flush(self):
+        commands, self._commands = self._commands, []
+        if self.ttl and self._object is not None:
+            commands.extend(self._expire_commands())
+        if not commands:
+            return
+        if self.storage is not None and self.storage.defer(
+            partial(self._apply, commands)
+        ):
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._apply(commands, pipe)
+            await pipe.execute()
+
+    def _expire_commands(self) -> list[tuple[str, tuple]]:
+        keys = [self.menu_key, self.object_key]
+        keys.extend(
+            self.record_key(i) for i, _ in self._object.get(self.ORDER_FIELD, [])
+        )
+        return [("expire", (key, self.ttl)) for key in keys]
+
+    @staticmethod
+    def _apply(commands: list[tuple[str, tuple]], pipe: Pipeline):
+        for command, args in commands:
+            getattr(pipe, command)(*args)
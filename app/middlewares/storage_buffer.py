@@ -0,0 +1,25 @@
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from app.storage.buffered import BufferedStorage
+
+
+class StorageBufferMiddleware(BaseMiddleware):
+    """Outer update middleware: the FSM writes of an update go out together"""
+
+    def __init__(self, storage: BufferedStorage) -> None:
+        super().__init__()
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with self.storage.buffer():
+            state = data.get("state")
+            if state is not None:
+                # Any update from the user counts as activity for the TTLs
+                self.storage.touch(state.key)
+            return await handler(event, data)
@@ -0,0 +1,166 @@
+from typing import Awaitable, Callable, Hashable, Optional
+from app.settings.config import ConnectorConfig
+from .cache import CacheStats, TTLCache
+from .models.rent_object import RentObject, UpdateRentObjectInput
+from .models.record import Record, UpdateRecordInput
+from .models.record_page import RecordPage
+from .models.rent_object_info import RentObjectInfo
+from .rent_object_service import RentObjectService
+
+
+class CachedRentObjectService(RentObjectService):
+    """RentObjectService with a read-through cache of backend reads.
+
+    Entries are keyed by ``(user_id, object_name, kind, ...)`` and every write
+    drops the entries it could make stale. Cached models are shared between
+    callers and must not be mutated.
+    """
+
+    OBJECT_LIST = "objects"
+    OBJECT = "object"
+    RECORDS = "records"
+    RECORD = "record"
+    RECORD_PAGES = "record_pages"
+    OBJECT_INFO = "info"
+
+    # Neighbouring pages come from the cached window
+    PAGES_PER_REQUEST = 3
+
+    def __init__(
+        self,
+        uri: str,
+        connector_config: Optional[ConnectorConfig] = None,
+        max_size: int = 1024,
+        ttl: float = 60,
+        **kwargs,
+    ):
+        super().__init__(uri, connector_config, **kwargs)
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        for name, help, type, callback in (
+            ("cache_hits_total", "Read cache hits", "counter", self._hits),
+            ("cache_misses_total", "Read cache misses", "counter", self._misses),
+            ("cache_entries", "Read cache entries", "gauge", self.cache.__len__),
+        ):
+            self.metrics.register_callback(name, help, callback, type)
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def _hits(self) -> int:
+        return self.cache.stats.hits
+
+    def _misses(self) -> int:
+        return self.cache.stats.misses
+
+    async def add_object(self, user_id: int, rent_object: RentObject):
+        try:
+            await super().add_object(user_id, rent_object)
+        finally:
+            self._invalidate_object(user_id, rent_object.name)
+
+    async def delete_object(self, user_id: int, object_name: str):
+        try:
+            await super().delete_object(user_id, object_name)
+        finally:
+            self._invalidate_object(user_id, object_name)
+
+    async def update_object(
+        self, user_id: int, object_name: str, update: UpdateRentObjectInput
+    ):
+        try:
+            await super().update_object(user_id, object_name, update)
+        finally:
+            self._invalidate_object(user_id, object_name)
+            if update.name is not None:
+                self._invalidate_object(user_id, update.name)
+
+    async def get_by_name(self, user_id: int, object_name: str) -> RentObject:
+        return await self._cached(
+            (user_id, object_name, self.OBJECT),
+            lambda: super(CachedRentObjectService, self).get_by_name(
+                user_id, object_name
+            ),
+        )
+
+    async def get_all(self, user_id: int) -> list[RentObject]:
+        return await self._cached(
+            (user_id, None, self.OBJECT_LIST),
+            lambda: super(CachedRentObjectService, self).get_all(user_id),
+        )
+
+    async def add_record(self, user_id: int, object_name: str, record: Record):
+        try:
+            await super().add_record(user_id, object_name, record)
+        finally:
+            self._invalidate_object(user_id, object_name)
+
+    async def delete_record(self, user_id: int, object_name: str, record_index: int):
+        try:
+            await super().delete_record(user_id, object_name, record_index)
+        finally:
+            self._invalidate_object(user_id, object_name)
+
+    async def update_record(
+        self,
+        user_id: int,
+        object_name: str,
+        record_index: int,
+        update: UpdateRecordInput,
+    ):
+        try:
+            await super().update_record(user_id, object_name, record_index, update)
+        finally:
+            self._invalidate_object(user_id, object_name)
+
+    async def get_reccord(
+        self, user_id: int, object_name: str, record_index: int
+    ) -> Record:
+        return await self._cached(
+            (user_id, object_name, self.RECORD, record_index),
+            lambda: super(CachedRentObjectService, self).get_reccord(
+                user_id, object_name, record_index
+            ),
+        )
+
+    async def get_all_records(self, user_id: int, object_name: str) -> list[Record]:
+        return await self._cached(
+            (user_id, object_name, self.RECORDS),
+            lambda: super(CachedRentObjectService, self).get_all_records(
+                user_id, object_name
+            ),
+        )
+
+    async def _get_records_window(
+        self, user_id: int, object_name: str, offset: int, limit: int
+    ) -> RecordPage:
+        return await self._cached(
+            (user_id, object_name, self.RECORD_PAGES, offset, limit),
+            lambda: super(CachedRentObjectService, self)._get_records_window(
+                user_id, object_name, offset, limit
+            ),
+        )
+
+    async def get_object_info(self, user_id: int, object_name: str) -> RentObjectInfo:
+        return await self._cached(
+            (user_id, object_name, self.OBJECT_INFO),
+            lambda: super(CachedRentObjectService, self).get_object_info(
+                user_id, object_name
+            ),
+        )
+
+    async def _cached(self, key: Hashable, load: Callable[[], Awaitable]):
+        found, value = self.cache.get(key)
+        if found:
+            return value
+
+        generation = self.cache.generation
+        value = await load()
+        self.cache.set(key, value, generation)
+        return value
+
+    def _invalidate_object(self, user_id: int, object_name: str):
+        # The object list embeds every object's records, so it goes stale too
+        self.cache.delete_where(
+            lambda key: key[0] == user_id and key[1] in (None, object_name)
+        )
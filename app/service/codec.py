@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Optional, Union
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class StdlibJSONCodec:
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj, default=self._default, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    @staticmethod
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.astimezone(timezone.utc).strftime(DATETIME_FORMAT)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_UTC_Z | orjson.OPT_OMIT_MICROSECONDS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec:
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+JSONCodec = Union[StdlibJSONCodec, OrjsonCodec, MsgspecCodec]
+
+CODECS = {codec.name: codec for codec in (OrjsonCodec, MsgspecCodec, StdlibJSONCodec)}
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """Codec by name, or the fastest one that is installed.
+
+    Datetimes are encoded natively and must be timezone aware UTC without
+    microseconds (see Record.to_payload) to match DATETIME_FORMAT.
+    """
+    if name is not None:
+        return CODECS[name]()
+
+    for codec in CODECS.values():
+        try:
+            return codec()
+        except ImportError:
+            continue
+    return StdlibJSONCodec()
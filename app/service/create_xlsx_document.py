@@ -1,10 +1,17 @@
 from datetime import datetime
 from pathlib import Path
-import xlsxwriter
-from app.service.models.rent_object_info import RecordInfo, RentObjectInfo
+from typing import TYPE_CHECKING, Iterable
+from app.service.models.rent_object_info import (
+    RecordInfo,
+    ObjectSummary,
+    RentObjectInfo,
+)
 from app.settings.config import PATH_TO_ROOT
 from string import ascii_uppercase
 
+if TYPE_CHECKING:
+    from xlsxwriter.worksheet import Worksheet
+
 PATH_TO_TMP = PATH_TO_ROOT / "tmp"
 
 
@@ -73,9 +80,7 @@ class RentObjectXLSXWriter:
     OBJECT_INFO_OFFSET = 3
 
     def create(self, object_info: RentObjectInfo, filepath=None):
-        self.rent_object_info = object_info
-        self.records_info = object_info.records_info
-        self.records_count = len(self.records_info)
+        self.records_count = len(object_info.records_info)
         self.RECORDS_SUMMARY_START = (
             self.RECORDS_INFO_START
             + 1
@@ -86,7 +91,11 @@ class RentObjectXLSXWriter:
             self.RECORDS_SUMMARY_START + 1 + self.OBJECT_INFO_OFFSET
         )
 
-        filepath = filepath or PATH_TO_TMP / f"{self.rent_object_info.name}.xlsx"
+        filepath = filepath or PATH_TO_TMP / f"{object_info.name}.xlsx"
+
+        # Keyboards import format_date from here, so xlsxwriter waits until a
+        # document is actually written
+        import xlsxwriter
 
         self.workbook = xlsxwriter.Workbook(filepath)
         self.worksheet = self.workbook.add_worksheet()
@@ -96,23 +105,23 @@ class RentObjectXLSXWriter:
 
         self.money_format = self.workbook.add_format(self.MONEY_FORMAT)
 
-        self.write_records_data(self.worksheet)
-        self.write_object_info(self.worksheet)
+        self.write_records_data(self.worksheet, object_info.records_info)
+        self.write_object_info(self.worksheet, object_info.summary)
         self.workbook.close()
         return filepath
 
-    def write_records_data(self, worksheet):
+    def write_records_data(self, worksheet, records_info: Iterable[RecordInfo]):
         self.write_headers(worksheet)
-        self.write_rows(worksheet, self.records_info)
-        self.writer_last_sum_line(worksheet, len(self.records_info))
+        self.write_rows(worksheet, records_info)
+        self.writer_last_sum_line(worksheet, self.records_count)
 
-    def write_headers(self, worksheet: xlsxwriter.workbook.Worksheet):
+    def write_headers(self, worksheet: "Worksheet"):
         row = self.RECORDS_INFO_START
         for col, header in enumerate(self.RECORD_HEADERS, start=1):
             worksheet.set_column_pixels(row, col, 105)
             worksheet.write(row, col, header, self.header_format)
 
-    def write_rows(self, worksheet, records):
+    def write_rows(self, worksheet, records: Iterable[RecordInfo]):
         start = self.RECORDS_INFO_START + 1
         for row, record in enumerate(records, start=start):
             self.write_row(worksheet, row, record)
@@ -147,10 +156,10 @@ class RentObjectXLSXWriter:
                 self.money_format,
             )
 
-    def write_object_info(self, worksheet):
+    def write_object_info(self, worksheet, summary: ObjectSummary):
         self.write_object_headers(worksheet)
-        self.write_object_data(worksheet)
-        self.write_payback(worksheet)
+        self.write_object_data(worksheet, summary)
+        self.write_payback(worksheet, summary)
 
     def write_object_headers(self, worksheet):
         row = self.OBJECT_INFO_START
@@ -158,23 +167,13 @@ class RentObjectXLSXWriter:
             worksheet.set_column_pixels(row, col, 105)
             worksheet.write(row, col, header, self.header_format)
 
-    def write_object_data(self, worksheet):
+    def write_object_data(self, worksheet, summary: ObjectSummary):
         row = self.OBJECT_INFO_START + 1
-        average_profit = (
-            self.rent_object_info.get_average_income_with_tax()
-            - self.rent_object_info.get_average_expenses()
-        )
-        worksheet.write(row, 1, self.rent_object_info.area)
-        worksheet.write(row, 2, self.records_count)
-        worksheet.write(
-            row, 3, self.rent_object_info.get_average_income(), self.money_format
-        )
-        worksheet.write(
-            row,
-            4,
-            self.rent_object_info.get_average_income_with_tax(),
-            self.money_format,
-        )
+        average_profit = summary.mean_profit_after_tax
+        worksheet.write(row, 1, summary.area)
+        worksheet.write(row, 2, summary.count)
+        worksheet.write(row, 3, summary.mean_income, self.money_format)
+        worksheet.write(row, 4, summary.mean_income_after_tax, self.money_format)
         worksheet.write(row, 5, average_profit, self.money_format)
         worksheet.write(row, 6, average_profit * 12, self.money_format)
         worksheet.write(row, 7, average_profit * 12 * 5, self.money_format)
@@ -182,34 +181,9 @@ class RentObjectXLSXWriter:
         worksheet.write(row, 9, average_profit * 12 * 8, self.money_format)
         worksheet.write(row, 10, average_profit * 12 * 10, self.money_format)
 
-    def write_payback(self, worksheet):
+    def write_payback(self, worksheet, summary: ObjectSummary):
         row = self.OBJECT_INFO_START + 1 + 2
-        average_profit = (
-            self.rent_object_info.get_average_income_with_tax()
-            - self.rent_object_info.get_average_expenses()
-        )
+        profit_by_area = summary.mean_profit_after_tax_by_area
         worksheet.write(row, 6, "Стоимость")
-        worksheet.write(
-            row,
-            7,
-            average_profit * 12 * 5 / self.rent_object_info.area,
-            self.money_format,
-        )
-        worksheet.write(
-            row,
-            8,
-            average_profit * 12 * 7 / self.rent_object_info.area,
-            self.money_format,
-        )
-        worksheet.write(
-            row,
-            9,
-            average_profit * 12 * 8 / self.rent_object_info.area,
-            self.money_format,
-        )
-        worksheet.write(
-            row,
-            10,
-            average_profit * 12 * 10 / self.rent_object_info.area,
-            self.money_format,
-        )
+        for col, years in enumerate((5, 7, 8, 10), start=7):
+            worksheet.write(row, col, profit_by_area * 12 * years, self.money_format)
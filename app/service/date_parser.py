@@ -0,0 +1,67 @@
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+MONTH_NAMES = {
+    1: ("январь", "января", "янв"),
+    2: ("февраль", "февраля", "фев"),
+    3: ("март", "марта", "мар"),
+    4: ("апрель", "апреля", "апр"),
+    5: ("май", "мая"),
+    6: ("июнь", "июня", "июн"),
+    7: ("июль", "июля", "июл"),
+    8: ("август", "августа", "авг"),
+    9: ("сентябрь", "сентября", "сен", "сент"),
+    10: ("октябрь", "октября", "окт"),
+    11: ("ноябрь", "ноября", "ноя", "нояб"),
+    12: ("декабрь", "декабря", "дек"),
+}
+MONTHS = {name: month for month, names in MONTH_NAMES.items() for name in names}
+
+NUMERIC_RE = re.compile(r"\s*(\d{1,2})[./-](\d{4}|\d{2})\s*")
+NAMED_RE = re.compile(r"\s*([а-яё]+)\.?[\s./-]*(\d{4}|\d{2})\s*", re.IGNORECASE)
+
+DATEPARSER_FORMATS = ["%m.%y", "%m.%Y"]
+DATEPARSER_SETTINGS = {"PREFER_DAY_OF_MONTH": "first"}
+
+
+def parse_month_year(text: str) -> Optional[datetime]:
+    """Parse a МЕСЯЦ.ГОД date into the first day of that month in UTC.
+
+    MM.YY, MM.YYYY and Russian month names are matched directly; any other
+    input goes through dateparser, which is imported only then.
+    """
+    match = NUMERIC_RE.fullmatch(text)
+    if match is not None:
+        return _month_start(int(match[1]), match[2])
+    match = NAMED_RE.fullmatch(text)
+    if match is not None and match[1].lower() in MONTHS:
+        return _month_start(MONTHS[match[1].lower()], match[2])
+    return _parse_fallback(text)
+
+
+def _month_start(month: int, year: str) -> Optional[datetime]:
+    if not 1 <= month <= 12:
+        return None
+    return datetime(_parse_year(year), month, 1, tzinfo=timezone.utc)
+
+
+def _parse_year(year: str) -> int:
+    value = int(year)
+    if len(year) == 2:
+        # Same pivot as strptime's %y
+        value += 2000 if value < 69 else 1900
+    return value
+
+
+def _parse_fallback(text: str) -> Optional[datetime]:
+    import dateparser
+
+    date = dateparser.parse(
+        text, date_formats=DATEPARSER_FORMATS, settings=DATEPARSER_SETTINGS
+    )
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
@@ -0,0 +1,141 @@
+import logging
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = tuple(256 * 4**i for i in range(9))  # 256 B .. 16 MiB
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class BackendMetrics:
+    """Per-endpoint latency, payload size and outcome counts of backend calls"""
+
+    PREFIX = "rent_object_backend"
+
+    def __init__(self):
+        self.latency: dict[str, Histogram] = {}
+        self.request_size: dict[str, Histogram] = {}
+        self.response_size: dict[str, Histogram] = {}
+        self.statuses: Counter[tuple[str, int]] = Counter()
+        self.exceptions: Counter[tuple[str, str]] = Counter()
+        self._gauges: list[tuple[str, str, str, Callable[[], float]]] = []
+
+    def observe(
+        self,
+        endpoint: str,
+        seconds: float,
+        status: Optional[int] = None,
+        request_size: Optional[int] = None,
+        response_size: Optional[int] = None,
+        exception: Optional[BaseException] = None,
+    ):
+        self._histogram(self.latency, endpoint, LATENCY_BUCKETS).observe(seconds)
+        if request_size is not None:
+            histogram = self._histogram(self.request_size, endpoint, SIZE_BUCKETS)
+            histogram.observe(request_size)
+        if response_size is not None:
+            histogram = self._histogram(self.response_size, endpoint, SIZE_BUCKETS)
+            histogram.observe(response_size)
+        if status is not None:
+            self.statuses[endpoint, status] += 1
+        if exception is not None:
+            self.exceptions[endpoint, type(exception).__name__] += 1
+
+    def register_callback(
+        self, name: str, help: str, callback: Callable[[], float], type: str = "gauge"
+    ):
+        """Value read from ``callback`` on every scrape"""
+        self._gauges.append((f"{self.PREFIX}_{name}", help, type, callback))
+
+    def render(self) -> str:
+        lines = []
+        for name, help, histograms in (
+            ("request_duration_seconds", "Backend request latency", self.latency),
+            ("request_size_bytes", "Backend request body size", self.request_size),
+            ("response_size_bytes", "Backend response body size", self.response_size),
+        ):
+            name = f"{self.PREFIX}_{name}"
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+            for endpoint, histogram in sorted(histograms.items()):
+                lines += histogram.render(name, f'endpoint="{_escape(endpoint)}"')
+
+        name = f"{self.PREFIX}_responses_total"
+        lines += [
+            f"# HELP {name} Backend responses by status",
+            f"# TYPE {name} counter",
+        ]
+        for (endpoint, status), count in sorted(self.statuses.items()):
+            lines.append(
+                f'{name}{{endpoint="{_escape(endpoint)}",status="{status}"}} {count}'
+            )
+
+        name = f"{self.PREFIX}_errors_total"
+        lines += [f"# HELP {name} Backend request exceptions", f"# TYPE {name} counter"]
+        for (endpoint, exception), count in sorted(self.exceptions.items()):
+            lines.append(
+                f'{name}{{endpoint="{_escape(endpoint)}",'
+                f'exception="{_escape(exception)}"}} {count}'
+            )
+
+        for name, help, type, callback in self._gauges:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {type}"]
+            lines.append(f"{name} {callback()}")
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram(
+        self, histograms: dict[str, Histogram], endpoint: str, buckets: tuple
+    ) -> Histogram:
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = Histogram(buckets)
+        return histogram
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+async def start_metrics_server(
+    metrics: BackendMetrics, host: str, port: int
+) -> web.AppRunner:
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(
+            text=metrics.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Serving metrics on http://%s:%s/metrics", host, port)
+    return runner
@@ -1,8 +1,27 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
 
-import pytz
+RECORD_FIELDS = (
+    "rent",
+    "heat",
+    "exploitation",
+    "mop",
+    "renovation",
+    "tbo",
+    "electricity",
+    "earth_rent",
+    "other",
+    "security",
+)
+
+
+def to_utc(date: datetime) -> datetime:
+    return date.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def format_datetime(date: datetime) -> str:
+    return to_utc(date).isoformat().replace("+00:00", "Z")
 
 
 @dataclass
@@ -47,9 +66,25 @@ class Record:
             security=security,
         )
 
+    def to_payload(self) -> dict:
+        """Fields for a JSON codec, the date stays a UTC datetime"""
+        return {
+            "date": to_utc(self.date),
+            "rent": self.rent,
+            "heat": self.heat,
+            "exploitation": self.exploitation,
+            "mop": self.mop,
+            "renovation": self.renovation,
+            "tbo": self.tbo,
+            "electricity": self.electricity,
+            "earth_rent": self.earth_rent,
+            "other": self.other,
+            "security": self.security,
+        }
+
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data["date"] = self.date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        data = self.to_payload()
+        data["date"] = format_datetime(self.date)
         return data
 
 
@@ -67,10 +102,19 @@ class UpdateRecordInput:
     other: Optional[float] = field(default=None)
     security: Optional[float] = field(default=None)
 
-    def to_dict(self) -> dict:
-        data = asdict(self)
+    def to_payload(self) -> dict:
+        """Set fields for a JSON codec, the date stays a UTC datetime"""
+        data = {}
         if self.date is not None:
-            data["date"] = self.date.astimezone(timezone.utc).strftime(
-                "%Y-%m-%dT%H:%M:%SZ"
-            )
+            data["date"] = to_utc(self.date)
+        for key in RECORD_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        return data
+
+    def to_dict(self) -> dict:
+        data = self.to_payload()
+        if "date" in data:
+            data["date"] = format_datetime(self.date)
         return data
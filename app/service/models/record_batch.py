@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional, Union, overload
+
+import numpy as np
+
+from .record import RECORD_FIELDS, Record, to_utc
+
+FIELD_INDEX = {key: i for i, key in enumerate(RECORD_FIELDS)}
+EXPENSE_COLUMNS = slice(FIELD_INDEX["heat"], None)
+
+
+def _to_datetime64(date: str) -> str:
+    if date.endswith("Z"):
+        return date[:-1]
+    return to_utc(datetime.fromisoformat(date)).replace(tzinfo=None).isoformat()
+
+
+class RecordBatch:
+    """Columnar history of an object.
+
+    ``dates`` is a datetime64[s] (UTC) array and ``values`` a float64 matrix
+    with one column per RECORD_FIELDS entry. Slicing returns views, so pages
+    and date ranges don't copy or build Record objects.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray):
+        self.dates = dates
+        self.values = values
+
+    @staticmethod
+    def from_json(data: list[dict]) -> "RecordBatch":
+        dates = np.array(
+            [_to_datetime64(el["date"]) for el in data], dtype="datetime64[s]"
+        )
+        values = np.array(
+            [[el[key] for key in RECORD_FIELDS] for el in data], dtype=np.float64
+        ).reshape(len(data), len(RECORD_FIELDS))
+        return RecordBatch(dates, values)
+
+    @staticmethod
+    def from_records(records: Iterable[Record]) -> "RecordBatch":
+        records = list(records)
+        dates = np.array(
+            [to_utc(r.date).replace(tzinfo=None) for r in records],
+            dtype="datetime64[s]",
+        )
+        values = np.array(
+            [[getattr(r, key) for key in RECORD_FIELDS] for r in records],
+            dtype=np.float64,
+        ).reshape(len(records), len(RECORD_FIELDS))
+        return RecordBatch(dates, values)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @overload
+    def __getitem__(self, index: int) -> Record:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "RecordBatch":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return RecordBatch(self.dates[index], self.values[index])
+        return self.record(index)
+
+    def __iter__(self) -> Iterator[Record]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def column(self, key: str) -> np.ndarray:
+        return self.values[:, FIELD_INDEX[key]]
+
+    def expenses(self) -> np.ndarray:
+        # Added column by column, in field order, so the rounding is the same
+        # as summing the fields of one record in Python
+        columns = self.values[:, EXPENSE_COLUMNS]
+        expenses = np.zeros(len(self))
+        for i in range(columns.shape[1]):
+            expenses += columns[:, i]
+        return expenses
+
+    def datetimes(self) -> list[datetime]:
+        return [
+            date.replace(tzinfo=timezone.utc)
+            for date in self.dates.astype(datetime).tolist()
+        ]
+
+    def between(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> "RecordBatch":
+        """Records with start <= date < end, the batch must be sorted by date"""
+        lo = 0 if start is None else self._search(start)
+        hi = len(self) if end is None else self._search(end)
+        return self[lo:hi]
+
+    def record(self, index: int) -> Record:
+        date = self.dates[index].astype(datetime).replace(tzinfo=timezone.utc)
+        values = self.values[index].tolist()
+        return Record(date, *values)
+
+    def to_records(self) -> list[Record]:
+        dates = self.datetimes()
+        return [
+            Record(date, *values) for date, values in zip(dates, self.values.tolist())
+        ]
+
+    def _search(self, date: datetime) -> int:
+        value = np.datetime64(to_utc(date).replace(tzinfo=None), "s")
+        return int(np.searchsorted(self.dates, value, side="left"))
@@ -0,0 +1,62 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterable, Optional
+
+
+def page_bounds(count: int, page: int, size: int) -> tuple[int, int]:
+    """start, end of a newest-first page over count date-ordered items"""
+    end = max(count - page * size, 0)
+    return max(end - size, 0), end
+
+
+class RecordIndex:
+    """ISO dates of an object's records, in the order of the record list.
+
+    Positions are record indices. The dates are kept sorted, so inserts,
+    moves and month lookups bisect instead of sorting or scanning.
+    """
+
+    def __init__(self, dates: Iterable[str] = ()):
+        self.dates = list(dates)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index: int) -> str:
+        return self.dates[index]
+
+    def insert(self, date: str) -> int:
+        """Adds a date after any equal ones, returns its position"""
+        position = bisect_right(self.dates, date)
+        self.dates.insert(position, date)
+        return position
+
+    def remove(self, index: int):
+        del self.dates[index]
+
+    def move(self, index: int, date: str) -> int:
+        """Changes the date at index, returns its new position.
+
+        Among equal dates the entry keeps its place, as a stable sort would.
+        """
+        del self.dates[index]
+        lo = bisect_left(self.dates, date)
+        hi = bisect_right(self.dates, date, lo)
+        position = min(max(index, lo), hi)
+        self.dates.insert(position, date)
+        return position
+
+    def find_month(self, year: int, month: int) -> range:
+        """Positions of the records dated in the month"""
+        start = f"{year:04d}-{month:02d}"
+        end = f"{year + 1:04d}-01" if month == 12 else f"{year:04d}-{month + 1:02d}"
+        lo = bisect_left(self.dates, start)
+        return range(lo, bisect_left(self.dates, end, lo))
+
+    def page(self, page: int, size: int) -> range:
+        """Positions on a page, newest first"""
+        start, end = page_bounds(len(self.dates), page, size)
+        return range(end - 1, start - 1, -1)
+
+    def datetimes(self, start: int = 0, end: Optional[int] = None) -> list[datetime]:
+        return [datetime.fromisoformat(date) for date in self.dates[start:end]]
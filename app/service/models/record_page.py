@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from .record import Record
+
+
+@dataclass
+class RecordPage:
+    """A window of an object's date-ordered records.
+
+    records are the records start.. of the full list and len() is the
+    length of the full list, so a page can stand in for it where only the
+    window is read.
+    """
+
+    records: list[Record]
+    start: int
+    total: int
+
+    def __len__(self) -> int:
+        return self.total
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.records)
+
+    def window(self, start: int, end: int) -> "RecordPage":
+        """The records start..end, which must be in this page.
+
+        The bounds are first clamped to the full list, so a page number
+        before the first or past the last page gives an empty window, as
+        slicing the full list would.
+        """
+        start = min(max(start, 0), self.total)
+        end = min(max(end, start), self.total)
+        if start < self.start or end > self.end:
+            raise IndexError(f"{start}..{end} is outside {self.start}..{self.end}")
+        return RecordPage(
+            self.records[start - self.start : end - self.start], start, self.total
+        )
+
+    def datetimes(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> list[datetime]:
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        return [record.date for record in self.window(start, end).records]
@@ -23,6 +23,15 @@ class RentObject:
             name=name, description=description, area=area, records=records
         )
 
+    def to_payload(self) -> dict:
+        """Fields for a JSON codec, record dates stay UTC datetimes"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "area": self.area,
+            "records": [r.to_payload() for r in self.records],
+        }
+
     def to_dict(self) -> dict:
         records_dict = [r.to_dict() for r in self.records]
         return {
@@ -38,3 +47,6 @@ class UpdateRentObjectInput:
     name: Optional[str] = field(default=None)
     description: Optional[str] = field(default=None)
     area: Optional[float] = field(default=None)
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "description": self.description, "area": self.area}
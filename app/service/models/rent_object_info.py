@@ -1,6 +1,10 @@
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
+from typing import Optional
 from .record import Record
 
+INCOME_AFTER_TAX = 0.94
+
 
 @dataclass
 class RecordInfo:
@@ -37,7 +41,12 @@ class RentObjectInfo:
     name: str
     description: str
     area: float
-    records_info: list[RecordInfo]
+    # A tuple, so that the cached summary can't go stale through in-place
+    # changes; lists are converted on assignment
+    records_info: tuple[RecordInfo, ...]
+    _summary: Optional["ObjectSummary"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @staticmethod
     def from_dict(data: dict) -> "RentObjectInfo":
@@ -53,15 +62,177 @@ class RentObjectInfo:
             name=name, description=description, area=area, records_info=records_info
         )
 
+    def __setattr__(self, name, value):
+        if name == "records_info":
+            value = tuple(value)
+        if name in ("records_info", "area"):
+            object.__setattr__(self, "_summary", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def summary(self) -> "ObjectSummary":
+        """Statistics over records_info, computed once and cached.
+
+        Reassigning records_info or area drops the cache.
+        """
+        if self._summary is None:
+            builder = ObjectSummaryBuilder()
+            for record_info in self.records_info:
+                builder.add(record_info)
+            self._summary = builder.build(self.area)
+        return self._summary
+
     def get_average_income(self) -> float:
-        return sum(record.income for record in self.records_info) / len(
-            self.records_info
-        )
+        return self.summary.mean_income
 
     def get_average_income_with_tax(self) -> float:
-        return self.get_average_income() * 0.94
+        return self.summary.mean_income_after_tax
 
     def get_average_expenses(self) -> float:
-        return sum(record.expenses for record in self.records_info) / len(
-            self.records_info
+        return self.summary.mean_expenses
+
+
+@dataclass
+class PeriodSummary:
+    count: int = field(default=0)
+    income: float = field(default=0)
+    expenses: float = field(default=0)
+    profit: float = field(default=0)
+
+    def add(self, record_info: RecordInfo):
+        self.count += 1
+        self.income += record_info.income
+        self.expenses += record_info.expenses
+        self.profit += record_info.profit
+
+    @property
+    def mean_income(self) -> float:
+        return self.income / self.count if self.count else 0
+
+    @property
+    def mean_expenses(self) -> float:
+        return self.expenses / self.count if self.count else 0
+
+    @property
+    def mean_profit(self) -> float:
+        return self.profit / self.count if self.count else 0
+
+
+@dataclass(frozen=True)
+class ObjectSummary:
+    area: float
+    count: int
+    income: float
+    expenses: float
+    profit: float
+    min_income: float
+    max_income: float
+    min_expenses: float
+    max_expenses: float
+    min_profit: float
+    max_profit: float
+    yearly: dict[int, PeriodSummary]
+    quarterly: dict[tuple[int, int], PeriodSummary]
+
+    @property
+    def mean_income(self) -> float:
+        return self.income / self.count if self.count else 0
+
+    @property
+    def mean_expenses(self) -> float:
+        return self.expenses / self.count if self.count else 0
+
+    @property
+    def mean_profit(self) -> float:
+        return self.profit / self.count if self.count else 0
+
+    @property
+    def mean_income_after_tax(self) -> float:
+        return self.mean_income * INCOME_AFTER_TAX
+
+    @property
+    def mean_profit_after_tax(self) -> float:
+        return self.mean_income_after_tax - self.mean_expenses
+
+    @property
+    def mean_income_by_area(self) -> float:
+        return self._by_area(self.mean_income)
+
+    @property
+    def mean_expenses_by_area(self) -> float:
+        return self._by_area(self.mean_expenses)
+
+    @property
+    def mean_profit_by_area(self) -> float:
+        return self._by_area(self.mean_profit)
+
+    @property
+    def mean_profit_after_tax_by_area(self) -> float:
+        return self._by_area(self.mean_profit_after_tax)
+
+    def _by_area(self, value: float) -> float:
+        return value / self.area if self.area else 0
+
+
+class ObjectSummaryBuilder:
+    """Accumulates an ObjectSummary in a single pass over RecordInfo"""
+
+    def __init__(self):
+        self.total = PeriodSummary()
+        self.yearly: dict[int, PeriodSummary] = {}
+        self.quarterly: dict[tuple[int, int], PeriodSummary] = {}
+        self.min_income = self.min_expenses = self.min_profit = math.inf
+        self.max_income = self.max_expenses = self.max_profit = -math.inf
+
+    @property
+    def count(self) -> int:
+        return self.total.count
+
+    def add(self, record_info: RecordInfo):
+        date = record_info.record.date
+        year = date.year
+        quarter = (year, (date.month - 1) // 3 + 1)
+
+        self.total.add(record_info)
+        if year not in self.yearly:
+            self.yearly[year] = PeriodSummary()
+        self.yearly[year].add(record_info)
+        if quarter not in self.quarterly:
+            self.quarterly[quarter] = PeriodSummary()
+        self.quarterly[quarter].add(record_info)
+
+        income, expenses, profit = (
+            record_info.income,
+            record_info.expenses,
+            record_info.profit,
+        )
+        if income < self.min_income:
+            self.min_income = income
+        if income > self.max_income:
+            self.max_income = income
+        if expenses < self.min_expenses:
+            self.min_expenses = expenses
+        if expenses > self.max_expenses:
+            self.max_expenses = expenses
+        if profit < self.min_profit:
+            self.min_profit = profit
+        if profit > self.max_profit:
+            self.max_profit = profit
+
+    def build(self, area: float) -> ObjectSummary:
+        empty = not self.total.count
+        return ObjectSummary(
+            area=area,
+            count=self.total.count,
+            income=self.total.income,
+            expenses=self.total.expenses,
+            profit=self.total.profit,
+            min_income=0 if empty else self.min_income,
+            max_income=0 if empty else self.max_income,
+            min_expenses=0 if empty else self.min_expenses,
+            max_expenses=0 if empty else self.max_expenses,
+            min_profit=0 if empty else self.min_profit,
+            max_profit=0 if empty else self.max_profit,
+            yearly=dict(sorted(self.yearly.items())),
+            quarterly=dict(sorted(self.quarterly.items())),
         )
@@ -0,0 +1,52 @@
+from typing import Iterator
+
+import numpy as np
+
+from .models.record_batch import RecordBatch
+from .models.rent_object import RentObject
+from .models.rent_object_info import RecordInfo, RentObjectInfo
+
+
+class RecordInfoColumns:
+    """RecordInfo fields of every record of a batch, one array per field"""
+
+    def __init__(self, batch: RecordBatch, area: float):
+        self.batch = batch
+        self.income = batch.column("rent").copy()
+        self.expenses = batch.expenses()
+        self.profit = self.income - self.expenses
+        if area:
+            self.income_by_area = self.income / area
+            self.expenses_by_area = self.expenses / area
+            self.profit_by_area = self.profit / area
+        else:
+            self.income_by_area = np.zeros(len(batch))
+            self.expenses_by_area = np.zeros(len(batch))
+            self.profit_by_area = np.zeros(len(batch))
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+    def __iter__(self) -> Iterator[RecordInfo]:
+        columns = zip(
+            self.batch.to_records(),
+            self.income.tolist(),
+            self.expenses.tolist(),
+            self.profit.tolist(),
+            self.income_by_area.tolist(),
+            self.expenses_by_area.tolist(),
+            self.profit_by_area.tolist(),
+        )
+        for values in columns:
+            yield RecordInfo(*values)
+
+
+def compute_object_info(obj: RentObject) -> RentObjectInfo:
+    """What /getObjectInfo returns for ``obj``, computed locally"""
+    batch = RecordBatch.from_records(obj.records)
+    return RentObjectInfo(
+        name=obj.name,
+        description=obj.description,
+        area=obj.area,
+        records_info=list(RecordInfoColumns(batch, obj.area)),
+    )
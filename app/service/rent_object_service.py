@@ -1,9 +1,17 @@
+import asyncio
+import time
+from typing import Hashable, Iterable, Optional
 import aiohttp
-import json
-from dataclasses import asdict
+from dataclasses import dataclass, field
+from app.settings.config import ConnectorConfig
 from .models.rent_object import RentObject, UpdateRentObjectInput
 from .models.record import Record, UpdateRecordInput
+from .models.record_index import page_bounds
+from .models.record_page import RecordPage
 from .models.rent_object_info import RentObjectInfo
+from .codec import JSONCodec, get_codec
+from .metrics import BackendMetrics
+from .resilience import CircuitBreaker, CircuitState, RetryPolicy
 
 
 class ObjectAlreadyExistsExcpetion(Exception):
@@ -26,25 +34,105 @@ class ServerInternalErrorException(Exception):
     ...
 
 
+class ServiceUnavailableException(Exception):
+    ...
+
+
+@dataclass
+class RecordWriteResult:
+    record: Record
+    error: Optional[Exception] = field(default=None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class RentObjectService:
+    BULK_WRITE_CONCURRENCY = 4
+
+    DEFAULT_TIMEOUT = 5
+    ENDPOINT_TIMEOUTS = {
+        "/getRecords": 15,
+        "/getObjectInfo": 15,
+        "/getAll": 10,
+    }
+
+    JSON_HEADERS = {"Content-Type": "application/json"}
+
     USER_ID_QUERY_PARAM = "userId"
     OBJECT_NAME_QUERY_PARAM = "objectName"
     RECORD_INDEX_QUERY_PARAM = "recordIndex"
+    OFFSET_QUERY_PARAM = "offset"
+    LIMIT_QUERY_PARAM = "limit"
+
+    # get_records_page fetches this many pages at once
+    PAGES_PER_REQUEST = 1
 
-    def __init__(self, uri: str):
+    def __init__(
+        self,
+        uri: str,
+        connector_config: Optional[ConnectorConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Optional[JSONCodec] = None,
+        metrics: Optional[BackendMetrics] = None,
+    ):
         self.uri = uri
+        self.connector_config = connector_config or ConnectorConfig()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.codec = codec or get_codec()
+        self.metrics = metrics or BackendMetrics()
+        self.metrics.register_callback(
+            "circuit_open",
+            "1 while the circuit breaker rejects backend requests",
+            lambda: int(self.circuit_breaker.state is CircuitState.OPEN),
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def __aenter__(self) -> "RentObjectService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def start(self):
+        if self._session is not None and not self._session.closed:
+            return
+
+        config = self.connector_config
+        connector = aiohttp.TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            keepalive_timeout=config.keepalive_timeout,
+            use_dns_cache=config.ttl_dns_cache > 0,
+            ttl_dns_cache=config.ttl_dns_cache or None,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def add_object(self, user_id: int, rent_object: RentObject):
-        data = {"user_id": user_id, "object": rent_object.to_dict()}
+        data = {"user_id": user_id, "object": rent_object.to_payload()}
         endpoint = "/addObject"
-        text, status = await self._request("POST", endpoint, data=json.dumps(data))
-        self._process_status(text, status)
+        body, status = await self._request(
+            "POST", endpoint, data=self.codec.dumps(data)
+        )
+        self._process_status(body, status)
 
     async def delete_object(self, user_id: int, object_name: str):
         data = {"user_id": user_id, "object_name": object_name}
         endpoint = "/deleteObject"
-        text, status = await self._request("POST", endpoint, data=json.dumps(data))
-        self._process_status(text, status)
+        body, status = await self._request(
+            "POST", endpoint, data=self.codec.dumps(data)
+        )
+        self._process_status(body, status)
 
     async def update_object(
         self, user_id: int, object_name: str, update: UpdateRentObjectInput
@@ -52,11 +140,13 @@ class RentObjectService:
         data = {
             "user_id": user_id,
             "object_name": object_name,
-            "update_input": asdict(update),
+            "update_input": update.to_dict(),
         }
         endpoint = "/updateObject"
-        text, status = await self._request("POST", endpoint, data=json.dumps(data))
-        self._process_status(text, status)
+        body, status = await self._request(
+            "POST", endpoint, data=self.codec.dumps(data)
+        )
+        self._process_status(body, status)
 
     async def get_by_name(self, user_id: int, object_name: str) -> RentObject:
         endpoint = "/getObject"
@@ -64,10 +154,10 @@ class RentObjectService:
             self.OBJECT_NAME_QUERY_PARAM: object_name,
             self.USER_ID_QUERY_PARAM: user_id,
         }
-        text, status = await self._request("GET", endpoint, params=params)
-        self._process_status(text, status)
+        body, status = await self._request("GET", endpoint, params=params)
+        self._process_status(body, status)
 
-        data = json.loads(text)
+        data = self.codec.loads(body)
 
         return RentObject.from_dict(data)
 
@@ -75,10 +165,10 @@ class RentObjectService:
         endpoint = "/getAll"
         params = {self.USER_ID_QUERY_PARAM: user_id}
 
-        text, status = await self._request("GET", endpoint, params=params)
-        self._process_status(text, status)
+        body, status = await self._request("GET", endpoint, params=params)
+        self._process_status(body, status)
 
-        data = json.loads(text)
+        data = self.codec.loads(body)
 
         objects = []
         for el in data:
@@ -91,11 +181,32 @@ class RentObjectService:
         data = {
             "user_id": user_id,
             "object_name": object_name,
-            "record": record.to_dict(),
+            "record": record.to_payload(),
         }
 
-        text, status = await self._request("POST", endpoint, data=json.dumps(data))
-        self._process_status(text, status)
+        body, status = await self._request(
+            "POST", endpoint, data=self.codec.dumps(data)
+        )
+        self._process_status(body, status)
+
+    async def add_records(
+        self,
+        user_id: int,
+        object_name: str,
+        records: Iterable[Record],
+        concurrency: Optional[int] = None,
+    ) -> list[RecordWriteResult]:
+        semaphore = asyncio.Semaphore(concurrency or self.BULK_WRITE_CONCURRENCY)
+
+        async def add(record: Record) -> RecordWriteResult:
+            async with semaphore:
+                try:
+                    await self.add_record(user_id, object_name, record)
+                except Exception as e:
+                    return RecordWriteResult(record, e)
+                return RecordWriteResult(record)
+
+        return list(await asyncio.gather(*(add(record) for record in records)))
 
     async def delete_record(self, user_id: int, object_name: str, record_index: int):
         endpoint = "/deleteRecord"
@@ -105,8 +216,10 @@ class RentObjectService:
             "record_index": record_index,
         }
 
-        text, status = await self._request("POST", endpoint, data=json.dumps(data))
-        self._process_status(text, status)
+        body, status = await self._request(
+            "POST", endpoint, data=self.codec.dumps(data)
+        )
+        self._process_status(body, status)
 
     async def update_record(
         self,
@@ -120,11 +233,13 @@ class RentObjectService:
             "user_id": user_id,
             "object_name": object_name,
             "record_index": record_index,
-            "update_input": update.to_dict(),
+            "update_input": update.to_payload(),
         }
 
-        text, status = await self._request("POST", endpoint, data=json.dumps(data))
-        self._process_status(text, status)
+        body, status = await self._request(
+            "POST", endpoint, data=self.codec.dumps(data)
+        )
+        self._process_status(body, status)
 
     async def get_reccord(
         self, user_id: int, object_name: str, record_index: int
@@ -136,10 +251,10 @@ class RentObjectService:
             "record_index": record_index,
         }
 
-        text, status = await self._request("GET", endpoint, params=params)
-        self._process_status(text, status)
+        body, status = await self._request("GET", endpoint, params=params)
+        self._process_status(body, status)
 
-        data = json.loads(text)
+        data = self.codec.loads(body)
 
         return Record.from_dict(data)
 
@@ -150,16 +265,57 @@ class RentObjectService:
             self.OBJECT_NAME_QUERY_PARAM: object_name,
         }
 
-        text, status = await self._request("GET", endpoint, params=params)
-        self._process_status(text, status)
+        body, status = await self._request("GET", endpoint, params=params)
+        self._process_status(body, status)
 
-        data = json.loads(text)
+        data = self.codec.loads(body)
         records = []
         for el in data:
             records.append(Record.from_dict(el))
 
         return records
 
+    async def get_records_page(
+        self, user_id: int, object_name: str, page: int, page_size: int
+    ) -> RecordPage:
+        """Page of the records newest first, page 0 holds the newest.
+
+        The window of PAGES_PER_REQUEST pages around it is fetched. A backend
+        without offset/limit support returns every record instead.
+        """
+        # A stale page number may be negative, its page is empty anyway
+        window = max(page, 0) // self.PAGES_PER_REQUEST
+        records = await self._get_records_window(
+            user_id,
+            object_name,
+            offset=window * self.PAGES_PER_REQUEST * page_size,
+            limit=self.PAGES_PER_REQUEST * page_size,
+        )
+        return records.window(*page_bounds(len(records), page, page_size))
+
+    async def _get_records_window(
+        self, user_id: int, object_name: str, offset: int, limit: int
+    ) -> RecordPage:
+        endpoint = "/getRecords"
+        params = {
+            self.USER_ID_QUERY_PARAM: user_id,
+            self.OBJECT_NAME_QUERY_PARAM: object_name,
+            self.OFFSET_QUERY_PARAM: offset,
+            self.LIMIT_QUERY_PARAM: limit,
+        }
+
+        body, status = await self._request("GET", endpoint, params=params)
+        self._process_status(body, status)
+
+        data = self.codec.loads(body)
+        if isinstance(data, list):
+            records = [Record.from_dict(el) for el in data]
+            return RecordPage(records, 0, len(records))
+
+        records = [Record.from_dict(el) for el in data["records"]]
+        start = data["total"] - data["offset"] - len(records)
+        return RecordPage(records, max(start, 0), data["total"])
+
     async def get_object_info(self, user_id: int, object_name: str) -> RentObjectInfo:
         endpoint = "/getObjectInfo"
         params = {
@@ -167,14 +323,18 @@ class RentObjectService:
             self.OBJECT_NAME_QUERY_PARAM: object_name,
         }
 
-        text, status = await self._request("GET", endpoint, params=params)
-        self._process_status(text, status)
+        body, status = await self._request("GET", endpoint, params=params)
+        self._process_status(body, status)
 
-        data = json.loads(text)
+        data = self.codec.loads(body)
 
         return RentObjectInfo.from_dict(data)
 
-    def _process_status(self, text: str, status: int):
+    def _process_status(self, body: bytes, status: int):
+        if status < 400:
+            return
+
+        text = body.decode(errors="replace")
         match status:
             case 404:
                 if "Object" in text:
@@ -185,14 +345,102 @@ class RentObjectService:
                 raise ObjectAlreadyExistsExcpetion(text)
             case 422:
                 raise UnprocessableEntityException(text)
-            case 500:
+            case _ if status >= 500:
                 raise ServerInternalErrorException(text)
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
     async def _request(self, method: str, endpoint: str, **kwargs):
-        async with aiohttp.ClientSession() as session:
+        if method != "GET":
+            try:
+                return await self._send(method, endpoint, **kwargs)
+            finally:
+                # Reads already in flight may return the state before the
+                # write, later reads must not join them
+                self._inflight.clear()
+
+        # Concurrent identical reads share one in-flight request
+        params = kwargs.get("params") or {}
+        key = (endpoint, tuple(sorted((k, str(v)) for k, v in params.items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, endpoint, **kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled
+            task.exception()
+
+    async def _send(self, method: str, endpoint: str, **kwargs):
+        # Only reads are idempotent, writes are sent exactly once
+        attempts = self.retry_policy.attempts if method == "GET" else 1
+        timeout = aiohttp.ClientTimeout(
+            total=self.ENDPOINT_TIMEOUTS.get(endpoint, self.DEFAULT_TIMEOUT)
+        )
+
+        for attempt in range(attempts):
+            last_attempt = attempt + 1 == attempts
+            if not self.circuit_breaker.allow_request():
+                raise ServiceUnavailableException(
+                    f"Backend is unavailable, {method} {endpoint} rejected"
+                )
+
+            try:
+                body, status = await self._fetch(
+                    method, endpoint, timeout=timeout, **kwargs
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.circuit_breaker.record_failure()
+                if last_attempt:
+                    raise
+            except BaseException:
+                # Cancelled or failed without reaching the backend's answer
+                self.circuit_breaker.record_aborted()
+                raise
+            else:
+                if status < 500:
+                    self.circuit_breaker.record_success()
+                    return body, status
+
+                self.circuit_breaker.record_failure()
+                if last_attempt:
+                    return body, status
+
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+
+    async def _fetch(self, method: str, endpoint: str, **kwargs):
+        request_size = None
+        if "data" in kwargs:
+            kwargs["headers"] = self.JSON_HEADERS
+            request_size = len(kwargs["data"])
+
+        session = await self._get_session()
+        start = time.perf_counter()
+        try:
             async with session.request(
                 method,
                 self.uri + endpoint,
                 **kwargs,
             ) as resp:
-                return await resp.text(), resp.status
+                body = await resp.read()
+        except BaseException as e:
+            self.metrics.observe(endpoint, time.perf_counter() - start, exception=e)
+            raise
+
+        self.metrics.observe(
+            endpoint,
+            time.perf_counter() - start,
+            status=resp.status,
+            request_size=request_size,
+            response_size=len(body),
+        )
+        return body, resp.status
@@ -0,0 +1,110 @@
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff for idempotent requests"""
+
+    attempts: int = field(default=3)
+    base_delay: float = field(default=0.1)
+    max_delay: float = field(default=2)
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerStats:
+    failures: int = field(default=0)
+    successes: int = field(default=0)
+    rejected: int = field(default=0)
+    opened: int = field(default=0)
+
+
+class CircuitBreaker:
+    """Fails fast after ``failure_threshold`` consecutive failures.
+
+    After ``recovery_timeout`` seconds one trial request is let through;
+    its outcome closes the circuit again or keeps it open. A request that
+    ends without an outcome (cancelled, or an unexpected error) must call
+    ``record_aborted`` so that another trial can be made.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.stats = CircuitBreakerStats()
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        match self.state:
+            case CircuitState.CLOSED:
+                return True
+            case CircuitState.HALF_OPEN if not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+        self.stats.rejected += 1
+        return False
+
+    def record_success(self):
+        self.stats.successes += 1
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+        if self._state is not CircuitState.CLOSED:
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self):
+        self.stats.failures += 1
+        self._consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def record_aborted(self):
+        self._trial_in_flight = False
+
+    def _open(self):
+        self._opened_at = self._clock()
+        if self._state is not CircuitState.OPEN:
+            self.stats.opened += 1
+            self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState):
+        logger.warning(
+            "Backend circuit breaker: %s -> %s", self._state.value, state.value
+        )
+        self._state = state
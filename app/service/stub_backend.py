@@ -0,0 +1,308 @@
+"""In-memory implementation of the rent-object backend HTTP API.
+
+Used by tests and benchmarks instead of a live server; it can also be run
+standalone for local development: python -m app.service.stub_backend
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from typing import Any, Optional
+
+from aiohttp import web
+
+from .models.record import RECORD_FIELDS
+from .rent_object_service import RentObjectService
+
+EXPENSE_FIELDS = tuple(key for key in RECORD_FIELDS if key != "rent")
+
+
+class StubError(Exception):
+    def __init__(self, status: int, text: str):
+        super().__init__(text)
+        self.status = status
+        self.text = text
+
+
+def object_not_found(name: str) -> StubError:
+    return StubError(404, f"Object {name!r} not found")
+
+
+def record_not_found(index: int) -> StubError:
+    return StubError(404, f"Record {index} not found")
+
+
+def unprocessable(reason: str) -> StubError:
+    return StubError(422, f"Unprocessable entity: {reason}")
+
+
+def get_record_info(record: dict, area: float) -> dict:
+    income = record["rent"]
+    expenses = sum(record[key] for key in EXPENSE_FIELDS)
+    profit = income - expenses
+
+    info = dict(record)
+    info["income"] = income
+    info["expenses"] = expenses
+    info["profit"] = profit
+    info["income_by_area"] = income / area if area else 0
+    info["expenses_by_area"] = expenses / area if area else 0
+    info["profit_by_area"] = profit / area if area else 0
+    return info
+
+
+class StubBackend:
+    """Backend state plus fault injection.
+
+    Every request is delayed by ``latency`` (+ up to ``jitter``) seconds and
+    fails with 500 with probability ``failure_rate``. ``hits`` counts
+    requests per path.
+    """
+
+    USER_ID = RentObjectService.USER_ID_QUERY_PARAM
+    OBJECT_NAME = RentObjectService.OBJECT_NAME_QUERY_PARAM
+    OFFSET = RentObjectService.OFFSET_QUERY_PARAM
+    LIMIT = RentObjectService.LIMIT_QUERY_PARAM
+
+    def __init__(
+        self,
+        latency: float = 0,
+        jitter: float = 0,
+        failure_rate: float = 0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.hits: Counter[str] = Counter()
+        self.objects: dict[int, dict[str, dict]] = {}
+        self._random = random.Random(seed)
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/addObject", self.add_object)
+        app.router.add_post("/deleteObject", self.delete_object)
+        app.router.add_post("/updateObject", self.update_object)
+        app.router.add_get("/getObject", self.get_object)
+        app.router.add_get("/getAll", self.get_all)
+        app.router.add_post("/addRecord", self.add_record)
+        app.router.add_post("/deleteRecord", self.delete_record)
+        app.router.add_post("/updateRecord", self.update_record)
+        app.router.add_get("/getRecord", self.get_record)
+        app.router.add_get("/getRecords", self.get_records)
+        app.router.add_get("/getObjectInfo", self.get_object_info)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.hits[request.path] += 1
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return web.Response(status=500, text="Internal server error")
+
+        try:
+            return await handler(request)
+        except StubError as e:
+            return web.Response(status=e.status, text=e.text)
+
+    async def add_object(self, request: web.Request) -> web.Response:
+        data = await self._read_body(request)
+        user_id = self._get(data, "user_id", int)
+        obj = self._get(data, "object", dict)
+
+        name = self._get(obj, "name", str)
+        objects = self.objects.setdefault(user_id, {})
+        if name in objects:
+            raise StubError(409, f"Object {name!r} already exists")
+
+        records = [self._parse_record(el) for el in obj.get("records") or []]
+        objects[name] = {
+            "name": name,
+            "description": obj.get("description", ""),
+            "area": self._number(obj.get("area", 0)),
+            "records": sorted(records, key=lambda r: r["date"]),
+        }
+        return web.Response()
+
+    async def delete_object(self, request: web.Request) -> web.Response:
+        data = await self._read_body(request)
+        user_id = self._get(data, "user_id", int)
+        name = self._get(data, "object_name", str)
+
+        self._find_object(user_id, name)
+        del self.objects[user_id][name]
+        return web.Response()
+
+    async def update_object(self, request: web.Request) -> web.Response:
+        data = await self._read_body(request)
+        user_id = self._get(data, "user_id", int)
+        name = self._get(data, "object_name", str)
+        update = self._get(data, "update_input", dict)
+
+        obj = self._find_object(user_id, name)
+        new_name = update.get("name")
+        if new_name is not None and new_name != name:
+            objects = self.objects[user_id]
+            if new_name in objects:
+                raise StubError(409, f"Object {new_name!r} already exists")
+            # Keep the position of the object in /getAll
+            self.objects[user_id] = {
+                (new_name if key == name else key): value
+                for key, value in objects.items()
+            }
+            obj["name"] = new_name
+        if update.get("description") is not None:
+            obj["description"] = update["description"]
+        if update.get("area") is not None:
+            obj["area"] = self._number(update["area"])
+        return web.Response()
+
+    async def get_object(self, request: web.Request) -> web.Response:
+        user_id = self._query(request, self.USER_ID, int)
+        name = self._query(request, self.OBJECT_NAME, str)
+        return web.json_response(self._find_object(user_id, name))
+
+    async def get_all(self, request: web.Request) -> web.Response:
+        user_id = self._query(request, self.USER_ID, int)
+        return web.json_response(list(self.objects.get(user_id, {}).values()))
+
+    async def add_record(self, request: web.Request) -> web.Response:
+        data = await self._read_body(request)
+        user_id = self._get(data, "user_id", int)
+        name = self._get(data, "object_name", str)
+        record = self._parse_record(self._get(data, "record", dict))
+
+        obj = self._find_object(user_id, name)
+        obj["records"].append(record)
+        obj["records"].sort(key=lambda r: r["date"])
+        return web.Response()
+
+    async def delete_record(self, request: web.Request) -> web.Response:
+        data = await self._read_body(request)
+        user_id = self._get(data, "user_id", int)
+        name = self._get(data, "object_name", str)
+        index = self._get(data, "record_index", int)
+
+        records = self._find_object(user_id, name)["records"]
+        self._find_record(records, index)
+        records.pop(index)
+        return web.Response()
+
+    async def update_record(self, request: web.Request) -> web.Response:
+        data = await self._read_body(request)
+        user_id = self._get(data, "user_id", int)
+        name = self._get(data, "object_name", str)
+        index = self._get(data, "record_index", int)
+        update = self._get(data, "update_input", dict)
+
+        records = self._find_object(user_id, name)["records"]
+        record = self._find_record(records, index)
+        changes = {key: value for key, value in update.items() if value is not None}
+        updated = self._parse_record({**record, **changes})
+        records[index] = updated
+        records.sort(key=lambda r: r["date"])
+        return web.Response()
+
+    async def get_record(self, request: web.Request) -> web.Response:
+        user_id = self._query(request, "user_id", int)
+        name = self._query(request, "object_name", str)
+        index = self._query(request, "record_index", int)
+
+        records = self._find_object(user_id, name)["records"]
+        return web.json_response(self._find_record(records, index))
+
+    async def get_records(self, request: web.Request) -> web.Response:
+        user_id = self._query(request, self.USER_ID, int)
+        name = self._query(request, self.OBJECT_NAME, str)
+        records = self._find_object(user_id, name)["records"]
+        if self.OFFSET not in request.query and self.LIMIT not in request.query:
+            return web.json_response(records)
+
+        # offset counts from the newest record, the window stays date ordered
+        offset = self._query(request, self.OFFSET, int)
+        limit = self._query(request, self.LIMIT, int)
+        if offset < 0 or limit < 0:
+            raise unprocessable("offset and limit must not be negative")
+        end = max(len(records) - offset, 0)
+        return web.json_response(
+            {
+                "total": len(records),
+                "offset": offset,
+                "records": records[max(end - limit, 0) : end],
+            }
+        )
+
+    async def get_object_info(self, request: web.Request) -> web.Response:
+        user_id = self._query(request, self.USER_ID, int)
+        name = self._query(request, self.OBJECT_NAME, str)
+
+        obj = self._find_object(user_id, name)
+        records_info = [get_record_info(r, obj["area"]) for r in obj["records"]]
+        return web.json_response(
+            {
+                "name": obj["name"],
+                "description": obj["description"],
+                "area": obj["area"],
+                "records_info": records_info,
+            }
+        )
+
+    def _find_object(self, user_id: int, name: str) -> dict:
+        obj = self.objects.get(user_id, {}).get(name)
+        if obj is None:
+            raise object_not_found(name)
+        return obj
+
+    def _find_record(self, records: list[dict], index: int) -> dict:
+        if not 0 <= index < len(records):
+            raise record_not_found(index)
+        return records[index]
+
+    def _parse_record(self, data: dict) -> dict:
+        record = {"date": self._get(data, "date", str)}
+        for key in RECORD_FIELDS:
+            record[key] = self._number(data.get(key, 0))
+        return record
+
+    async def _read_body(self, request: web.Request) -> dict:
+        try:
+            data = json.loads(await request.read())
+        except ValueError as e:
+            raise unprocessable(str(e))
+        if not isinstance(data, dict):
+            raise unprocessable("body must be an object")
+        return data
+
+    def _query(self, request: web.Request, key: str, type_: type) -> Any:
+        try:
+            return type_(request.query[key])
+        except (KeyError, ValueError):
+            raise unprocessable(f"bad query parameter {key!r}")
+
+    def _get(self, data: dict, key: str, type_: type) -> Any:
+        value = data.get(key)
+        if not isinstance(value, type_) or isinstance(value, bool):
+            raise unprocessable(f"bad field {key!r}")
+        return value
+
+    def _number(self, value: Any) -> float:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise unprocessable(f"{value!r} is not a number")
+        return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0)
+    args = parser.parse_args()
+
+    backend = StubBackend(args.latency, args.jitter, args.failure_rate)
+    web.run_app(backend.create_app(), port=args.port)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 import os
 
@@ -33,12 +34,117 @@ class RedisConfig:
         return f"redis://{self.user}:{self.password}@{self.host}:{self.port}/{self.db}"
 
 
+@dataclass
+class ConnectorConfig:
+    """RentObjectService connection pool config"""
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30
+    ttl_dns_cache: int = 300
+
+
+@dataclass
+class CacheConfig:
+    """RentObjectService read cache config"""
+
+    enabled: bool = False
+    max_size: int = 1024
+    ttl: float = 60
+
+
+@dataclass
+class BackendConfig:
+    """RentObjectService config"""
+
+    uri: str
+    connector: ConnectorConfig
+    cache: CacheConfig
+
+
+# FSM keys expire after a week without activity
+STATE_TTL = 7 * 24 * 60 * 60
+
+
+@dataclass
+class StateStorageConfig:
+    """FSM data format in Redis: "compact" (StateSerializer) or "json"
+
+    encoding and compression left unset pick the best installed option.
+    With pipeline, the state and data writes of an update share one MULTI.
+    state_ttl and data_ttl expire the keys of inactive users, 0 keeps them.
+    With cache, states and data are also kept in a CachedStorage LRU of
+    cache_size keys, trusted for cache_lease seconds between version checks.
+    """
+
+    serializer: str = "compact"
+    encoding: Optional[str] = None
+    compression: Optional[str] = None
+    compress_threshold: int = 512
+    pipeline: bool = True
+    state_ttl: int = STATE_TTL
+    data_ttl: int = STATE_TTL
+    cache: bool = False
+    cache_size: int = 1024
+    cache_lease: float = 0
+    write_behind: bool = False
+
+
+@dataclass
+class MenuConfig:
+    """Where menu drafts are kept: "fsm" for the FSM data, "redis" for hashes"""
+
+    storage: str = "fsm"
+
+
+@dataclass
+class MetricsConfig:
+    """Prometheus metrics endpoint config, disabled when port is 0"""
+
+    host: str
+    port: int
+
+
 @dataclass
 class Config:
     """Configurator"""
 
     bot: BotConfig
     redis: RedisConfig
+    state_storage: StateStorageConfig
+    backend: BackendConfig
+    menu: MenuConfig
+    metrics: MetricsConfig
+
+
+def load_redis_config() -> RedisConfig:
+    load_dotenv()
+
+    return RedisConfig(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=os.getenv("REDIS_PORT", "6309"),
+        db=os.getenv("REDIS_DB", "0"),
+        user=os.getenv("REDIS_USER", ""),
+        password=os.getenv("REDIS_PASSWORD", ""),
+    )
+
+
+def load_state_storage_config() -> StateStorageConfig:
+    load_dotenv()
+
+    return StateStorageConfig(
+        serializer=os.getenv("STATE_SERIALIZER", "compact"),
+        encoding=os.getenv("STATE_ENCODING") or None,
+        compression=os.getenv("STATE_COMPRESSION") or None,
+        compress_threshold=int(os.getenv("STATE_COMPRESS_THRESHOLD", "512")),
+        pipeline=os.getenv("STATE_PIPELINE", "1") == "1",
+        state_ttl=int(os.getenv("STATE_TTL", STATE_TTL)),
+        data_ttl=int(os.getenv("DATA_TTL", STATE_TTL)),
+        cache=os.getenv("STATE_CACHE", "0") == "1",
+        cache_size=int(os.getenv("STATE_CACHE_SIZE", "1024")),
+        cache_lease=float(os.getenv("STATE_CACHE_LEASE", "0")),
+        write_behind=os.getenv("STATE_WRITE_BEHIND", "0") == "1",
+    )
 
 
 def load_config() -> Config:
@@ -46,12 +152,26 @@ def load_config() -> Config:
 
     config = Config(
         bot=BotConfig(token=os.environ["BOT_TOKEN"]),
-        redis=RedisConfig(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=os.getenv("REDIS_PORT", "6309"),
-            db=os.getenv("REDIS_DB", "0"),
-            user=os.getenv("REDIS_USER", ""),
-            password=os.getenv("REDIS_PASSWORD", ""),
+        redis=load_redis_config(),
+        state_storage=load_state_storage_config(),
+        backend=BackendConfig(
+            uri=os.getenv("BACKEND_URI", "http://localhost:8080"),
+            connector=ConnectorConfig(
+                limit=int(os.getenv("BACKEND_POOL_LIMIT", "100")),
+                limit_per_host=int(os.getenv("BACKEND_POOL_LIMIT_PER_HOST", "0")),
+                keepalive_timeout=float(os.getenv("BACKEND_KEEPALIVE_TIMEOUT", "30")),
+                ttl_dns_cache=int(os.getenv("BACKEND_DNS_CACHE_TTL", "300")),
+            ),
+            cache=CacheConfig(
+                enabled=os.getenv("BACKEND_CACHE_ENABLED", "0") == "1",
+                max_size=int(os.getenv("BACKEND_CACHE_MAX_SIZE", "1024")),
+                ttl=float(os.getenv("BACKEND_CACHE_TTL", "60")),
+            ),
+        ),
+        menu=MenuConfig(storage=os.getenv("MENU_STORAGE", "fsm")),
+        metrics=MetricsConfig(
+            host=os.getenv("METRICS_HOST", "0.0.0.0"),
+            port=int(os.getenv("METRICS_PORT", "0")),
         ),
     )
     return config
@@ -0,0 +1,130 @@
+import copy
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio.client import Pipeline
+from .cached import CachedStorage
+
+
+@dataclass
+class WriteBuffer:
+    states: dict[StorageKey, Optional[str]] = field(default_factory=dict)
+    data: dict[StorageKey, dict] = field(default_factory=dict)
+    commands: list[Callable[[Pipeline], None]] = field(default_factory=list)
+    touched: set[StorageKey] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.states or self.data or self.commands or self.touched)
+
+
+_buffer: ContextVar[Optional[WriteBuffer]] = ContextVar("_buffer", default=None)
+
+
+class BufferedStorage(BaseStorage):
+    """Wraps a RedisStorage to send the writes of one update together.
+
+    Inside buffer() state and data writes are kept in memory, where later
+    reads see them, and written with one MULTI/EXEC when the block exits.
+    Outside of it calls go straight to the wrapped storage.
+    """
+
+    def __init__(self, storage: Union[RedisStorage, CachedStorage]):
+        self.storage = storage
+
+    def __getattr__(self, name: str) -> Any:
+        # redis, key_builder, data_ttl, ... of the wrapped storage
+        if name == "storage":
+            raise AttributeError(name)
+        return getattr(self.storage, name)
+
+    @asynccontextmanager
+    async def buffer(self) -> AsyncIterator[WriteBuffer]:
+        buffer = WriteBuffer()
+        token = _buffer.set(buffer)
+        try:
+            yield buffer
+        finally:
+            _buffer.reset(token)
+            await self.flush(buffer)
+
+    def touch(self, key: StorageKey):
+        """Restart the TTLs of the key's state and data, if buffering"""
+        buffer = _buffer.get()
+        if buffer is not None:
+            buffer.touched.add(key)
+
+    def defer(self, command: Callable[[Pipeline], None]) -> bool:
+        """Queue extra commands for the update's pipeline, if buffering"""
+        buffer = _buffer.get()
+        if buffer is None:
+            return False
+        buffer.commands.append(command)
+        return True
+
+    async def flush(self, buffer: WriteBuffer):
+        if not buffer:
+            return
+        async with self.storage.redis.pipeline(transaction=True) as pipe:
+            # The wrapped storage's own set_state/set_data, issued on the
+            # pipeline, so key building, TTLs and serialization stay its own
+            if isinstance(self.storage, CachedStorage):
+                target = self.storage.bind(pipe)
+            else:
+                target = copy.copy(self.storage)
+                target.redis = pipe
+            for key, state in buffer.states.items():
+                await target.set_state(key, state)
+            for key, data in buffer.data.items():
+                await target.set_data(key, data)
+            for command in buffer.commands:
+                command(pipe)
+            self._refresh_ttls(pipe, buffer)
+            await pipe.execute()
+        if isinstance(target, CachedStorage):
+            target.commit()
+
+    def _refresh_ttls(self, pipe: Pipeline, buffer: WriteBuffer):
+        # Writes already set the TTL, keys that were only read need EXPIRE
+        for key in buffer.touched:
+            if isinstance(self.storage, CachedStorage):
+                # Or a key kept alive by reads would outlive its version
+                self.storage.expire_version(pipe, key)
+            if self.storage.state_ttl and key not in buffer.states:
+                pipe.expire(
+                    self.storage.key_builder.build(key, "state"), self.storage.state_ttl
+                )
+            if self.storage.data_ttl and key not in buffer.data:
+                pipe.expire(
+                    self.storage.key_builder.build(key, "data"), self.storage.data_ttl
+                )
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        buffer = _buffer.get()
+        if buffer is None:
+            return await self.storage.set_state(key, state)
+        buffer.states[key] = state.state if isinstance(state, State) else state
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        buffer = _buffer.get()
+        if buffer is not None and key in buffer.states:
+            return buffer.states[key]
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        buffer = _buffer.get()
+        if buffer is None:
+            return await self.storage.set_data(key, data)
+        buffer.data[key] = data.copy()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        buffer = _buffer.get()
+        if buffer is not None and key in buffer.data:
+            return buffer.data[key].copy()
+        return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
@@ -0,0 +1,261 @@
+import asyncio
+import copy
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Union
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio.client import Pipeline, Redis
+from app.service.cache import CacheStats
+from app.service.codec import get_codec
+
+logger = logging.getLogger(__name__)
+
+STATE = "state"
+DATA = "data"
+
+# (key, STATE or DATA)
+EntryKey = tuple[StorageKey, str]
+
+
+@dataclass
+class CacheEntry:
+    # The state, or the data encoded with the JSON codec so that every read
+    # returns a fresh dict
+    value: Union[str, bytes, None]
+    token: str
+    checked_at: float
+
+
+@dataclass
+class PendingWrites:
+    # Mutated in place: BufferedStorage.flush() works on a copy of the storage
+    entries: dict[EntryKey, CacheEntry] = field(default_factory=dict)
+    task: Optional[asyncio.Task] = None
+
+
+class CachedStorage(BaseStorage):
+    """RedisStorage with an in-process LRU of states and data in front.
+
+    Every write also stores a random version token in the key's
+    <prefix>:...:version hash. A cached value is used while its token is
+    the one in Redis, so writes from other processes invalidate it; the
+    check is one HMGET instead of reading and decoding the data. Within
+    lease seconds of the last check the cache is trusted without asking
+    Redis, 0 checks on every read.
+
+    With write_behind, writes update the cache and are sent to Redis in
+    one pipeline flush_delay seconds later, or on flush()/close(). Other
+    processes see them only then, so use it where a user's updates are
+    always handled by the same process.
+    """
+
+    def __init__(
+        self,
+        storage: RedisStorage,
+        max_size: int = 1024,
+        lease: float = 0,
+        write_behind: bool = False,
+        flush_delay: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.storage = storage
+        # Replaced by a pipeline in BufferedStorage.flush()
+        self.redis = storage.redis
+        self.max_size = max_size
+        self.lease = lease
+        self.write_behind = write_behind
+        self.flush_delay = flush_delay
+        self.stats = CacheStats()
+        self._clock = clock
+        self._codec = get_codec()
+        self._entries: OrderedDict[EntryKey, CacheEntry] = OrderedDict()
+        self._pending = PendingWrites()
+        # Writes queued on self.redis when it is a pipeline, see bind()
+        self._queued: dict[EntryKey, CacheEntry] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        # key_builder, state_ttl, data_ttl, ... of the wrapped storage
+        if name == "storage":
+            raise AttributeError(name)
+        return getattr(self.storage, name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bind(self, pipe: Pipeline) -> "CachedStorage":
+        """A view of this storage that queues its writes on pipe.
+
+        The cache is shared, but the queued writes are only cached by
+        commit(), to be called once pipe has executed, so a failed
+        MULTI/EXEC leaves no values in the cache that Redis never stored.
+        """
+        bound = copy.copy(self)
+        bound.redis = pipe
+        bound._queued = {}
+        return bound
+
+    def commit(self):
+        for entry_key, entry in self._queued.items():
+            self._store(entry_key, entry)
+        self._queued.clear()
+
+    def expire_version(self, pipe: Pipeline, key: StorageKey):
+        """Restarts the TTL of the key's version, with its values' TTLs"""
+        ttl = self._version_ttl()
+        if ttl:
+            pipe.expire(self._version_key(key), ttl)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        await self._set((key, STATE), state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self._get((key, STATE))
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self._set((key, DATA), self._codec.dumps(data))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return self._codec.loads(await self._get((key, DATA)))
+
+    async def _get(self, entry_key: EntryKey) -> Union[str, bytes, None]:
+        pending = self._pending.entries.get(entry_key)
+        if pending is not None:
+            self.stats.hits += 1
+            return pending.value
+
+        entry = self._entries.get(entry_key)
+        now = self._clock()
+        if entry is not None and now - entry.checked_at < self.lease:
+            return self._hit(entry_key, entry)
+
+        key, part = entry_key
+        tokens = await self._get_tokens(key)
+        # One HMGET checks both parts, refresh or drop the other one too
+        for other in (STATE, DATA):
+            other_entry = self._entries.get((key, other))
+            if other_entry is None:
+                continue
+            if other_entry.token == tokens[other]:
+                other_entry.checked_at = now
+            else:
+                del self._entries[(key, other)]
+                self.stats.invalidations += 1
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            return self._hit(entry_key, entry)
+
+        self.stats.misses += 1
+        if part == STATE:
+            value = await self.storage.get_state(key)
+        else:
+            value = self._codec.dumps(await self.storage.get_data(key))
+        # Without a token the key was not written through a CachedStorage
+        # and later writes could not be detected
+        if tokens[part] is not None:
+            self._store(entry_key, CacheEntry(value, tokens[part], now))
+        return value
+
+    def _hit(self, entry_key: EntryKey, entry: CacheEntry) -> Union[str, bytes, None]:
+        self._entries.move_to_end(entry_key)
+        self.stats.hits += 1
+        return entry.value
+
+    async def _get_tokens(self, key: StorageKey) -> dict[str, Optional[str]]:
+        values = await self.storage.redis.hmget(self._version_key(key), STATE, DATA)
+        return {
+            part: value.decode() if isinstance(value, bytes) else value
+            for part, value in zip((STATE, DATA), values)
+        }
+
+    def _version_key(self, key: StorageKey) -> str:
+        return self.storage.key_builder.build(key, "version")
+
+    def _store(self, entry_key: EntryKey, entry: CacheEntry):
+        self._entries[entry_key] = entry
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_size:
+            # Pending writes are kept in _pending until flushed
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _set(self, entry_key: EntryKey, value: Union[str, bytes, None]):
+        entry = CacheEntry(value, uuid.uuid4().hex, self._clock())
+        if self.write_behind:
+            self._store(entry_key, entry)
+            self._pending.entries[entry_key] = entry
+            self._schedule_flush()
+            return
+        await self._write({entry_key: entry}, self.redis)
+        if isinstance(self.redis, Pipeline):
+            self._queued[entry_key] = entry
+        else:
+            self._store(entry_key, entry)
+
+    async def _write(
+        self, entries: dict[EntryKey, CacheEntry], redis: Union[Redis, Pipeline]
+    ):
+        if isinstance(redis, Pipeline):
+            await self._queue(redis, entries)
+            return
+        async with redis.pipeline(transaction=True) as pipe:
+            await self._queue(pipe, entries)
+            await pipe.execute()
+
+    async def _queue(self, pipe: Pipeline, entries: dict[EntryKey, CacheEntry]):
+        # The wrapped storage's own writes, so key building, TTLs and
+        # serialization stay its own
+        target = copy.copy(self.storage)
+        target.redis = pipe
+        for (key, part), entry in entries.items():
+            if part == STATE:
+                await target.set_state(key, entry.value)
+            else:
+                await target.set_data(key, self._codec.loads(entry.value))
+            # After the value, so a reader never sees the new token with
+            # the old value
+            pipe.hset(self._version_key(key), part, entry.token)
+            self.expire_version(pipe, key)
+
+    def _version_ttl(self) -> Optional[int]:
+        # No longer than the values, or an expired key could look cached
+        ttls = [ttl for ttl in (self.storage.state_ttl, self.storage.data_ttl) if ttl]
+        return min(ttls) if ttls else None
+
+    def _schedule_flush(self):
+        if self._pending.task is None or self._pending.task.done():
+            self._pending.task = asyncio.get_running_loop().create_task(
+                self._flush_later()
+            )
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to write FSM changes to Redis")
+
+    async def flush(self):
+        """Writes the pending write-behind changes"""
+        entries = dict(self._pending.entries)
+        self._pending.entries.clear()
+        if not entries:
+            return
+        try:
+            await self._write(entries, self.storage.redis)
+        except Exception:
+            # Keep them for the next flush unless written again since
+            for entry_key, entry in entries.items():
+                self._pending.entries.setdefault(entry_key, entry)
+            raise
+
+    async def close(self) -> None:
+        if self._pending.task is not None:
+            self._pending.task.cancel()
+        await self.flush()
+        await self.storage.close()
@@ -0,0 +1,163 @@
+"""Memory report of the FSM keys in Redis.
+
+Usage: python -m app.storage.maintenance [--top N] [--prefix PREFIX] [--apply-ttl]
+
+Lists the bytes held per user, the largest keys and the drafts left by
+inactive users: keys without a TTL that have been idle for longer than
+the configured one. --apply-ttl gives every key without a TTL the
+configured one, less the time it has already been idle.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+from redis.asyncio.client import Redis
+from app.settings.config import (
+    StateStorageConfig,
+    load_redis_config,
+    load_state_storage_config,
+)
+
+SCAN_COUNT = 500
+
+
+@dataclass
+class KeyInfo:
+    key: str
+    size: int
+    # Seconds, -1 without expiry
+    ttl: int
+    # Seconds since the last access, None where OBJECT IDLETIME is unavailable
+    idle: Optional[int]
+
+    @property
+    def user(self) -> str:
+        # <prefix>:<chat_id>:<user_id>:... in the DefaultKeyBuilder layout
+        parts = self.key.split(":")
+        return ":".join(parts[1:3])
+
+    @property
+    def is_state(self) -> bool:
+        return self.key.endswith(":state")
+
+
+def ttl_for(info: KeyInfo, config: StateStorageConfig) -> int:
+    return config.state_ttl if info.is_state else config.data_ttl
+
+
+def is_stale(info: KeyInfo, config: StateStorageConfig) -> bool:
+    ttl = ttl_for(info, config)
+    return info.ttl < 0 and ttl > 0 and info.idle is not None and info.idle >= ttl
+
+
+def bytes_per_user(keys: list[KeyInfo]) -> Counter:
+    sizes = Counter()
+    for info in keys:
+        sizes[info.user] += info.size
+    return sizes
+
+
+async def scan_keys(redis: Redis, prefix: str = "fsm") -> list[KeyInfo]:
+    names = [
+        key async for key in redis.scan_iter(match=f"{prefix}:*", count=SCAN_COUNT)
+    ]
+    if not names:
+        return []
+    async with redis.pipeline(transaction=False) as pipe:
+        for name in names:
+            pipe.memory_usage(name)
+            pipe.ttl(name)
+            pipe.object("idletime", name)
+        results = await pipe.execute(raise_on_error=False)
+
+    sizes = results[0::3]
+    # MEMORY USAGE is missing on some servers, the DUMP length is close enough
+    fallback = [name for name, size in zip(names, sizes) if not isinstance(size, int)]
+    if fallback:
+        async with redis.pipeline(transaction=False) as pipe:
+            for name in fallback:
+                pipe.dump(name)
+            dumps = dict(zip(fallback, await pipe.execute(raise_on_error=False)))
+        sizes = [
+            len(dumps[name] or b"") if name in dumps else size
+            for name, size in zip(names, sizes)
+        ]
+
+    keys = []
+    for name, size, ttl, idle in zip(names, sizes, results[1::3], results[2::3]):
+        if ttl == -2:
+            # Expired since the scan
+            continue
+        keys.append(
+            KeyInfo(
+                key=name.decode() if isinstance(name, bytes) else name,
+                size=size,
+                ttl=ttl,
+                idle=idle if isinstance(idle, int) else None,
+            )
+        )
+    return keys
+
+
+async def apply_ttl(redis: Redis, keys: list[KeyInfo], config: StateStorageConfig):
+    """Set the configured TTL on keys without one, returns how many were set"""
+    count = 0
+    async with redis.pipeline(transaction=False) as pipe:
+        for info in keys:
+            ttl = ttl_for(info, config)
+            if info.ttl >= 0 or ttl <= 0:
+                continue
+            # As if the TTL had been set on the last access
+            pipe.expire(info.key, max(ttl - (info.idle or 0), 1))
+            count += 1
+        await pipe.execute()
+    return count
+
+
+def format_report(keys: list[KeyInfo], config: StateStorageConfig, top: int) -> str:
+    lines = [f"{len(keys)} keys, {sum(info.size for info in keys)} bytes"]
+
+    users = bytes_per_user(keys)
+    lines.append(f"Bytes per user ({len(users)} users), largest {top}:")
+    for user, size in users.most_common(top):
+        lines.append(f"  {size:10d}  {user}")
+
+    lines.append(f"Largest keys, {top}:")
+    for info in sorted(keys, key=lambda i: i.size, reverse=True)[:top]:
+        lines.append(f"  {info.size:10d}  {info.key}")
+
+    without_ttl = [info for info in keys if info.ttl < 0]
+    stale = [info for info in keys if is_stale(info, config)]
+    lines.append(f"Keys without TTL: {len(without_ttl)}")
+    lines.append(
+        f"Abandoned drafts, idle past the TTL: {len(stale)} keys, "
+        f"{sum(info.size for info in stale)} bytes"
+    )
+    for info in sorted(stale, key=lambda i: i.size, reverse=True)[:top]:
+        lines.append(f"  {info.size:10d}  {info.idle:10d} s  {info.key}")
+    return "\n".join(lines)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--prefix", default="fsm")
+    parser.add_argument("--apply-ttl", action="store_true")
+    args = parser.parse_args()
+
+    config = load_state_storage_config()
+    redis = Redis.from_url(load_redis_config().url)
+    try:
+        keys = await scan_keys(redis, args.prefix)
+        print(format_report(keys, config, args.top))
+        if args.apply_ttl:
+            count = await apply_ttl(redis, keys, config)
+            print(f"TTL set on {count} keys")
+    finally:
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+from typing import Any, Dict, Optional
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio.client import Redis
+from .serializer import StateSerializer
+
+
+class CompactRedisStorage(RedisStorage):
+    """RedisStorage that keeps FSM data in the StateSerializer format.
+
+    Data written as JSON by plain RedisStorage is still read.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        serializer: Optional[StateSerializer] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(redis, **kwargs)
+        self.serializer = serializer or StateSerializer()
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        redis_key = self.key_builder.build(key, "data")
+        if not data:
+            await self.redis.delete(redis_key)
+            return
+        await self.redis.set(
+            redis_key,
+            self.serializer.dumps(data),
+            ex=self.data_ttl,
+        )
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        redis_key = self.key_builder.build(key, "data")
+        value = await self.redis.get(redis_key)
+        if value is None:
+            return {}
+        return self.serializer.loads(value)
@@ -0,0 +1,164 @@
+import json
+import struct
+import zlib
+from typing import Any, Optional, Union
+from app.service.codec import get_codec
+
+# A value starting with the magic bytes is in the compact format; plain
+# JSON always starts with "{", so entries written before stay readable.
+MAGIC = b"\xffS"
+HEADER = struct.Struct("!2sBB")
+
+
+class StateSerializerError(Exception):
+    pass
+
+
+class JSONEncoding:
+    id = 1
+    name = "json"
+
+    def __init__(self):
+        self._codec = get_codec()
+
+    def dumps(self, data: Any) -> bytes:
+        return self._codec.dumps(data)
+
+    def loads(self, value: bytes) -> Any:
+        return self._codec.loads(value)
+
+
+class MsgpackEncoding:
+    id = 2
+    name = "msgpack"
+
+    def __init__(self):
+        import msgpack
+
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+
+    def dumps(self, data: Any) -> bytes:
+        return self._packb(data, use_bin_type=True)
+
+    def loads(self, value: bytes) -> Any:
+        return self._unpackb(value, raw=False)
+
+
+class NoCompression:
+    id = 0
+    name = "none"
+
+    def compress(self, value: bytes) -> bytes:
+        return value
+
+    def decompress(self, value: bytes) -> bytes:
+        return value
+
+
+class ZlibCompression:
+    id = 1
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, value: bytes) -> bytes:
+        return zlib.compress(value, self.level)
+
+    def decompress(self, value: bytes) -> bytes:
+        return zlib.decompress(value)
+
+
+class BrotliCompression:
+    id = 2
+    name = "brotli"
+
+    def __init__(self, level: int = 5):
+        import brotlicffi
+
+        self._brotli = brotlicffi
+        self.level = level
+
+    def compress(self, value: bytes) -> bytes:
+        return self._brotli.compress(value, quality=self.level)
+
+    def decompress(self, value: bytes) -> bytes:
+        return self._brotli.decompress(value)
+
+
+Encoding = Union[JSONEncoding, MsgpackEncoding]
+Compression = Union[NoCompression, ZlibCompression, BrotliCompression]
+
+# Preferred first, like CODECS
+ENCODINGS = {e.name: e for e in (MsgpackEncoding, JSONEncoding)}
+COMPRESSIONS = {c.name: c for c in (BrotliCompression, ZlibCompression, NoCompression)}
+
+
+def _create(registry: dict, name: Optional[str]):
+    if name is not None:
+        return registry[name]()
+    for cls in registry.values():
+        try:
+            return cls()
+        except ImportError:
+            continue
+    raise StateSerializerError("No implementation available")
+
+
+class StateSerializer:
+    """Compact FSM data format: a header, then the encoded data, compressed
+    when it is larger than compress_threshold bytes.
+
+    By default msgpack is used if installed, otherwise the JSON codec, and
+    brotli if installed, otherwise zlib. loads() also reads plain JSON.
+    """
+
+    def __init__(
+        self,
+        encoding: Optional[str] = None,
+        compression: Optional[str] = None,
+        compress_threshold: int = 512,
+    ):
+        self.encoding: Encoding = _create(ENCODINGS, encoding)
+        self.compression: Compression = _create(COMPRESSIONS, compression)
+        self.compress_threshold = compress_threshold
+        self._encodings = {self.encoding.id: self.encoding}
+        self._compressions = {
+            self.compression.id: self.compression,
+            NoCompression.id: NoCompression(),
+        }
+
+    def dumps(self, data: dict) -> bytes:
+        value = self.encoding.dumps(data)
+        compression = self._compressions[NoCompression.id]
+        if len(value) > self.compress_threshold:
+            compressed = self.compression.compress(value)
+            if len(compressed) < len(value):
+                compression, value = self.compression, compressed
+        return HEADER.pack(MAGIC, self.encoding.id, compression.id) + value
+
+    def loads(self, value: Union[bytes, str]) -> dict:
+        if isinstance(value, str):
+            value = value.encode()
+        if not value.startswith(MAGIC):
+            return json.loads(value)
+
+        _, encoding_id, compression_id = HEADER.unpack_from(value)
+        body = value[HEADER.size :]
+        body = self._get(self._compressions, COMPRESSIONS, compression_id).decompress(
+            body
+        )
+        return self._get(self._encodings, ENCODINGS, encoding_id).loads(body)
+
+    @staticmethod
+    def _get(cache: dict, registry: dict, id: int):
+        # Entries written with another configuration are still readable
+        if id not in cache:
+            for cls in registry.values():
+                if cls.id == id:
+                    cache[id] = cls()
+                    break
+            else:
+                raise StateSerializerError(f"Unknown format id {id}")
+        return cache[id]
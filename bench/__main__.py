@@ -0,0 +1,100 @@
+"""Microbenchmarks of the bot's hot paths.
+
+Usage:
+    python -m bench [-k PATTERN] [--output FILE] [--compare FILE [--threshold R]]
+
+Results are saved as JSON, by default to bench/results/<commit>.json, and
+can be compared with a previous run to spot regressions.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from bench.cases import load_cases
+from bench.harness import BENCHMARKS, run
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def compare(results: dict, previous: dict, threshold: float) -> bool:
+    regressed = False
+    old = {r["name"]: r for r in previous["results"]}
+    print(f"\nCompared with {previous['revision']} ({previous['created_at']}):")
+    for result in results["results"]:
+        before = old.get(result["name"])
+        if before is None:
+            continue
+        ratio = result["best"] / before["best"]
+        mark = ""
+        if ratio > threshold:
+            mark = "  <-- slower"
+            regressed = True
+        print(f"  {result['name']:<48} {ratio:6.2f}x{mark}")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-k", "--filter", default="", help="run matching names only")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold", type=float, default=1.1, help="slowdown ratio to fail on"
+    )
+    args = parser.parse_args()
+
+    load_cases()
+    revision = git_revision()
+    results = []
+    for name in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        result = run(name, repeat=args.repeat)
+        results.append(result.to_dict())
+        print(f"{name:<50} {format_time(result.best)}  (x{result.number})")
+
+    report = {
+        "revision": revision,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved to {output}")
+
+    if args.compare is not None:
+        previous = json.loads(args.compare.read_text())
+        return 1 if compare(report, previous, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Throughput of RentObjectService.add_records vs sequential add_record calls.
+
+Usage: python -m bench.bulk_records [--records N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+from app.service.models.rent_object import RentObject
+from app.service.rent_object_service import RentObjectService
+from app.service.stub_backend import StubBackend
+from test.helpers import make_records
+
+HOST = "127.0.0.1"
+TEST_USER_ID = 23
+
+
+async def run_server(latency: float) -> web.AppRunner:
+    backend = StubBackend(latency=latency)
+    runner = web.AppRunner(backend.create_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, 0).start()
+    return runner
+
+
+async def main(count: int, latency: float):
+    runner = await run_server(latency)
+    port = runner.addresses[0][1]
+    records = make_records(count, year=2000)
+    try:
+        async with RentObjectService(f"http://{HOST}:{port}") as service:
+            await service.add_object(TEST_USER_ID, RentObject(name="object"))
+            start = time.perf_counter()
+            for record in records:
+                await service.add_record(TEST_USER_ID, "object", record)
+            sequential = count / (time.perf_counter() - start)
+            print(f"sequential add_record:   {sequential:8.1f} records/s")
+
+            for concurrency in (2, 4, 8, 16):
+                start = time.perf_counter()
+                results = await service.add_records(
+                    TEST_USER_ID, "object", records, concurrency
+                )
+                bulk = count / (time.perf_counter() - start)
+                assert all(result.ok for result in results)
+                print(
+                    f"add_records, {concurrency:2} at once: {bulk:8.1f} records/s "
+                    f"({bulk / sequential:.2f}x)"
+                )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(main(args.records, args.latency))
@@ -0,0 +1,8 @@
+import importlib
+
+MODULES = ("models", "keyboards", "xlsx", "menu_state", "dates")
+
+
+def load_cases():
+    for module in MODULES:
+        importlib.import_module(f"{__name__}.{module}")
@@ -0,0 +1,41 @@
+from app.service.models.record import Record
+from app.service.models.rent_object import RentObject
+from app.service.stub_backend import get_record_info
+from test import helpers
+
+
+def make_records(count: int) -> list[Record]:
+    records = helpers.make_records(
+        count,
+        year=2000,
+        heat=5300.25,
+        exploitation=12000,
+        mop=830.4,
+        renovation=2100,
+        tbo=450.75,
+        electricity=3200.1,
+        earth_rent=1500,
+        other=0,
+        security=7000,
+    )
+    for i, record in enumerate(records):
+        record.rent = 125000.5 + i
+    return records
+
+
+def make_object(count: int, name: str = "Склад на Промышленной") -> RentObject:
+    return RentObject(
+        name=name,
+        description="Отапливаемый склад, 2 этаж",
+        area=640.5,
+        records=make_records(count),
+    )
+
+
+def object_info_dict(obj: RentObject) -> dict:
+    return {
+        "name": obj.name,
+        "description": obj.description,
+        "area": obj.area,
+        "records_info": [get_record_info(r.to_dict(), obj.area) for r in obj.records],
+    }
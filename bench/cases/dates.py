@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+import dateparser
+
+from app.service.date_parser import DATEPARSER_FORMATS, parse_month_year
+from bench.harness import benchmark
+
+INPUTS = ("03.24", "11.2023", "март 2024", "Дек 22")
+
+
+@benchmark("dates.parse_month_year")
+def parse_fast():
+    return lambda: [parse_month_year(text) for text in INPUTS]
+
+
+@benchmark("dates.dateparser_parse")
+def parse_dateparser():
+    return lambda: [
+        dateparser.parse(text, date_formats=DATEPARSER_FORMATS) for text in INPUTS
+    ]
+
+
+def _import(module: str):
+    return lambda: subprocess.run(
+        [sys.executable, "-c", f"import {module}"], check=True
+    )
+
+
+@benchmark("dates.import_date_parser")
+def import_date_parser():
+    return _import("app.service.date_parser")
+
+
+@benchmark("dates.import_dateparser")
+def import_dateparser():
+    return _import("dateparser")
@@ -0,0 +1,39 @@
+from app.keyboards.cache import KEYBOARD_CACHES
+from app.keyboards.object_list import get_objects_menu_keyboard
+from app.keyboards.record_list import get_record_list_keyboard
+from app.service.models.rent_object import RentObject
+from bench.cases.data import make_records
+from bench.harness import benchmark
+
+SIZES = (10, 1_000, 10_000)
+
+
+def register(size: int):
+    @benchmark(f"keyboards.record_list[{size}]")
+    def record_list():
+        records = make_records(size)
+        return lambda: get_record_list_keyboard(records, 0)
+
+    @benchmark(f"keyboards.record_list_uncached[{size}]")
+    def record_list_uncached():
+        records = make_records(size)
+
+        def call():
+            KEYBOARD_CACHES["_build_record_list_keyboard"].clear()
+            return get_record_list_keyboard(records, 0)
+
+        return call
+
+    @benchmark(f"keyboards.objects_menu[{size}]")
+    def objects_menu():
+        objects = [RentObject(name=f"object {i}") for i in range(size)]
+        return lambda: get_objects_menu_keyboard(objects)
+
+    @benchmark(f"keyboards.objects_menu_uncached[{size}]")
+    def objects_menu_uncached():
+        objects = [RentObject(name=f"object {i}") for i in range(size)]
+        return lambda: get_objects_menu_keyboard.__wrapped__(objects)
+
+
+for size in SIZES:
+    register(size)
@@ -0,0 +1,77 @@
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.keyboards.record_list import get_record_list_keyboard
+from app.middlewares.menu_middleware import MenuStateData
+from bench.cases.data import make_object
+from bench.harness import benchmark
+
+RECORDS = 120
+
+
+def make_state() -> FSMContext:
+    return FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=1, user_id=1))
+
+
+async def prepare(state: FSMContext):
+    menu = MenuStateData(state)
+    await menu.set_object(make_object(RECORDS), False)
+    await menu.select_record(RECORDS // 2)
+    await menu.flush()
+
+
+def register(name: str, operation):
+    @benchmark(f"menu_state.{name}[{RECORDS}]")
+    def case():
+        state = make_state()
+        prepared = False
+
+        async def call():
+            # One update: a fresh MenuStateData, flushed by the middleware
+            nonlocal prepared
+            if not prepared:
+                await prepare(state)
+                prepared = True
+            menu = MenuStateData(state)
+            await operation(menu)
+            await menu.flush()
+
+        return call
+
+
+async def get_object(menu: MenuStateData):
+    await menu.get_object()
+
+
+async def get_selected_record(menu: MenuStateData):
+    await menu.get_selected_record()
+
+
+async def set_selected_record_field(menu: MenuStateData):
+    await menu.set_selected_record_field("rent", 1000.0)
+
+
+async def update_selected_record(menu: MenuStateData):
+    await menu.update_selected_record(await menu.get_selected_record())
+
+
+async def add_and_delete_record(menu: MenuStateData):
+    await menu.select_record(await menu.create_new_record())
+    await menu.delete_selected_record()
+    await menu.select_record(RECORDS // 2)
+
+
+async def record_list_page(menu: MenuStateData):
+    get_record_list_keyboard(await menu.get_record_index(), 0)
+
+
+for name, operation in (
+    ("get_object", get_object),
+    ("get_selected_record", get_selected_record),
+    ("set_selected_record_field", set_selected_record_field),
+    ("update_selected_record", update_selected_record),
+    ("add_and_delete_record", add_and_delete_record),
+    ("record_list_page", record_list_page),
+):
+    register(name, operation)
@@ -0,0 +1,45 @@
+from app.service.models.record import Record
+from app.service.models.record_batch import RecordBatch
+from app.service.models.rent_object import RentObject
+from app.service.models.rent_object_info import RentObjectInfo
+from app.service.object_info import compute_object_info
+from bench.cases.data import make_object, object_info_dict
+from bench.harness import benchmark
+
+RECORDS = 120
+
+
+@benchmark("models.record_from_dict")
+def record_from_dict():
+    data = make_object(1).records[0].to_dict()
+    return lambda: Record.from_dict(data)
+
+
+@benchmark("models.record_to_dict")
+def record_to_dict():
+    record = make_object(1).records[0]
+    return record.to_dict
+
+
+@benchmark(f"models.rent_object_from_dict[{RECORDS}]")
+def rent_object_from_dict():
+    data = make_object(RECORDS).to_dict()
+    return lambda: RentObject.from_dict(data)
+
+
+@benchmark(f"models.rent_object_info_from_dict[{RECORDS}]")
+def rent_object_info_from_dict():
+    data = object_info_dict(make_object(RECORDS))
+    return lambda: RentObjectInfo.from_dict(data)
+
+
+@benchmark(f"models.record_batch_from_json[{RECORDS}]")
+def record_batch_from_json():
+    data = [r.to_dict() for r in make_object(RECORDS).records]
+    return lambda: RecordBatch.from_json(data)
+
+
+@benchmark(f"models.compute_object_info[{RECORDS}]")
+def compute_object_info_case():
+    obj = make_object(RECORDS)
+    return lambda: compute_object_info(obj)
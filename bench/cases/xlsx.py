@@ -0,0 +1,16 @@
+import tempfile
+from pathlib import Path
+
+from app.service.create_xlsx_document import RentObjectXLSXWriter
+from app.service.models.rent_object_info import RentObjectInfo
+from bench.cases.data import make_object, object_info_dict
+from bench.harness import benchmark
+
+RECORDS = 120
+
+
+@benchmark(f"xlsx.create[{RECORDS}]")
+def create():
+    info = RentObjectInfo.from_dict(object_info_dict(make_object(RECORDS)))
+    path = Path(tempfile.mkdtemp()) / "object.xlsx"
+    return lambda: RentObjectXLSXWriter().create(info, path)
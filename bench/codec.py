@@ -0,0 +1,110 @@
+"""Encode/decode cost of the service JSON codecs on realistic payloads.
+
+Usage: python -m bench.codec [--records N] [--number N]
+"""
+
+import argparse
+import json
+import timeit
+from dataclasses import asdict
+from datetime import timezone
+
+from app.service.codec import CODECS
+from app.service.models.record import Record
+from app.service.models.rent_object import RentObject
+from bench.cases.data import make_object
+
+
+def legacy_record_dict(record: Record) -> dict:
+    data = asdict(record)
+    data["date"] = record.date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return data
+
+
+def legacy_encode(obj: RentObject) -> str:
+    data = {
+        "user_id": 23,
+        "object": {
+            "name": obj.name,
+            "description": obj.description,
+            "area": obj.area,
+            "records": [legacy_record_dict(r) for r in obj.records],
+        },
+    }
+    return json.dumps(data)
+
+
+def object_info_response(obj: RentObject) -> dict:
+    records_info = []
+    for record in obj.records:
+        data = record.to_dict()
+        income = record.rent
+        expenses = sum(v for k, v in data.items() if k not in ("date", "rent"))
+        data.update(
+            income=income,
+            expenses=expenses,
+            profit=income - expenses,
+            income_by_area=income / obj.area,
+            expenses_by_area=expenses / obj.area,
+            profit_by_area=(income - expenses) / obj.area,
+        )
+        records_info.append(data)
+    return {
+        "name": obj.name,
+        "description": obj.description,
+        "area": obj.area,
+        "records_info": records_info,
+    }
+
+
+def report(label: str, seconds: float, baseline: float):
+    print(f"  {label:<28} {seconds * 1e6:10.1f} us  ({baseline / seconds:5.2f}x)")
+
+
+def main(count: int, number: int):
+    obj = make_object(count)
+    records_body = json.dumps([r.to_dict() for r in obj.records]).encode()
+    info_body = json.dumps(object_info_response(obj)).encode()
+    codecs = {name: codec() for name, codec in _available_codecs().items()}
+
+    def run(stmt) -> float:
+        return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+    print(f"encode /addObject, {count} records")
+    baseline = run(lambda: legacy_encode(obj).encode())
+    report("asdict + strftime + json", baseline, baseline)
+    for name, codec in codecs.items():
+        payload = {"user_id": 23, "object": None}
+
+        def encode():
+            payload["object"] = obj.to_payload()
+            return codec.dumps(payload)
+
+        report(f"to_payload + {name}", run(encode), baseline)
+
+    for title, body in (("/getRecords", records_body), ("/getObjectInfo", info_body)):
+        print(f"decode {title}, {count} records, {len(body)} bytes")
+        text = body.decode()
+        baseline = run(lambda: json.loads(text))
+        report("json.loads(str)", baseline, baseline)
+        for name, codec in codecs.items():
+            report(f"{name}.loads(bytes)", run(lambda: codec.loads(body)), baseline)
+
+
+def _available_codecs() -> dict:
+    available = {}
+    for name, codec in CODECS.items():
+        try:
+            codec()
+        except ImportError:
+            continue
+        available[name] = codec
+    return available
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=120)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+    main(args.records, args.number)
@@ -0,0 +1,101 @@
+"""Per-update latency of the menu handlers with and without the in-process
+CachedStorage, over fakeredis with a simulated network round trip.
+
+A burst of updates from one user (open a record, change a field, save)
+runs against a warm cache, as when one process handles a user's clicks.
+
+Usage: python -m bench.fsm_cache [--records N] [--rtt-ms MS] [--bursts N]
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from aiogram.fsm.context import FSMContext
+
+from app.middlewares.menu_storage import FSMDataMenuStore
+from app.storage.buffered import BufferedStorage
+from app.storage.cached import CachedStorage
+from app.storage.redis import CompactRedisStorage
+from bench.cases.data import make_object
+from test.helpers import KEY, CountingRedis, prepare, run_update, updates
+
+
+class LatencyRedis(CountingRedis):
+    """Sleeps rtt seconds per round trip"""
+
+    def __init__(self, rtt: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rtt = rtt
+
+    async def execute_command(self, *args, **options):
+        await asyncio.sleep(self.rtt)
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        async def delayed_execute(*args, **kwargs):
+            await asyncio.sleep(self.rtt)
+            return await execute(*args, **kwargs)
+
+        pipe.execute = delayed_execute
+        return pipe
+
+
+# name: redis -> storage, all pipelined like the bot's default
+VARIANTS = {
+    "redis": lambda redis: CompactRedisStorage(redis),
+    "cached": lambda redis: CachedStorage(CompactRedisStorage(redis)),
+    "cached, 1 s lease": lambda redis: CachedStorage(
+        CompactRedisStorage(redis), lease=1
+    ),
+    "cached, write-behind": lambda redis: CachedStorage(
+        CompactRedisStorage(redis), write_behind=True, flush_delay=3600
+    ),
+}
+
+
+async def measure(variant: str, records: int, rtt: float, bursts: int) -> Counter:
+    redis = LatencyRedis(rtt)
+    storage = BufferedStorage(VARIANTS[variant](redis))
+    await prepare(
+        storage, FSMDataMenuStore(FSMContext(storage, KEY)), make_object(records), None
+    )
+
+    totals = Counter()
+    for _ in range(bursts):
+        for _, state, handler, kwargs in updates(records):
+            await storage.set_state(KEY, state)
+            redis.round_trips = 0
+            started = time.perf_counter()
+            await run_update(
+                storage, FSMDataMenuStore(FSMContext(storage, KEY)), handler, **kwargs
+            )
+            totals["seconds"] += time.perf_counter() - started
+            totals["round_trips"] += redis.round_trips
+            totals["updates"] += 1
+    await storage.close()
+    return totals
+
+
+async def main(records: int, rtt: float, bursts: int):
+    print(f"{records} records, {rtt * 1000:.1f} ms round trip, per update:")
+    for variant in VARIANTS:
+        totals = await measure(variant, records, rtt, bursts)
+        updates_count = totals["updates"]
+        print(
+            f"  {variant:22s} {totals['seconds'] / updates_count * 1000:7.2f} ms, "
+            f"{totals['round_trips'] / updates_count:4.1f} round trips"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=24)
+    parser.add_argument("--rtt-ms", type=float, default=1)
+    parser.add_argument("--bursts", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.records, args.rtt_ms / 1000, args.bursts))
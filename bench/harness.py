@@ -0,0 +1,55 @@
+import asyncio
+import inspect
+import statistics
+import timeit
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Union
+
+Case = Union[Callable[[], object], Callable[[], Awaitable[object]]]
+
+BENCHMARKS: dict[str, Callable[[], Case]] = {}
+
+
+@dataclass
+class Result:
+    name: str
+    number: int
+    best: float
+    median: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def benchmark(name: str):
+    """Register a factory that does the setup and returns the timed callable"""
+
+    def register(factory: Callable[[], Case]):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name!r} is already registered")
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+def run(name: str, repeat: int = 5, min_time: float = 0.2) -> Result:
+    case = BENCHMARKS[name]()
+    if inspect.iscoroutinefunction(case):
+        case = _sync(case)
+
+    timer = timeit.Timer(case)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return Result(name, number, min(times), statistics.median(times))
+
+
+def _sync(case: Callable[[], Awaitable[object]]) -> Callable[[], object]:
+    loop = asyncio.new_event_loop()
+
+    def call():
+        return loop.run_until_complete(case())
+
+    return call
@@ -0,0 +1,62 @@
+"""Redis round trips and bytes written per handler for each way of keeping
+the menu draft: the previous write-through FSM data, the per-update FSM
+data unit of work and the Redis hash layout, each with and without the
+pipelined BufferedStorage. Runs on fakeredis.
+
+Usage: python -m bench.menu_round_trips [--records N]
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+from app.middlewares.menu_storage import FSMDataMenuStore, RedisHashMenuStore
+from bench.cases.data import make_object
+from test.helpers import count_round_trips, updates
+
+
+class WriteThroughMenuStore(FSMDataMenuStore):
+    """Previous behaviour: every accessor goes to the FSM storage."""
+
+    async def get_data(self) -> dict:
+        return await self.state.get_data()
+
+    async def set_data(self, data: dict):
+        await self.state.set_data(data)
+
+
+def fsm_data(store_class: type[FSMDataMenuStore]):
+    return lambda storage: store_class
+
+
+# name: (pipelined, storage -> store factory)
+VARIANTS = {
+    "write-through": (False, fsm_data(WriteThroughMenuStore)),
+    "fsm data": (False, fsm_data(FSMDataMenuStore)),
+    "fsm data, pipelined": (True, fsm_data(FSMDataMenuStore)),
+    "redis hashes": (False, RedisHashMenuStore.factory),
+    "redis hashes, pipelined": (True, RedisHashMenuStore.factory),
+}
+
+
+async def count(variant: str, records: int) -> dict[str, Counter]:
+    pipelined, store_factory = VARIANTS[variant]
+    return await count_round_trips(store_factory, pipelined, make_object(records))
+
+
+async def main(records: int):
+    results = {variant: await count(variant, records) for variant in VARIANTS}
+    for name, _, _, _ in updates(records):
+        print(f"{name}:")
+        for variant, counts in results.items():
+            print(
+                f"  {variant:24s} {counts[name]['round_trips']:3d} round trips, "
+                f"{counts[name]['bytes']:6d} B written"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=24)
+    args = parser.parse_args()
+    asyncio.run(main(args.records))
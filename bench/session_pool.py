@@ -0,0 +1,72 @@
+"""Requests/sec of the pooled RentObjectService session vs a session per call.
+
+Usage: python -m bench.session_pool [--requests N] [--concurrency C]
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+from app.service.rent_object_service import RentObjectService
+from app.service.stub_backend import StubBackend
+
+HOST = "127.0.0.1"
+
+
+class PerCallSessionService(RentObjectService):
+    """Previous behaviour: a new ClientSession for every request."""
+
+    async def _request(self, method: str, endpoint: str, **kwargs):
+        async with aiohttp.ClientSession() as session:
+            async with session.request(
+                method,
+                self.uri + endpoint,
+                **kwargs,
+            ) as resp:
+                return await resp.read(), resp.status
+
+
+async def run_server() -> web.AppRunner:
+    runner = web.AppRunner(StubBackend().create_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, 0).start()
+    return runner
+
+
+async def measure(service: RentObjectService, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i: int):
+        async with semaphore:
+            await service.get_all(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, concurrency: int):
+    runner = await run_server()
+    port = runner.addresses[0][1]
+    uri = f"http://{HOST}:{port}"
+    try:
+        per_call = await measure(PerCallSessionService(uri), requests, concurrency)
+
+        async with RentObjectService(uri) as service:
+            pooled = await measure(service, requests, concurrency)
+    finally:
+        await runner.cleanup()
+
+    print(f"session per call: {per_call:10.1f} req/s")
+    print(f"pooled session:   {pooled:10.1f} req/s ({pooled / per_call:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,100 @@
+"""Cold-start import time of the bot, measured with python -X importtime.
+
+Usage: python -m bench.startup [--budget-ms MS] [--top N] [--module MODULE]
+
+Exits with status 1 when importing MODULE (app.__main__ by default) takes
+longer than the budget, or pulls in a module that should load lazily. The
+budget defaults to $STARTUP_IMPORT_BUDGET_MS, or DEFAULT_BUDGET_MS.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+DEFAULT_MODULE = "app.__main__"
+BUDGET_ENV = "STARTUP_IMPORT_BUDGET_MS"
+DEFAULT_BUDGET_MS = 5000
+
+# Imported on first use, never at startup
+LAZY_MODULES = ("xlsxwriter", "numpy", "dateparser", "pytz")
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(module: str = DEFAULT_MODULE) -> list[ImportTime]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def total_ms(times: list[ImportTime], module: str) -> float:
+    for item in times:
+        if item.module == module:
+            return item.cumulative_us / 1000
+    raise ValueError(f"{module!r} not found in importtime output")
+
+
+def eager_lazy_modules(times: list[ImportTime]) -> list[str]:
+    return [item.module for item in times if item.module in LAZY_MODULES]
+
+
+def budget_from_env() -> float:
+    return float(os.getenv(BUDGET_ENV, DEFAULT_BUDGET_MS))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=budget_from_env())
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    args = parser.parse_args()
+
+    times = measure(args.module)
+    total = total_ms(times, args.module)
+
+    print(f"Slowest imports of {args.module} (self time):")
+    for item in sorted(times, key=lambda t: t.self_us, reverse=True)[: args.top]:
+        print(f"  {item.self_us / 1000:8.2f} ms  {item.module}")
+    print(f"Total: {total:.2f} ms, budget {args.budget_ms:.0f} ms")
+
+    failed = False
+    if total > args.budget_ms:
+        print("Import time is over budget")
+        failed = True
+    eager = eager_lazy_modules(times)
+    if eager:
+        print(f"Imported at startup, expected lazily: {', '.join(eager)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
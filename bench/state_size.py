@@ -0,0 +1,72 @@
+"""Size of the FSM data of a menu draft in each storage format.
+
+Usage: python -m bench.state_size [--records N ...]
+
+The state shapes are what MenuStateData keeps for a draft object with N
+monthly records, one of them selected.
+"""
+
+import argparse
+import json
+import random
+
+from app.service.models.record import RECORD_FIELDS
+from app.storage.serializer import (
+    COMPRESSIONS,
+    ENCODINGS,
+    StateSerializer,
+)
+from bench.cases.data import make_object
+
+
+def make_state(records: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    obj = make_object(records).to_dict()
+    obj["new"] = False
+    for record in obj["records"]:
+        # Real bills differ from month to month, which matters for compression
+        for key in RECORD_FIELDS:
+            record[key] = round(record[key] * rng.uniform(0.8, 1.2), 2)
+        record["is_new"] = False
+    return {
+        "object": obj,
+        "selected_record_index": records // 2,
+        "selected_record_original": obj["records"][records // 2] if records else None,
+        "current_page": 0,
+    }
+
+
+def available(registry: dict) -> list[str]:
+    names = []
+    for name, cls in registry.items():
+        try:
+            cls()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def main(sizes: list[int]):
+    formats = {"json (RedisStorage)": lambda state: json.dumps(state).encode()}
+    for encoding in available(ENCODINGS):
+        for compression in available(COMPRESSIONS):
+            serializer = StateSerializer(encoding, compression, compress_threshold=0)
+            formats[f"{encoding}+{compression}"] = serializer.dumps
+
+    print(f"{'records':>8}  " + "  ".join(f"{name:>20}" for name in formats))
+    for records in sizes:
+        state = make_state(records)
+        baseline = len(formats["json (RedisStorage)"](state))
+        cells = []
+        for dumps in formats.values():
+            size = len(dumps(state))
+            cells.append(f"{size:>9d} B ({size / baseline:5.1%})")
+        print(f"{records:>8}  " + "  ".join(f"{cell:>20}" for cell in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, nargs="+", default=[0, 12, 60, 240])
+    args = parser.parse_args()
+    main(args.records)
@@ -0,0 +1,16 @@
+import pytest
+import pytest_asyncio
+from aiohttp.test_utils import TestServer
+
+from app.service.stub_backend import StubBackend
+
+
+@pytest.fixture
+def stub_backend():
+    return StubBackend(seed=0)
+
+
+@pytest_asyncio.fixture
+async def stub_uri(stub_backend: StubBackend):
+    async with TestServer(stub_backend.create_app()) as server:
+        yield f"http://{server.host}:{server.port}"
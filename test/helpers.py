@@ -0,0 +1,201 @@
+"""Counting Redis and storage doubles, a scripted menu update and record
+factories, shared by the tests and the benchmarks."""
+
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from fakeredis import FakeAsyncRedis
+
+from app.handlers.record_list import open_record
+from app.handlers.record_menu import enter, set_numeric_param
+from app.keyboards.record_list import RecordListAction, RecordListCallbackData
+from app.middlewares.menu_middleware import MenuStateData
+from app.middlewares.menu_storage import MenuStore
+from app.service.models.record import Record
+from app.service.models.rent_object import RentObject
+from app.states.record_menu import RecordMenuState
+from app.storage.buffered import BufferedStorage
+
+KEY = StorageKey(bot_id=1, chat_id=1, user_id=1)
+
+
+def make_records(count: int, year: int = 2020, **fields) -> list[Record]:
+    """count monthly records from January of year, all with the given fields"""
+    return [
+        Record(
+            date=datetime(year + i // 12, i % 12 + 1, 1, tzinfo=timezone.utc),
+            **fields,
+        )
+        for i in range(count)
+    ]
+
+
+class CountingStorage(BaseStorage):
+    """Counts the calls that would each be a Redis round trip"""
+
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+        self.calls: Counter[str] = Counter()
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        self.calls["set_state"] += 1
+        await self.storage.set_state(key, state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        self.calls["get_state"] += 1
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        self.calls["set_data"] += 1
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        self.calls["get_data"] += 1
+        return await self.storage.get_data(key)
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+WRITE_COMMANDS = {"SET", "HSET", "DEL", "HDEL"}
+
+
+def command_size(args: tuple) -> int:
+    if args[0] not in WRITE_COMMANDS:
+        return 0
+    return sum(
+        len(arg if isinstance(arg, bytes) else str(arg).encode()) for arg in args
+    )
+
+
+class CountingRedis(FakeAsyncRedis):
+    """Counts commands and pipelines, one round trip each, and write sizes"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips = 0
+        self.bytes_written = 0
+
+    async def execute_command(self, *args, **options):
+        self.round_trips += 1
+        self.bytes_written += command_size(args)
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        async def counted_execute(*args, **kwargs):
+            self.round_trips += 1
+            for command_args, _ in pipe.command_stack:
+                self.bytes_written += command_size(command_args)
+            return await execute(*args, **kwargs)
+
+        pipe.execute = counted_execute
+        return pipe
+
+
+class FakeMessage:
+    def __init__(self, text: str = ""):
+        self.text = text
+
+    async def answer(self, *args, **kwargs):
+        pass
+
+    async def edit_text(self, *args, **kwargs):
+        pass
+
+
+class FakeService:
+    async def update_record(self, *args, **kwargs):
+        pass
+
+    async def add_record(self, *args, **kwargs):
+        pass
+
+
+def callback_query() -> SimpleNamespace:
+    async def answer(*args, **kwargs):
+        pass
+
+    return SimpleNamespace(
+        message=FakeMessage(), from_user=SimpleNamespace(id=1), answer=answer
+    )
+
+
+async def prepare(storage: BaseStorage, store: MenuStore, obj: RentObject, state):
+    """Saves obj as the menu's object with its middle record selected"""
+    menu = MenuStateData(FSMContext(storage, KEY), store)
+    await menu.set_object(obj, False)
+    await menu.select_record(len(obj.records) // 2)
+    await menu.flush()
+    await menu.state.set_state(state)
+
+
+async def run_update(storage: BaseStorage, store: MenuStore, handler, **kwargs):
+    state = FSMContext(storage, KEY)
+    # FSMContextMiddleware reads the state before any of the bot's middlewares
+    await state.get_state()
+    if isinstance(storage, BufferedStorage):
+        async with storage.buffer():
+            await _run_handler(state, store, handler, **kwargs)
+    else:
+        await _run_handler(state, store, handler, **kwargs)
+
+
+async def _run_handler(state: FSMContext, store: MenuStore, handler, **kwargs):
+    menu = MenuStateData(state, store)
+    try:
+        await handler(state=state, menu=menu, **kwargs)
+    finally:
+        await menu.flush()
+
+
+def updates(records: int):
+    yield "open_record", RecordMenuState.menu, open_record, {
+        "cb": callback_query(),
+        "callback_data": RecordListCallbackData(
+            record_index=records // 2, action=RecordListAction.OPEN_RECORD
+        ),
+    }
+    yield "set_numeric_param", RecordMenuState.change_rent, set_numeric_param, {
+        "message": FakeMessage("1500.5")
+    }
+    yield "enter", RecordMenuState.menu, enter, {
+        "cb": callback_query(),
+        "rent_object_service": FakeService(),
+    }
+
+
+async def count_round_trips(
+    store_factory: Callable[[BaseStorage], Callable[[FSMContext], MenuStore]],
+    pipelined: bool,
+    obj: RentObject,
+) -> dict[str, Counter]:
+    """Round trips and bytes written by each of updates(len(obj.records))"""
+    results = {}
+    for name, state, handler, kwargs in updates(len(obj.records)):
+        redis = CountingRedis()
+        storage = RedisStorage(redis)
+        if pipelined:
+            storage = BufferedStorage(storage)
+        create_store = store_factory(storage)
+
+        await prepare(storage, create_store(FSMContext(storage, KEY)), obj, state)
+        redis.round_trips = redis.bytes_written = 0
+        await run_update(
+            storage, create_store(FSMContext(storage, KEY)), handler, **kwargs
+        )
+        results[name] = Counter(
+            round_trips=redis.round_trips, bytes=redis.bytes_written
+        )
+    return results
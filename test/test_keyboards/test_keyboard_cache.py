@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+import pytest
+from aiogram.types import InlineKeyboardMarkup
+
+from app.keyboards.cache import KeyboardCache, format_keyboard_cache_stats
+from app.keyboards.object_list import get_objects_menu_keyboard
+from app.keyboards.record_list import (
+    _build_record_list_keyboard,
+    get_record_list_keyboard,
+)
+from app.keyboards.record_menu import get_create_record_keyboard
+from app.service.models.record import Record
+from app.service.models.rent_object import RentObject
+from test.helpers import make_records
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for keyboard in (
+        _build_record_list_keyboard,
+        get_objects_menu_keyboard,
+        get_create_record_keyboard,
+    ):
+        keyboard.cache.clear()
+
+
+def test_record_list_is_built_once_per_page():
+    records = make_records(20)
+    cache = _build_record_list_keyboard.cache
+
+    first = get_record_list_keyboard(records, 0)
+    assert get_record_list_keyboard(list(records), 0) is first
+    assert get_record_list_keyboard(records, 1) is not first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+    records[-1] = Record(date=datetime(2030, 1, 1, tzinfo=timezone.utc))
+    changed = get_record_list_keyboard(records, 0)
+    assert changed is not first
+    assert changed == _build_record_list_keyboard.__wrapped__(
+        20, 0, 20, tuple(record.date for record in records[12:])
+    )
+
+
+def test_keys_cover_the_shown_data():
+    objects = [RentObject(name="first"), RentObject(name="second")]
+    markup = get_objects_menu_keyboard(objects)
+
+    assert (
+        get_objects_menu_keyboard([RentObject(name=o.name) for o in objects]) is markup
+    )
+    assert get_objects_menu_keyboard(objects[:1]) is not markup
+
+    record = Record(date=datetime(2024, 1, 1, tzinfo=timezone.utc), rent=10)
+    markup = get_create_record_keyboard(record, True)
+
+    assert get_create_record_keyboard(record, is_new=True) is markup
+    assert get_create_record_keyboard(record) is not markup
+    record.rent = 20
+    assert get_create_record_keyboard(record, True) is not markup
+
+
+def test_equal_values_with_different_labels_are_not_shared():
+    date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    as_int = get_create_record_keyboard(Record(date=date, rent=1))
+    as_float = get_create_record_keyboard(Record(date=date, rent=1.0))
+
+    assert as_float is not as_int
+    assert as_int.inline_keyboard[1][0].text == "Аренда: 1"
+    assert as_float.inline_keyboard[1][0].text == "Аренда: 1.0"
+
+
+def test_cache_is_bounded_and_reports_savings():
+    cache = KeyboardCache(max_size=2)
+    for key in (1, 2, 1, 3, 2):
+        cache.get(key, InlineKeyboardMarkup.model_construct)
+
+    assert len(cache) == 2
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (1, 4, 2)
+    assert cache.saved_seconds == pytest.approx(cache.build_seconds / 4)
+    assert "get_objects_menu_keyboard" in format_keyboard_cache_stats()
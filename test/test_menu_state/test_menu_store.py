@@ -0,0 +1,188 @@
+from datetime import datetime, timezone
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+from fakeredis import FakeAsyncRedis
+
+from app.middlewares.menu_middleware import MenuStateData
+from app.middlewares.menu_storage import FSMDataMenuStore, RedisHashMenuStore
+from app.service.models.record import Record
+from app.service.models.rent_object import RentObject
+
+KEY = StorageKey(bot_id=1, chat_id=1, user_id=1)
+
+
+def make_record(month: int, rent: float = 1000) -> Record:
+    return Record(date=datetime(2024, month, 1, tzinfo=timezone.utc), rent=rent)
+
+
+@pytest.fixture(params=["fsm", "redis"])
+def new_menu(request):
+    """Returns a MenuStateData for a new update over the same storage"""
+    if request.param == "fsm":
+        storage = MemoryStorage()
+        factory = FSMDataMenuStore
+    else:
+        storage = RedisStorage(FakeAsyncRedis())
+        factory = RedisHashMenuStore.factory(storage)
+
+    def create() -> MenuStateData:
+        state = FSMContext(storage, KEY)
+        return MenuStateData(state, factory(state))
+
+    return create
+
+
+async def update(menu: MenuStateData, action):
+    result = await action(menu)
+    await menu.flush()
+    return result
+
+
+@pytest.mark.asyncio
+async def test_draft_round_trip(new_menu):
+    obj = RentObject(
+        name="Office", description="2nd floor", area=50, records=[make_record(1)]
+    )
+    await update(new_menu(), lambda menu: menu.set_object(obj, False))
+
+    menu = new_menu()
+    assert await menu.get_object() == obj
+    assert (await menu.get_object_header()).records == []
+    assert await menu.is_new_object() is False
+
+    async def add_record(menu: MenuStateData):
+        index = await menu.add_record_to_object(make_record(3), True)
+        await menu.select_record(index)
+        await menu.set_selected_record_field("rent", 2000.0)
+        await menu.set_object_area(60)
+
+    await update(new_menu(), add_record)
+
+    menu = new_menu()
+    assert await menu.get_selected_record() == make_record(3, rent=2000)
+    assert await menu.get_selected_record_original() == make_record(3)
+    assert await menu.is_new_record(1) is True
+    assert await menu.get_object_field("area") == 60
+
+
+@pytest.mark.asyncio
+async def test_get_and_set_whole_data(new_menu):
+    obj = RentObject(name="Office", area=50, records=[make_record(1)])
+
+    async def set_object(menu: MenuStateData):
+        await menu.set_object(obj, True)
+        await menu.set_current_page(1)
+
+    await update(new_menu(), set_object)
+
+    data = await new_menu().get_data()
+    assert data["current_page"] == 1
+    assert RentObject.from_dict(data["object"]) == obj
+    assert data["object"]["new"] is True
+
+    data["object"]["area"] = 60
+    data["object"]["records"].append(make_record(2).to_dict())
+    del data["current_page"]
+    await update(new_menu(), lambda menu: menu.set_data(data))
+
+    menu = new_menu()
+    assert (await menu.get_object()).area == 60
+    assert len((await menu.get_object()).records) == 2
+    assert await menu.get_current_page() is None
+
+    await update(new_menu(), lambda menu: menu.set_data({}))
+    assert await new_menu().get_data() == {}
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_records_sorted(new_menu):
+    records = [make_record(1), make_record(2), make_record(3)]
+    obj = RentObject(name="Office", records=records)
+
+    async def move_last_first(menu: MenuStateData):
+        await menu.set_object(obj, False)
+        await menu.select_record(2)
+        await menu.update_selected_record(make_record(1, rent=5))
+
+    await update(new_menu(), move_last_first)
+
+    menu = new_menu()
+    saved = (await menu.get_object()).records
+    assert [r.rent for r in saved] == [1000, 5, 1000]
+    assert await menu.is_updated_record(1) is True
+
+    async def delete_first(menu: MenuStateData):
+        await menu.set_selected_record_index(0)
+        await menu.delete_selected_record()
+
+    await update(new_menu(), delete_first)
+    assert len((await new_menu().get_object()).records) == 2
+    assert await new_menu().get_selected_record_original() is None
+
+
+@pytest.mark.asyncio
+async def test_redis_field_edit_is_partial_write():
+    storage = RedisStorage(FakeAsyncRedis())
+    factory = RedisHashMenuStore.factory(storage)
+    state = FSMContext(storage, KEY)
+    obj = RentObject(name="Office", records=[make_record(m) for m in range(1, 13)])
+
+    await update(
+        MenuStateData(state, factory(state)), lambda m: m.set_object(obj, False)
+    )
+    await update(MenuStateData(state, factory(state)), lambda m: m.select_record(4))
+
+    store = factory(state)
+    await MenuStateData(state, store).set_selected_record_field("heat", 12.5)
+
+    assert store._commands == [("hset", (store.record_key(4), "heat", "12.5"))]
+    await store.flush()
+    assert await storage.redis.hget(store.record_key(4), "heat") == b"12.5"
+
+
+@pytest.mark.asyncio
+async def test_selection_follows_moved_record(new_menu):
+    obj = RentObject(name="Office", records=[make_record(m) for m in (1, 2, 3, 4)])
+    await update(new_menu(), lambda menu: menu.set_object(obj, False))
+
+    async def move_first_last(menu: MenuStateData):
+        await menu.select_record(0)
+        await menu.update_selected_record(make_record(5, rent=5))
+
+    await update(new_menu(), move_first_last)
+
+    menu = new_menu()
+    assert await menu.get_selected_record_index() == 3
+    assert await menu.get_selected_record() == make_record(5, rent=5)
+    assert list((await menu.get_record_index()).find_month(2024, 5)) == [3]
+
+
+@pytest.mark.asyncio
+async def test_revert_restores_order(new_menu):
+    obj = RentObject(name="Office", records=[make_record(m) for m in (1, 2, 3)])
+    await update(new_menu(), lambda menu: menu.set_object(obj, False))
+
+    async def edit_date(menu: MenuStateData):
+        await menu.select_record(0)
+        await menu.set_selected_record_field("date", make_record(6).to_dict()["date"])
+
+    await update(new_menu(), edit_date)
+    await update(new_menu(), lambda menu: menu.revert_selected_record())
+
+    menu = new_menu()
+    assert (await menu.get_object()).records == obj.records
+    index = await menu.get_record_index()
+    assert index.insert(make_record(2).to_dict()["date"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_value_stored_as_none(new_menu):
+    await update(new_menu(), lambda menu: menu.store.set_value("current_page", None))
+    assert "current_page" in await new_menu().get_data()
+
+    await update(new_menu(), lambda menu: menu.store.delete_value("current_page"))
+    assert "current_page" not in await new_menu().get_data()
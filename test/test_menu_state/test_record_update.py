@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.handlers.record_menu import get_update_record_input
+from app.middlewares.menu_middleware import MenuStateData
+from app.service.models.record import Record, UpdateRecordInput
+from app.service.models.rent_object import RentObject
+
+
+@pytest.fixture
+def record() -> Record:
+    return Record(date=datetime(2024, 3, 1, tzinfo=timezone.utc), rent=1000, heat=50)
+
+
+def test_update_input_has_only_changed_fields(record):
+    changed = Record(**{**record.__dict__, "heat": 75})
+
+    update = get_update_record_input(record, changed)
+
+    assert update == UpdateRecordInput(heat=75)
+    assert update.to_payload() == {"heat": 75}
+
+
+def test_update_input_without_changes(record):
+    assert get_update_record_input(record, Record(**record.__dict__)) is None
+
+
+def test_update_input_without_original(record):
+    update = get_update_record_input(None, record)
+
+    assert update.to_dict()["date"] == "2024-03-01T00:00:00Z"
+    assert update.rent == 1000 and update.security == 0
+
+
+@pytest.mark.asyncio
+async def test_selected_record_snapshot(record):
+    key = StorageKey(bot_id=1, chat_id=1, user_id=1)
+    menu = MenuStateData(FSMContext(MemoryStorage(), key))
+    await menu.set_object(RentObject(name="Office", records=[record]), False)
+
+    await menu.select_record(0)
+    await menu.set_selected_record_field("rent", 2000)
+
+    assert await menu.get_selected_record_original() == record
+    assert (await menu.get_selected_record()).rent == 2000
+
+    await menu.set_selected_record_index(await menu.create_new_record())
+    assert await menu.get_selected_record_original() is None
@@ -0,0 +1,68 @@
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.middlewares.menu_middleware import MenuMiddleware, MenuStateData
+from app.middlewares.menu_storage import FSMDataMenuStore
+from app.service.models.rent_object import RentObject
+from test.helpers import KEY, CountingStorage, count_round_trips, make_records
+
+
+@pytest.fixture
+def storage() -> CountingStorage:
+    return CountingStorage(MemoryStorage())
+
+
+@pytest.mark.asyncio
+async def test_menu_loads_once_and_flushes_once(storage):
+    menu = MenuStateData(FSMContext(storage, KEY))
+
+    await menu.set_object(RentObject(name="Office"), False)
+    await menu.set_object_area(10)
+    assert (await menu.get_object()).area == 10
+    assert storage.calls == {"get_data": 1}
+
+    await menu.flush()
+    await menu.flush()
+    assert storage.calls == {"get_data": 1, "set_data": 1}
+    assert (await storage.get_data(KEY))["object"]["area"] == 10
+
+
+@pytest.mark.asyncio
+async def test_middleware_flushes_only_dirty_state(storage):
+    state = FSMContext(storage, KEY)
+
+    async def read(event, data):
+        await data["menu"].get_current_page()
+
+    async def write(event, data):
+        await data["menu"].set_current_page(2)
+        raise RuntimeError
+
+    await MenuMiddleware()(read, None, {"state": state})
+    assert storage.calls == {"get_data": 1}
+
+    with pytest.raises(RuntimeError):
+        await MenuMiddleware()(write, None, {"state": state})
+    assert storage.calls == {"get_data": 2, "set_data": 1}
+    assert (await storage.get_data(KEY))["current_page"] == 2
+
+
+@pytest.mark.asyncio
+async def test_handlers_round_trips():
+    obj = RentObject(name="Office", area=10, records=make_records(24))
+
+    def store_factory(storage):
+        return FSMDataMenuStore
+
+    unbuffered = await count_round_trips(store_factory, False, obj)
+    pipelined = await count_round_trips(store_factory, True, obj)
+
+    # A state read by FSMContextMiddleware, one data read and one MULTI
+    assert {name: c["round_trips"] for name, c in pipelined.items()} == {
+        "open_record": 3,
+        "set_numeric_param": 4,
+        "enter": 3,
+    }
+    for name, counts in unbuffered.items():
+        assert pipelined[name]["round_trips"] < counts["round_trips"]
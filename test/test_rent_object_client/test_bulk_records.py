@@ -0,0 +1,56 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.service.models.record import Record
+from app.service.rent_object_service import (
+    RentObjectService,
+    UnprocessableEntityException,
+)
+
+TEST_USER_ID = 23
+
+
+@pytest_asyncio.fixture
+async def server():
+    received = []
+
+    async def add_record(request: web.Request) -> web.Response:
+        data = json.loads(await request.text())
+        if data["record"]["rent"] < 0:
+            return web.Response(status=422, text="Unprocessable record")
+        received.append(data["record"])
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post("/addRecord", add_record)
+
+    async with TestServer(app) as server:
+        server.received = received
+        yield server
+
+
+@pytest_asyncio.fixture
+async def client(server: TestServer):
+    async with RentObjectService(f"http://{server.host}:{server.port}") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_add_records_reports_result_per_record(server, client):
+    records = [
+        Record(date=datetime(2023, month, 1, tzinfo=timezone.utc), rent=month)
+        for month in range(1, 13)
+    ]
+    records[5].rent = -1
+
+    results = await client.add_records(TEST_USER_ID, "object", records, concurrency=3)
+
+    assert [result.record for result in results] == records
+    assert [result.ok for result in results] == [i != 5 for i in range(12)]
+    assert isinstance(results[5].error, UnprocessableEntityException)
+    assert len(server.received) == 11
@@ -1,13 +1,22 @@
 import pytest
-from app.service.rent_object_service import RentObjectService, ObjectNotFoundException
+import pytest_asyncio
+from app.service.rent_object_service import (
+    ObjectAlreadyExistsExcpetion,
+    RecordNotFoundException,
+    RentObjectService,
+    ObjectNotFoundException,
+)
 from app.service.models.rent_object import RentObject, UpdateRentObjectInput
-from app.service.models.record import Record
-from datetime import datetime
+from app.service.models.record import Record, UpdateRecordInput
+from app.service.resilience import RetryPolicy
+from app.service.stub_backend import StubBackend
+from datetime import datetime, timezone
 
 
-@pytest.fixture
-def client():
-    return RentObjectService(uri="http://localhost:8080")
+@pytest_asyncio.fixture
+async def client(stub_uri):
+    async with RentObjectService(uri=stub_uri) as client:
+        yield client
 
 
 @pytest.fixture
@@ -103,3 +112,73 @@ async def test_client_get_all(client):
 
     for obj in objects:
         await client.delete_object(TEST_USER_ID, obj.name)
+
+
+@pytest.mark.asyncio
+async def test_client_add_existing_object(client):
+    obj = RentObject(name="object", description="test", area=100, records=[])
+    await client.add_object(user_id=TEST_USER_ID, rent_object=obj)
+
+    with pytest.raises(ObjectAlreadyExistsExcpetion):
+        await client.add_object(user_id=TEST_USER_ID, rent_object=obj)
+
+
+@pytest.mark.asyncio
+async def test_client_records(client):
+    obj = RentObject(name="object", description="test", area=100, records=[])
+    await client.add_object(user_id=TEST_USER_ID, rent_object=obj)
+
+    records = [
+        Record(date=datetime(2023, month, 1, tzinfo=timezone.utc), rent=month)
+        for month in (3, 1, 2)
+    ]
+    for record in records:
+        await client.add_record(TEST_USER_ID, obj.name, record)
+
+    got = await client.get_all_records(TEST_USER_ID, obj.name)
+    assert got == sorted(records, key=lambda r: r.date)
+
+    await client.update_record(
+        TEST_USER_ID,
+        obj.name,
+        0,
+        UpdateRecordInput(date=datetime(2023, 4, 1, tzinfo=timezone.utc), heat=5),
+    )
+    got = await client.get_all_records(TEST_USER_ID, obj.name)
+    assert [r.rent for r in got] == [2, 3, 1]
+    assert got[2].heat == 5
+    assert await client.get_reccord(TEST_USER_ID, obj.name, 2) == got[2]
+
+    await client.delete_record(TEST_USER_ID, obj.name, 0)
+    got = await client.get_all_records(TEST_USER_ID, obj.name)
+    assert [r.rent for r in got] == [3, 1]
+
+    with pytest.raises(RecordNotFoundException):
+        await client.delete_record(TEST_USER_ID, obj.name, 2)
+
+
+@pytest.mark.asyncio
+async def test_client_object_info(client):
+    record = Record(rent=1000, heat=100, security=300)
+    obj = RentObject(name="object", description="test", area=100, records=[record])
+    await client.add_object(user_id=TEST_USER_ID, rent_object=obj)
+
+    info = await client.get_object_info(TEST_USER_ID, obj.name)
+
+    assert info.name == obj.name
+    assert len(info.records_info) == 1
+    assert info.records_info[0].income == 1000
+    assert info.records_info[0].expenses == 400
+    assert info.records_info[0].profit_by_area == 6
+
+
+@pytest.mark.asyncio
+async def test_client_survives_injected_failures(stub_backend: StubBackend, stub_uri):
+    stub_backend.failure_rate = 0.3
+    retry_policy = RetryPolicy(attempts=10, base_delay=0)
+
+    async with RentObjectService(stub_uri, retry_policy=retry_policy) as client:
+        for _ in range(20):
+            assert await client.get_all(TEST_USER_ID) == []
+
+    assert stub_backend.hits["/getAll"] > 20
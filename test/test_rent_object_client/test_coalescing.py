@@ -0,0 +1,118 @@
+import asyncio
+from collections import Counter
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.service.models.record import Record
+from app.service.rent_object_service import (
+    RentObjectService,
+    ServerInternalErrorException,
+)
+from app.service.resilience import RetryPolicy
+
+TEST_USER_ID = 23
+
+
+@pytest_asyncio.fixture
+async def server():
+    hits = Counter()
+    release = asyncio.Event()
+
+    async def get_all(request: web.Request) -> web.Response:
+        hits[request.path_qs] += 1
+        await release.wait()
+        return web.json_response([])
+
+    async def get_records(request: web.Request) -> web.Response:
+        hits[request.path_qs] += 1
+        await release.wait()
+        return web.json_response([Record().to_dict()])
+
+    async def get_object_info(request: web.Request) -> web.Response:
+        hits[request.path_qs] += 1
+        await release.wait()
+        return web.Response(status=500, text="Internal error")
+
+    async def add_record(request: web.Request) -> web.Response:
+        hits[request.path_qs] += 1
+        await release.wait()
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_get("/getAll", get_all)
+    app.router.add_get("/getRecords", get_records)
+    app.router.add_get("/getObjectInfo", get_object_info)
+    app.router.add_post("/addRecord", add_record)
+
+    async with TestServer(app) as server:
+        server.hits = hits
+        server.release = release
+        yield server
+
+
+@pytest_asyncio.fixture
+async def client(server: TestServer):
+    async with RentObjectService(
+        f"http://{server.host}:{server.port}", retry_policy=RetryPolicy(attempts=1)
+    ) as client:
+        yield client
+
+
+async def gather_released(server: TestServer, *coros):
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    await asyncio.sleep(0.05)
+    server.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_share_request(server, client):
+    results = await gather_released(
+        server, *(client.get_all_records(TEST_USER_ID, "object") for _ in range(5))
+    )
+
+    assert sum(server.hits.values()) == 1
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_different_params_are_not_coalesced(server, client):
+    await gather_released(
+        server,
+        client.get_all(TEST_USER_ID),
+        client.get_all(TEST_USER_ID),
+        client.get_all(TEST_USER_ID + 1),
+    )
+
+    assert sum(server.hits.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_request_shares_exception(server, client):
+    results = await gather_released(
+        server, *(client.get_object_info(TEST_USER_ID, "object") for _ in range(3))
+    )
+
+    assert sum(server.hits.values()) == 1
+    assert all(isinstance(r, ServerInternalErrorException) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_sequential_gets_are_not_coalesced(server, client):
+    server.release.set()
+    await client.get_all(TEST_USER_ID)
+    await client.get_all(TEST_USER_ID)
+
+    assert sum(server.hits.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_are_not_coalesced(server, client):
+    await gather_released(
+        server, *(client.add_record(TEST_USER_ID, "object", Record()) for _ in range(3))
+    )
+
+    assert sum(server.hits.values()) == 3
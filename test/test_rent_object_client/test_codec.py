@@ -0,0 +1,44 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.service.codec import CODECS, get_codec
+from app.service.models.record import Record, UpdateRecordInput
+from app.service.models.rent_object import RentObject
+
+
+def installed_codecs() -> list[str]:
+    names = []
+    for name in CODECS:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("name", installed_codecs())
+@pytest.mark.parametrize(
+    "date",
+    [
+        datetime(2023, 5, 1, tzinfo=timezone.utc),
+        datetime(2023, 5, 1, 3, 4, 5, 678, tzinfo=timezone(timedelta(hours=3))),
+    ],
+)
+def test_codec_encodes_dates_in_wire_format(name, date):
+    codec = get_codec(name)
+    record = Record(date=date, rent=1.5)
+    payload = {
+        "object": RentObject(name="Объект", records=[record]).to_payload(),
+        "update_input": UpdateRecordInput(date=date).to_payload(),
+    }
+
+    data = json.loads(codec.dumps(payload))
+
+    expected_date = date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    assert data["object"]["records"] == [record.to_dict()]
+    assert data["object"]["records"][0]["date"] == expected_date
+    assert data["update_input"]["date"] == expected_date
+    assert codec.loads(codec.dumps(data)) == data
@@ -0,0 +1,54 @@
+import pytest
+
+from app.service.metrics import BackendMetrics, Histogram
+from app.service.rent_object_service import ObjectNotFoundException, RentObjectService
+
+TEST_USER_ID = 23
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+
+    lines = histogram.render("latency", 'endpoint="/getAll"')
+
+    assert lines == [
+        'latency_bucket{endpoint="/getAll",le="1"} 2',
+        'latency_bucket{endpoint="/getAll",le="2"} 3',
+        'latency_bucket{endpoint="/getAll",le="5"} 4',
+        'latency_bucket{endpoint="/getAll",le="+Inf"} 5',
+        'latency_sum{endpoint="/getAll"} 16.0',
+        'latency_count{endpoint="/getAll"} 5',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_service_records_metrics_per_endpoint(stub_uri):
+    metrics = BackendMetrics()
+    async with RentObjectService(stub_uri, metrics=metrics) as client:
+        await client.get_all(TEST_USER_ID)
+        with pytest.raises(ObjectNotFoundException):
+            await client.get_all_records(TEST_USER_ID, "object")
+
+    assert metrics.latency["/getAll"].count == 1
+    assert metrics.response_size["/getAll"].sum == len(b"[]")
+    assert metrics.statuses == {("/getAll", 200): 1, ("/getRecords", 404): 1}
+
+    text = metrics.render()
+    prefix = BackendMetrics.PREFIX
+    assert f'{prefix}_responses_total{{endpoint="/getRecords",status="404"}} 1' in text
+    assert f"{prefix}_circuit_open 0" in text
+
+
+@pytest.mark.asyncio
+async def test_service_records_exceptions():
+    metrics = BackendMetrics()
+    service = RentObjectService("http://127.0.0.1:1", metrics=metrics)
+    service.retry_policy.attempts = 1
+    async with service:
+        with pytest.raises(Exception):
+            await service.get_all(TEST_USER_ID)
+
+    assert sum(metrics.exceptions.values()) == 1
+    assert metrics.latency["/getAll"].count == 1
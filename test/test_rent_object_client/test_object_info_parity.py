@@ -0,0 +1,47 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+
+from app.service.models.record import RECORD_FIELDS, Record
+from app.service.models.rent_object import RentObject
+from app.service.object_info import compute_object_info
+from app.service.rent_object_service import RentObjectService
+
+TEST_USER_ID = 23
+
+
+def random_records(rng: random.Random, count: int) -> list[Record]:
+    records = []
+    for i in range(count):
+        values = {key: round(rng.uniform(0, 250_000), 2) for key in RECORD_FIELDS}
+        values["other"] = rng.choice([0, 1, 17.3, values["other"]])
+        date = datetime(2000 + i // 12, i % 12 + 1, 1, tzinfo=timezone.utc)
+        records.append(Record(date=date, **values))
+    return records
+
+
+@pytest_asyncio.fixture
+async def client(stub_uri):
+    async with RentObjectService(uri=stub_uri) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "area, count", [(640.5, 120), (37, 1), (1e-3, 12), (0, 5), (100, 0)]
+)
+async def test_local_object_info_matches_backend(client, area, count):
+    rng = random.Random(count)
+    obj = RentObject(
+        name="object",
+        description="test",
+        area=area,
+        records=random_records(rng, count),
+    )
+    await client.add_object(TEST_USER_ID, obj)
+
+    expected = await client.get_object_info(TEST_USER_ID, obj.name)
+
+    assert compute_object_info(obj) == expected
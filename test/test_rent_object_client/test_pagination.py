@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.keyboards.record_list import RECORDS_ON_PAGE, get_record_list_keyboard
+from app.service.cached_rent_object_service import CachedRentObjectService
+from app.service.models.record import Record
+from app.service.models.rent_object import RentObject
+from app.service.rent_object_service import RentObjectService
+from app.service.stub_backend import StubBackend
+from test.helpers import make_records
+
+TEST_USER_ID = 23
+RECORDS = 30
+
+
+@pytest_asyncio.fixture
+async def client(stub_uri):
+    async with CachedRentObjectService(uri=stub_uri) as client:
+        obj = RentObject(name="object", records=make_records(RECORDS))
+        await client.add_object(TEST_USER_ID, obj)
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_pages_match_the_full_list(client, stub_backend: StubBackend):
+    records = await client.get_all_records(TEST_USER_ID, "object")
+    stub_backend.hits.clear()
+
+    for page in range(5):
+        got = await client.get_records_page(
+            TEST_USER_ID, "object", page, RECORDS_ON_PAGE
+        )
+        assert len(got) == RECORDS
+        assert get_record_list_keyboard(got, page) == get_record_list_keyboard(
+            records, page
+        )
+
+    # Pages 0-2, then 3-4
+    assert stub_backend.hits["/getRecords"] == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_drop_cached_pages(client, stub_backend: StubBackend):
+    await client.get_records_page(TEST_USER_ID, "object", 0, RECORDS_ON_PAGE)
+
+    newest = Record(date=datetime(2030, 1, 1, tzinfo=timezone.utc))
+    await client.add_record(TEST_USER_ID, "object", newest)
+    page = await client.get_records_page(TEST_USER_ID, "object", 0, RECORDS_ON_PAGE)
+
+    assert page.records[-1] == newest
+    assert page.start == RECORDS + 1 - RECORDS_ON_PAGE
+    assert stub_backend.hits["/getRecords"] == 2
+
+
+@pytest.mark.asyncio
+async def test_read_started_after_a_write_is_not_coalesced(
+    client, stub_backend: StubBackend
+):
+    stub_backend.latency = 0.1
+    before = asyncio.create_task(
+        client.get_records_page(TEST_USER_ID, "object", 0, RECORDS_ON_PAGE)
+    )
+    while not stub_backend.hits["/getRecords"]:
+        await asyncio.sleep(0.01)
+
+    stub_backend.latency = 0
+    newest = Record(date=datetime(2030, 1, 1, tzinfo=timezone.utc))
+    await client.add_record(TEST_USER_ID, "object", newest)
+    page = await client.get_records_page(TEST_USER_ID, "object", 0, RECORDS_ON_PAGE)
+    await before
+
+    assert page.records[-1] == newest
+    assert stub_backend.hits["/getRecords"] == 2
+    # The read that started after the write was cached
+    await client.get_records_page(TEST_USER_ID, "object", 1, RECORDS_ON_PAGE)
+    assert stub_backend.hits["/getRecords"] == 2
+
+
+@pytest.mark.asyncio
+async def test_uncached_service_fetches_every_page(stub_uri, stub_backend):
+    async with RentObjectService(uri=stub_uri) as client:
+        await client.add_object(
+            TEST_USER_ID, RentObject(name="object", records=make_records(RECORDS))
+        )
+        for page in range(3):
+            await client.get_records_page(TEST_USER_ID, "object", page, RECORDS_ON_PAGE)
+
+    assert stub_backend.hits["/getRecords"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stub_window_bounds(client):
+    window = await client._get_records_window(
+        TEST_USER_ID, "object", offset=28, limit=8
+    )
+    assert (window.start, window.end, window.total) == (0, 2, RECORDS)
+
+    window = await client._get_records_window(
+        TEST_USER_ID, "object", offset=40, limit=8
+    )
+    assert (window.start, window.end) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_backend_without_pagination():
+    records = make_records(RECORDS)
+
+    async def get_records(request: web.Request) -> web.Response:
+        return web.json_response([record.to_dict() for record in records])
+
+    app = web.Application()
+    app.router.add_get("/getRecords", get_records)
+    async with TestServer(app) as server:
+        uri = f"http://{server.host}:{server.port}"
+        async with RentObjectService(uri=uri) as client:
+            page = await client.get_records_page(TEST_USER_ID, "object", 3, 8)
+
+    assert page.records == records[:6]
+    assert (page.start, page.total) == (0, RECORDS)
+
+
+@pytest.mark.asyncio
+async def test_negative_page_is_empty(client, stub_backend: StubBackend):
+    records = await client.get_all_records(TEST_USER_ID, "object")
+
+    page = await client.get_records_page(TEST_USER_ID, "object", -1, RECORDS_ON_PAGE)
+
+    assert page.records == []
+    assert len(page) == RECORDS
+    assert get_record_list_keyboard(page, -1) == get_record_list_keyboard(records, -1)
+
+
+@pytest.mark.asyncio
+async def test_page_past_the_end_after_delete(client):
+    last_page = (RECORDS - 1) // RECORDS_ON_PAGE
+    await client.get_records_page(TEST_USER_ID, "object", last_page, RECORDS_ON_PAGE)
+    for _ in range(RECORDS_ON_PAGE):
+        await client.delete_record(TEST_USER_ID, "object", 0)
+    records = await client.get_all_records(TEST_USER_ID, "object")
+
+    page = await client.get_records_page(
+        TEST_USER_ID, "object", last_page, RECORDS_ON_PAGE
+    )
+
+    assert page.records == []
+    assert len(page) == RECORDS - RECORDS_ON_PAGE
+    assert get_record_list_keyboard(page, last_page) == get_record_list_keyboard(
+        records, last_page
+    )
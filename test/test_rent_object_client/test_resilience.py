@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.service.models.record import Record
+from app.service.rent_object_service import (
+    RentObjectService,
+    ServerInternalErrorException,
+    ServiceUnavailableException,
+)
+from app.service.resilience import CircuitBreaker, CircuitState, RetryPolicy
+
+TEST_USER_ID = 23
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest_asyncio.fixture
+async def server():
+    async def get_all(request: web.Request) -> web.Response:
+        server.calls += 1
+        if server.failures > 0:
+            server.failures -= 1
+            return web.Response(status=500, text="Internal error")
+        return web.json_response([])
+
+    async def get_records(request: web.Request) -> web.Response:
+        await asyncio.sleep(1)
+        return web.json_response([])
+
+    async def add_record(request: web.Request) -> web.Response:
+        server.calls += 1
+        await asyncio.sleep(server.delay)
+        return web.Response(status=500, text="Internal error")
+
+    app = web.Application()
+    app.router.add_get("/getAll", get_all)
+    app.router.add_get("/getRecords", get_records)
+    app.router.add_post("/addRecord", add_record)
+
+    async with TestServer(app) as server:
+        server.calls = 0
+        server.failures = 0
+        server.delay = 0
+        yield server
+
+
+def make_client(server: TestServer, **kwargs) -> RentObjectService:
+    return RentObjectService(
+        f"http://{server.host}:{server.port}",
+        retry_policy=RetryPolicy(attempts=3, base_delay=0),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_after_server_error(server):
+    server.failures = 2
+    async with make_client(server) as client:
+        assert await client.get_all(TEST_USER_ID) == []
+    assert server.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_get_fails_when_retries_are_exhausted(server):
+    server.failures = 3
+    async with make_client(server) as client:
+        with pytest.raises(ServerInternalErrorException):
+            await client.get_all(TEST_USER_ID)
+    assert server.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried(server):
+    async with make_client(server) as client:
+        with pytest.raises(ServerInternalErrorException):
+            await client.add_record(TEST_USER_ID, "object", Record())
+    assert server.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_endpoint_timeout(server):
+    async with make_client(server) as client:
+        client.ENDPOINT_TIMEOUTS = {"/getRecords": 0.05}
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get_all_records(TEST_USER_ID, "object")
+    assert client.circuit_breaker.stats.failures == 3
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(server):
+    server.failures = 100
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    async with make_client(server, circuit_breaker=breaker) as client:
+        with pytest.raises(ServerInternalErrorException):
+            await client.get_all(TEST_USER_ID)
+        assert breaker.state is CircuitState.OPEN
+
+        with pytest.raises(ServiceUnavailableException):
+            await client.get_all(TEST_USER_ID)
+    assert server.calls == 3
+    assert breaker.stats.rejected == 1
+
+
+def test_circuit_breaker_recovers_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def open_breaker(clock: FakeClock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+    return breaker
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_half_open_circuit(server):
+    server.delay = 10
+    breaker = open_breaker(FakeClock())
+    async with make_client(server, circuit_breaker=breaker) as client:
+        trial = asyncio.create_task(client.add_record(TEST_USER_ID, "object", Record()))
+        while server.calls == 0:
+            await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert await client.get_all(TEST_USER_ID) == []
+    assert breaker.state is CircuitState.CLOSED
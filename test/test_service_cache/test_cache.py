@@ -0,0 +1,58 @@
+from app.service.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(max_size=10, ttl=5)
+
+    assert cache.get("key") == (False, None)
+    cache.set("key", 1)
+    assert cache.get("key") == (True, 1)
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set("key", 1)
+
+    clock.now = 4.9
+    assert cache.get("key") == (True, 1)
+
+    clock.now = 5
+    assert cache.get("key") == (False, None)
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.stats.evictions == 1
+
+
+def test_cache_skips_values_loaded_before_invalidation():
+    cache = TTLCache(max_size=10, ttl=5)
+    generation = cache.generation
+
+    cache.delete_where(lambda key: key[0] == 1)
+    cache.set((1, "object"), "stale", generation)
+
+    assert cache.get((1, "object")) == (False, None)
@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+
+from app.service.cached_rent_object_service import CachedRentObjectService
+from app.service.models.record import Record, UpdateRecordInput
+from app.service.models.rent_object import RentObject, UpdateRentObjectInput
+from app.service.stub_backend import StubBackend
+
+TEST_USER_ID = 23
+
+
+def make_record(month: int) -> Record:
+    return Record(date=datetime(2023, month, 1, tzinfo=timezone.utc), rent=month)
+
+
+@pytest_asyncio.fixture
+async def client(stub_uri, stub_backend: StubBackend):
+    async with CachedRentObjectService(uri=stub_uri) as client:
+        for name in ("object", "other"):
+            obj = RentObject(name=name, area=10, records=[make_record(1)])
+            await client.add_object(TEST_USER_ID, obj)
+        stub_backend.hits.clear()
+        yield client
+
+
+async def read_all(client: CachedRentObjectService):
+    await client.get_all(TEST_USER_ID)
+    await client.get_by_name(TEST_USER_ID, "object")
+    await client.get_object_info(TEST_USER_ID, "object")
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_are_cached(client, stub_backend: StubBackend):
+    await read_all(client)
+    await read_all(client)
+
+    assert stub_backend.hits == {"/getAll": 1, "/getObject": 1, "/getObjectInfo": 1}
+    assert client.cache_stats.hits == 3
+
+
+WRITES = {
+    "add_object": lambda client: client.add_object(
+        TEST_USER_ID, RentObject(name="new")
+    ),
+    "update_object": lambda client: client.update_object(
+        TEST_USER_ID, "object", UpdateRentObjectInput(area=20)
+    ),
+    "delete_object": lambda client: client.delete_object(TEST_USER_ID, "other"),
+    "add_record": lambda client: client.add_record(
+        TEST_USER_ID, "object", make_record(2)
+    ),
+    "update_record": lambda client: client.update_record(
+        TEST_USER_ID, "object", 0, UpdateRecordInput(rent=5)
+    ),
+    "delete_record": lambda client: client.delete_record(TEST_USER_ID, "object", 0),
+}
+
+# Entries of the object a write touches, besides the object list
+TOUCHES_OBJECT = {"update_object", "add_record", "update_record", "delete_record"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write", WRITES)
+async def test_writes_invalidate_affected_entries(
+    client, stub_backend: StubBackend, write: str
+):
+    await read_all(client)
+    await client.get_by_name(TEST_USER_ID, "other")
+    before = {
+        "objects": await client.get_all(TEST_USER_ID),
+        "object": await client.get_by_name(TEST_USER_ID, "object"),
+        "info": await client.get_object_info(TEST_USER_ID, "object"),
+    }
+
+    await WRITES[write](client)
+    stub_backend.hits.clear()
+    after = {
+        "objects": await client.get_all(TEST_USER_ID),
+        "object": await client.get_by_name(TEST_USER_ID, "object"),
+        "info": await client.get_object_info(TEST_USER_ID, "object"),
+    }
+    if write != "delete_object":
+        # Another object's entries are kept
+        await client.get_by_name(TEST_USER_ID, "other")
+
+    touched = write in TOUCHES_OBJECT
+    assert stub_backend.hits["/getAll"] == 1
+    assert stub_backend.hits["/getObject"] == int(touched)
+    assert stub_backend.hits["/getObjectInfo"] == int(touched)
+    assert after["objects"] != before["objects"]
+    if touched:
+        assert after["object"] != before["object"]
+        assert after["info"] != before["info"]
+
+
+@pytest.mark.asyncio
+async def test_read_overlapping_a_write_is_not_cached(
+    client, stub_backend: StubBackend
+):
+    stub_backend.latency = 0.1
+    read = asyncio.create_task(client.get_all(TEST_USER_ID))
+    while not stub_backend.hits["/getAll"]:
+        await asyncio.sleep(0.01)
+
+    # The write invalidates while the read is still in flight
+    stub_backend.latency = 0
+    await client.add_record(TEST_USER_ID, "object", make_record(2))
+    await read
+
+    objects = await client.get_all(TEST_USER_ID)
+    assert stub_backend.hits["/getAll"] == 2
+    assert len(objects[0].records) == 2
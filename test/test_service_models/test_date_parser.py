@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.service.date_parser import parse_month_year
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("03.24", (2024, 3)),
+        ("3.2024", (2024, 3)),
+        (" 11.99 ", (1999, 11)),
+        ("март 2024", (2024, 3)),
+        ("Дек. 22", (2022, 12)),
+        ("мая-2023", (2023, 5)),
+    ],
+)
+def test_fast_path(text, expected):
+    year, month = expected
+    assert parse_month_year(text) == datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("text", ["13.24", "00.2024", "", "not a date"])
+def test_invalid(text):
+    assert parse_month_year(text) is None
+
+
+def test_fallback():
+    date = parse_month_year("January 2024")
+
+    assert (date.year, date.month, date.day) == (2024, 1, 1)
+    assert date.tzinfo == timezone.utc
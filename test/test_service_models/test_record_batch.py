@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.service.models.record import Record
+from app.service.models.record_batch import RecordBatch
+from test.helpers import make_records
+
+
+@pytest.fixture
+def records() -> list[Record]:
+    records = make_records(30, heat=10)
+    for i, record in enumerate(records):
+        record.rent = 1000 + i
+        record.security = i
+    return records
+
+
+def test_batch_round_trip(records):
+    batch = RecordBatch.from_json([r.to_dict() for r in records])
+
+    assert len(batch) == len(records)
+    assert batch.to_records() == records
+    assert list(batch) == records
+    assert batch[7] == records[7]
+    assert RecordBatch.from_records(records).to_records() == records
+
+
+def test_batch_columns(records):
+    batch = RecordBatch.from_records(records)
+
+    assert batch.column("rent").tolist() == [r.rent for r in records]
+    np.testing.assert_allclose(batch.expenses(), [10 + r.security for r in records])
+
+
+def test_batch_slices_are_views(records):
+    batch = RecordBatch.from_records(records)
+    page = batch[10:18]
+
+    assert page.to_records() == records[10:18]
+    assert np.shares_memory(page.values, batch.values)
+
+
+def test_batch_between(records):
+    batch = RecordBatch.from_records(records)
+
+    year = batch.between(
+        datetime(2021, 1, 1, tzinfo=timezone.utc),
+        datetime(2022, 1, 1, tzinfo=timezone.utc),
+    )
+
+    assert year.to_records() == records[12:24]
+
+
+def test_empty_batch():
+    batch = RecordBatch.from_json([])
+
+    assert len(batch) == 0
+    assert batch.to_records() == []
+    assert batch.expenses().tolist() == []
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+from app.service.models.record import format_datetime
+from app.service.models.record_index import RecordIndex, page_bounds
+
+
+def iso(year: int, month: int, day: int = 1) -> str:
+    return format_datetime(datetime(year, month, day, tzinfo=timezone.utc))
+
+
+def make_index(count: int) -> RecordIndex:
+    return RecordIndex(iso(2020 + i // 12, i % 12 + 1) for i in range(count))
+
+
+def test_insert_keeps_order():
+    index = make_index(12)
+
+    assert index.insert(iso(2020, 3, 15)) == 3
+    assert index.insert(iso(2020, 3, 15)) == 4
+    assert index.insert(iso(2019, 1)) == 0
+    assert index.dates == sorted(index.dates)
+
+
+def test_move_is_stable_among_equal_dates():
+    index = RecordIndex([iso(2020, 1), iso(2020, 1), iso(2020, 2)])
+
+    assert index.move(0, iso(2020, 1)) == 0
+    assert index.move(2, iso(2020, 1)) == 2
+    assert index.move(0, iso(2021, 1)) == 2
+    assert index.move(2, iso(2019, 1)) == 0
+    assert index.dates == [iso(2019, 1), iso(2020, 1), iso(2020, 1)]
+
+
+def test_find_month():
+    index = make_index(30)
+    index.insert(iso(2021, 12, 20))
+
+    assert index.find_month(2020, 1) == range(0, 1)
+    assert list(index.find_month(2021, 12)) == [23, 24]
+    assert len(index.find_month(2023, 1)) == 0
+    assert len(index.find_month(2019, 12)) == 0
+
+
+def test_pages_are_newest_first():
+    index = make_index(20)
+
+    assert list(index.page(0, 8)) == list(range(19, 11, -1))
+    assert list(index.page(2, 8)) == [3, 2, 1, 0]
+    assert len(index.page(3, 8)) == 0
+    assert page_bounds(20, 2, 8) == (0, 4)
+    assert index.datetimes(0, 1) == [datetime(2020, 1, 1, tzinfo=timezone.utc)]
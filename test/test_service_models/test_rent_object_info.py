@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.service.models.record import Record
+from app.service.models.rent_object_info import (
+    INCOME_AFTER_TAX,
+    RecordInfo,
+    RentObjectInfo,
+)
+
+
+def make_record_info(year: int, month: int, income: float, expenses: float):
+    record = Record(date=datetime(year, month, 1, tzinfo=timezone.utc), rent=income)
+    return RecordInfo(
+        record=record,
+        income=income,
+        expenses=expenses,
+        profit=income - expenses,
+        income_by_area=income / 10,
+        expenses_by_area=expenses / 10,
+        profit_by_area=(income - expenses) / 10,
+    )
+
+
+@pytest.fixture
+def object_info() -> RentObjectInfo:
+    return RentObjectInfo(
+        name="Office",
+        description="",
+        area=10,
+        records_info=[
+            make_record_info(2021, 11, 100, 40),
+            make_record_info(2022, 1, 200, 50),
+            make_record_info(2022, 2, 300, 60),
+        ],
+    )
+
+
+def test_summary(object_info):
+    summary = object_info.summary
+
+    assert summary.count == 3
+    assert (summary.income, summary.expenses, summary.profit) == (600, 150, 450)
+    assert summary.mean_income == 200
+    assert summary.mean_income_after_tax == pytest.approx(200 * INCOME_AFTER_TAX)
+    assert summary.mean_profit_after_tax_by_area == pytest.approx(
+        (200 * INCOME_AFTER_TAX - 50) / 10
+    )
+    assert (summary.min_income, summary.max_income) == (100, 300)
+    assert (summary.min_profit, summary.max_profit) == (60, 240)
+    assert list(summary.yearly) == [2021, 2022]
+    assert summary.yearly[2022].income == 500
+    assert list(summary.quarterly) == [(2021, 4), (2022, 1)]
+    assert summary.quarterly[(2022, 1)].mean_expenses == 55
+    assert object_info.get_average_expenses() == 50
+
+
+def test_summary_is_cached_and_invalidated(object_info):
+    summary = object_info.summary
+    assert object_info.summary is summary
+
+    object_info.records_info += (make_record_info(2022, 4, 400, 0),)
+    assert object_info.summary.count == 4
+
+    object_info.records_info = object_info.records_info[:1]
+    assert object_info.summary.count == 1
+
+    object_info.area = 0
+    assert object_info.summary.mean_income_by_area == 0
+
+
+def test_records_info_cant_go_stale_in_place(object_info):
+    summary = object_info.summary
+
+    with pytest.raises(AttributeError):
+        object_info.records_info.append(make_record_info(2022, 4, 400, 0))
+    with pytest.raises(TypeError):
+        object_info.records_info[0] = make_record_info(2022, 4, 400, 0)
+
+    assert object_info.summary is summary
+    assert object_info.summary.count == len(object_info.records_info) == 3
+
+
+def test_empty_summary():
+    object_info = RentObjectInfo(name="Empty", description="", area=0, records_info=[])
+
+    assert object_info.get_average_income() == 0
+    assert object_info.get_average_income_with_tax() == 0
+    assert object_info.summary.max_profit == 0
+    assert object_info.summary.yearly == {}
@@ -0,0 +1,38 @@
+import pytest
+
+from bench.startup import (
+    DEFAULT_MODULE,
+    budget_from_env,
+    eager_lazy_modules,
+    measure,
+    parse_importtime,
+    total_ms,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 | xlsxwriter
+import time:      1498 |    3470773 | app.__main__
+"""
+
+
+def test_parse_importtime():
+    times = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [t.module for t in times] == ["_io", "xlsxwriter", "app.__main__"]
+    assert total_ms(times, "app.__main__") == 3470.773
+    assert eager_lazy_modules(times) == ["xlsxwriter"]
+
+
+@pytest.fixture(scope="module")
+def startup_times():
+    return measure(DEFAULT_MODULE)
+
+
+def test_heavy_modules_are_lazy(startup_times):
+    assert eager_lazy_modules(startup_times) == []
+
+
+def test_startup_within_budget(startup_times):
+    assert total_ms(startup_times, DEFAULT_MODULE) <= budget_from_env()
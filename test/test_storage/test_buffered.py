@@ -0,0 +1,110 @@
+import pytest
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.redis import RedisStorage
+
+from app.middlewares.menu_middleware import MenuStateData
+from app.middlewares.menu_storage import RedisHashMenuStore
+from app.middlewares.storage_buffer import StorageBufferMiddleware
+from app.service.models.rent_object import RentObject
+from app.storage.buffered import BufferedStorage
+from test.helpers import KEY, CountingRedis
+
+
+@pytest.fixture
+def redis() -> CountingRedis:
+    return CountingRedis()
+
+
+@pytest.fixture
+def storage(redis) -> BufferedStorage:
+    return BufferedStorage(RedisStorage(redis))
+
+
+@pytest.mark.asyncio
+async def test_writes_are_sent_together(storage, redis):
+    state_key = storage.key_builder.build(KEY, "state")
+
+    async with storage.buffer():
+        await storage.set_state(KEY, "Menu:edit")
+        await storage.set_data(KEY, {"page": 1})
+        await storage.set_data(KEY, {"page": 2})
+
+        assert await storage.get_state(KEY) == "Menu:edit"
+        assert await storage.get_data(KEY) == {"page": 2}
+        assert redis.round_trips == 0
+
+    assert redis.round_trips == 1
+    assert await redis.get(state_key) == b"Menu:edit"
+    assert await storage.get_data(KEY) == {"page": 2}
+
+
+@pytest.mark.asyncio
+async def test_unbuffered_calls_pass_through(storage, redis):
+    await storage.set_state(KEY, "Menu:edit")
+    await storage.set_data(KEY, {})
+
+    assert redis.round_trips == 2
+    assert await storage.get_state(KEY) == "Menu:edit"
+
+
+@pytest.mark.asyncio
+async def test_middleware_flushes_on_error(storage):
+    async def handler(event, data):
+        await storage.set_state(KEY, "Menu:edit")
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await StorageBufferMiddleware(storage)(handler, None, {})
+    assert await storage.get_state(KEY) == "Menu:edit"
+
+
+@pytest.mark.asyncio
+async def test_redis_hash_store_joins_pipeline(storage, redis):
+    factory = RedisHashMenuStore.factory(storage)
+    state = FSMContext(storage, KEY)
+
+    async with storage.buffer():
+        menu = MenuStateData(state, factory(state))
+        await menu.set_object(RentObject(name="Office"), False)
+        await menu.flush()
+        await state.set_state("Menu:edit")
+        assert redis.round_trips == 1  # the initial load
+
+    assert redis.round_trips == 2
+    menu = MenuStateData(state, factory(state))
+    assert (await menu.get_object()).name == "Office"
+
+
+@pytest.mark.asyncio
+async def test_activity_refreshes_ttls(redis):
+    storage = BufferedStorage(RedisStorage(redis, state_ttl=100, data_ttl=200))
+    state_key = storage.key_builder.build(KEY, "state")
+    data_key = storage.key_builder.build(KEY, "data")
+    await redis.set(state_key, "Menu:edit")
+    await redis.set(data_key, "{}")
+
+    async with storage.buffer():
+        storage.touch(KEY)
+        await storage.get_state(KEY)
+
+    assert 0 < await redis.ttl(state_key) <= 100
+    assert 0 < await redis.ttl(data_key) <= 200
+
+
+@pytest.mark.asyncio
+async def test_menu_store_refreshes_ttls(redis):
+    storage = BufferedStorage(RedisStorage(redis, data_ttl=200))
+    state = FSMContext(storage, KEY)
+    store = RedisHashMenuStore.factory(storage)(state)
+    await store.set_object({"name": "Flat"}, [{"date": "2024-01-01"}])
+    await store.flush()
+    record_key = store.record_key(0)
+    await redis.persist(record_key)
+
+    async with storage.buffer():
+        store = RedisHashMenuStore.factory(storage)(state)
+        await store.get_value("page")
+        await store.flush()
+
+    assert 0 < await redis.ttl(store.object_key) <= 200
+    assert 0 < await redis.ttl(record_key) <= 200
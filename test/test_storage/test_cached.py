@@ -0,0 +1,153 @@
+import pytest
+from aiogram.fsm.storage.redis import RedisStorage
+
+from app.storage.buffered import BufferedStorage
+from app.storage.cached import CachedStorage
+from app.storage.redis import CompactRedisStorage
+from test.helpers import KEY, CountingRedis
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def redis() -> CountingRedis:
+    return CountingRedis()
+
+
+def cached(redis, **kwargs) -> CachedStorage:
+    return CachedStorage(CompactRedisStorage(redis), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_reads_only_check_the_version(redis):
+    storage = cached(redis)
+    await storage.set_data(KEY, {"page": 1})
+    await storage.set_state(KEY, "Menu:edit")
+    redis.round_trips = 0
+
+    data = await storage.get_data(KEY)
+    data["page"] = 2
+
+    assert await storage.get_data(KEY) == {"page": 1}
+    assert await storage.get_state(KEY) == "Menu:edit"
+    assert redis.round_trips == 3
+    assert storage.stats.hits == 3
+
+
+@pytest.mark.asyncio
+async def test_lease_skips_the_check(redis):
+    clock = Clock()
+    storage = cached(redis, lease=1, clock=clock)
+    await storage.set_data(KEY, {"page": 1})
+    redis.round_trips = 0
+
+    await storage.get_data(KEY)
+    assert redis.round_trips == 0
+
+    clock.now = 2
+    await storage.get_data(KEY)
+    assert redis.round_trips == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_of_other_processes_invalidate(redis):
+    first, second = cached(redis), cached(redis)
+    await first.set_data(KEY, {"page": 1})
+    assert await second.get_data(KEY) == {"page": 1}
+
+    await first.set_data(KEY, {"page": 2})
+
+    assert await second.get_data(KEY) == {"page": 2}
+    assert second.stats.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_without_version_are_not_cached(redis):
+    await RedisStorage(redis).set_state(KEY, "Menu:edit")
+    storage = cached(redis)
+
+    assert await storage.get_state(KEY) == "Menu:edit"
+    assert len(storage) == 0
+
+    await RedisStorage(redis).set_state(KEY, "Menu:list")
+    assert await storage.get_state(KEY) == "Menu:list"
+
+
+@pytest.mark.asyncio
+async def test_write_behind(redis):
+    storage = cached(redis, write_behind=True, flush_delay=60)
+    await storage.set_state(KEY, "Menu:edit")
+    await storage.set_data(KEY, {"page": 1})
+
+    assert redis.round_trips == 0
+    assert await storage.get_data(KEY) == {"page": 1}
+
+    await storage.close()
+    assert redis.round_trips == 1
+    assert await cached(redis).get_data(KEY) == {"page": 1}
+
+
+@pytest.mark.asyncio
+async def test_buffered_writes_update_the_cache(redis):
+    cache = cached(redis)
+    storage = BufferedStorage(cache)
+
+    async with storage.buffer():
+        await storage.set_state(KEY, "Menu:edit")
+        await storage.set_data(KEY, {"page": 1})
+
+    assert redis.round_trips == 1
+    redis.round_trips = 0
+    assert await storage.get_data(KEY) == {"page": 1}
+    assert await storage.get_state(KEY) == "Menu:edit"
+    assert cache.stats.hits == 2
+    assert await cached(redis).get_state(KEY) == "Menu:edit"
+
+
+@pytest.mark.asyncio
+async def test_failed_buffered_write_is_not_cached(redis):
+    clock = Clock()
+    cache = cached(redis, lease=60, clock=clock)
+    storage = BufferedStorage(cache)
+    await storage.set_state(KEY, "Menu:list")
+
+    create_pipeline = redis.pipeline
+
+    def failing_pipeline(*args, **kwargs):
+        pipe = create_pipeline(*args, **kwargs)
+
+        async def execute(*args, **kwargs):
+            raise ConnectionError("Connection lost")
+
+        pipe.execute = execute
+        return pipe
+
+    redis.pipeline = failing_pipeline
+    with pytest.raises(ConnectionError):
+        async with storage.buffer():
+            await storage.set_state(KEY, "Menu:edit")
+    del redis.pipeline
+
+    assert await storage.get_state(KEY) == "Menu:list"
+    assert await cached(redis).get_state(KEY) == "Menu:list"
+
+
+@pytest.mark.asyncio
+async def test_reads_refresh_the_version_ttl(redis):
+    cache = CachedStorage(CompactRedisStorage(redis, state_ttl=100, data_ttl=200))
+    storage = BufferedStorage(cache)
+    await storage.set_state(KEY, "Menu:edit")
+    version_key = cache.key_builder.build(KEY, "version")
+    await redis.expire(version_key, 5)
+
+    async with storage.buffer():
+        storage.touch(KEY)
+        await storage.get_state(KEY)
+
+    assert 5 < await redis.ttl(version_key) <= 100
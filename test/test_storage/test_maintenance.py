@@ -0,0 +1,66 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.settings.config import StateStorageConfig
+from app.storage.maintenance import (
+    KeyInfo,
+    apply_ttl,
+    bytes_per_user,
+    format_report,
+    is_stale,
+    scan_keys,
+)
+
+CONFIG = StateStorageConfig(state_ttl=100, data_ttl=200)
+
+
+def test_bytes_per_user():
+    keys = [
+        KeyInfo("fsm:1:1:data", 100, -1, None),
+        KeyInfo("fsm:1:1:menu:record:0", 50, 10, None),
+        KeyInfo("fsm:2:2:state", 10, -1, None),
+    ]
+
+    assert bytes_per_user(keys) == {"1:1": 150, "2:2": 10}
+
+
+def test_stale_keys():
+    assert is_stale(KeyInfo("fsm:1:1:data", 1, -1, 300), CONFIG)
+    assert is_stale(KeyInfo("fsm:1:1:state", 1, -1, 150), CONFIG)
+    assert not is_stale(KeyInfo("fsm:1:1:data", 1, -1, 150), CONFIG)
+    assert not is_stale(KeyInfo("fsm:1:1:data", 1, 50, 300), CONFIG)
+    assert not is_stale(KeyInfo("fsm:1:1:data", 1, -1, None), CONFIG)
+
+
+def test_report():
+    keys = [
+        KeyInfo("fsm:1:1:data", 100, -1, 300),
+        KeyInfo("fsm:2:2:data", 10, 20, 0),
+    ]
+
+    report = format_report(keys, CONFIG, top=1)
+
+    assert report.startswith("2 keys, 110 bytes")
+    assert "Keys without TTL: 1" in report
+    assert "Abandoned drafts, idle past the TTL: 1 keys, 100 bytes" in report
+
+
+@pytest.mark.asyncio
+async def test_scan_and_apply_ttl():
+    redis = FakeAsyncRedis()
+    await redis.set("fsm:1:1:data", "x" * 100)
+    await redis.set("fsm:1:1:state", "Menu:edit", ex=50)
+    await redis.hset("fsm:1:1:menu:object", "name", '"Flat"')
+    await redis.set("other", "x")
+
+    keys = {info.key: info for info in await scan_keys(redis)}
+
+    assert set(keys) == {"fsm:1:1:data", "fsm:1:1:state", "fsm:1:1:menu:object"}
+    assert keys["fsm:1:1:data"].size > 100
+    assert keys["fsm:1:1:data"].ttl == -1
+    assert 0 < keys["fsm:1:1:state"].ttl <= 50
+
+    assert await apply_ttl(redis, list(keys.values()), CONFIG) == 2
+    assert 0 < await redis.ttl("fsm:1:1:data") <= 200
+    assert 0 < await redis.ttl("fsm:1:1:menu:object") <= 200
+    assert await redis.ttl("fsm:1:1:state") <= 50
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from fakeredis import FakeAsyncRedis
+
+from app.storage.redis import CompactRedisStorage
+from app.storage.serializer import HEADER, MAGIC, StateSerializer
+
+KEY = StorageKey(bot_id=1, chat_id=1, user_id=1)
+
+STATE = {
+    "object": {
+        "name": "Склад",
+        "area": 640.5,
+        "new": False,
+        "records": [
+            {"date": "2024-03-01T00:00:00Z", "rent": 1000.5 + i} for i in range(50)
+        ],
+    },
+    "selected_record_index": 3,
+    "current_page": None,
+}
+
+
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+@pytest.mark.parametrize("compression", ["brotli", "zlib", "none"])
+def test_round_trip(encoding, compression):
+    if encoding == "msgpack":
+        pytest.importorskip("msgpack")
+    serializer = StateSerializer(encoding, compression)
+
+    value = serializer.dumps(STATE)
+
+    assert value.startswith(MAGIC)
+    assert serializer.loads(value) == STATE
+    if compression != "none":
+        assert len(value) < len(json.dumps(STATE)) / 2
+
+
+def test_small_data_is_not_compressed():
+    serializer = StateSerializer("json", "zlib", compress_threshold=512)
+
+    value = serializer.dumps({"current_page": 1})
+
+    assert HEADER.unpack_from(value)[2] == 0
+    assert serializer.loads(value) == {"current_page": 1}
+
+
+def test_reads_legacy_json_and_other_formats():
+    serializer = StateSerializer("json", "brotli")
+
+    assert serializer.loads(json.dumps(STATE)) == STATE
+    assert serializer.loads(json.dumps(STATE).encode()) == STATE
+    assert serializer.loads(StateSerializer("json", "zlib").dumps(STATE)) == STATE
+
+
+@pytest.mark.asyncio
+async def test_compact_redis_storage():
+    redis = FakeAsyncRedis()
+    storage = CompactRedisStorage(redis)
+    data_key = storage.key_builder.build(KEY, "data")
+
+    await redis.set(data_key, json.dumps({"current_page": 2}))
+    assert await storage.get_data(KEY) == {"current_page": 2}
+
+    await storage.set_data(KEY, STATE)
+    assert (await redis.get(data_key)).startswith(MAGIC)
+    assert await storage.get_data(KEY) == STATE
+
+    await storage.set_data(KEY, {})
+    assert await redis.exists(data_key) == 0